@@ -1,7 +1,12 @@
 from app.api.routes import router as api_router
 from app.api.frontend import router as frontend_router
+from app.api.responses import FastJSONResponse
+from app.api.auth import current_user, header_user
 
 __all__ = [
     'api_router',
-    'frontend_router'
+    'frontend_router',
+    'FastJSONResponse',
+    'current_user',
+    'header_user'
 ] 
\ No newline at end of file
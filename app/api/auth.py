@@ -0,0 +1,54 @@
+import importlib
+import re
+from typing import Any, Callable, Optional
+
+from fastapi import Depends, Header, HTTPException
+
+from app import config
+
+USER_ID_PATTERN = re.compile(r"[A-Za-z0-9_.@:-]{1,128}")
+
+def header_user(x_user_id: Optional[str] = Header(None)) -> str:
+    """Get the user a request acts for from the X-User-ID header
+    
+    The header is not authenticated: anyone who can reach the API can act for
+    any user. Only use this dependency behind a trusted proxy that
+    authenticates the caller and sets (or strips) X-User-ID, or replace it
+    with AUTH_DEPENDENCY. Requests without the header act for DEFAULT_USER_ID.
+    
+    Returns:
+        The user ID
+    """
+    if x_user_id is None:
+        return config.DEFAULT_USER_ID
+    if not USER_ID_PATTERN.fullmatch(x_user_id):
+        raise HTTPException(status_code=400, detail="Invalid X-User-ID header")
+    return x_user_id
+
+def load_user_dependency(path: Optional[str]) -> Callable[..., Any]:
+    """Resolve the dependency that identifies the user of a request
+    
+    Args:
+        path: A "module:function" path, or None for header_user
+        
+    Returns:
+        A FastAPI dependency returning the user ID
+    """
+    if not path:
+        return header_user
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"AUTH_DEPENDENCY must look like 'module:function', got '{path}'")
+    return getattr(importlib.import_module(module_name), name)
+
+def current_user(user_id: str = Depends(load_user_dependency(config.AUTH_DEPENDENCY))) -> str:
+    """Get the user a request acts for; every API route depends on this
+    
+    The user comes from AUTH_DEPENDENCY (default: the X-User-ID header, see
+    header_user). Applications can also replace it with
+    ``app.dependency_overrides[current_user]``.
+    
+    Returns:
+        The user ID
+    """
+    return user_id
@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.utils import dumps_json
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when it is installed
+    
+    Falls back to the standard library encoder with Starlette's settings, so
+    responses are identical either way.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
 from starlette.requests import Request
-from typing import Optional
+from typing import Dict, Any, Optional
+import json
 import uuid
 
+from app import config
+from app.api.auth import current_user
+from app.api.responses import FastJSONResponse
 from app.models import ReminderRequest
 from app.services import (
     add_reminder,
@@ -12,15 +16,35 @@ from app.services import (
     delete_reminder,
     get_upcoming_reminders,
     save_conversation,
+    get_conversation_owner,
     get_conversation_history
 )
-from app.gemini import process_with_gemini, process_general_chat
+from app.database import get_storage
+from app.utils import REMINDER_FIELDS, JSON_ENCODER, decode_cursor, render_reminders, render_upcoming_reminders
+from app.gemini import process_with_gemini, process_general_chat, stream_general_chat, get_gemini_metrics, model_registry, context_builder, tool_dispatcher, retry_policy, get_tool_format, intent_router, command_fast_path, response_cache, semantic_cache, REMINDER
 
 # Create router
 router = APIRouter()
 
+async def check_conversation_owner(conversation_id: str, user_id: str) -> None:
+    """Reject a conversation ID that belongs to another user
+    
+    Unknown IDs pass, so clients can pick the ID of a new conversation.
+    
+    Raises:
+        HTTPException: 404 if the conversation belongs to another user
+    """
+    owner = await get_conversation_owner(conversation_id)
+    if owner is not None and owner != user_id:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    """Format a Server-Sent Event"""
+    message = f"data: {json.dumps(data)}\n\n"
+    return f"event: {event}\n{message}" if event else message
+
 @router.post("/chat")
-async def chat(request: Request, background_tasks: BackgroundTasks):
+async def chat(request: Request, background_tasks: BackgroundTasks, user_id: str = Depends(current_user)):
     """Process a chat message with Gemini AI - handles both reminder and general chat"""
     try:
         data = await request.json()
@@ -34,106 +58,214 @@ async def chat(request: Request, background_tasks: BackgroundTasks):
         if not conversation_id:
             conversation_id = str(uuid.uuid4())
         
-        # Get conversation history if conversation_id is provided
+        # Get recent conversation history; older turns are covered by the stored summary
         conversation_history = []
         if conversation_id:
-            conversation_history = await get_conversation_history(conversation_id)
-        
-        # Determine if this is a reminder-related message or general chat
-        is_reminder_related = any(keyword in user_message.lower() for keyword in 
-                                ["remind", "reminder", "schedule", "task", "todo", "to-do", 
-                                 "show reminders", "list reminders", "upcoming", "delete reminder", 
-                                 "complete reminder", "mark as done", "mark as completed"])
+            await check_conversation_owner(conversation_id, user_id)
+            conversation_history = await get_conversation_history(conversation_id, limit=config.CONTEXT_HISTORY_LIMIT, user_id=user_id)
         
         # Process with appropriate Gemini function
-        if is_reminder_related:
-            response_text = await process_with_gemini(user_message, conversation_history)
+        if await intent_router.route(user_message) == REMINDER:
+            response_text = await process_with_gemini(user_message, conversation_history, conversation_id, user_id)
         else:
-            response_text = await process_general_chat(user_message, conversation_history)
+            response_text = await process_general_chat(user_message, conversation_history, conversation_id, user_id)
         
         # Save conversation in background
         background_tasks.add_task(
             save_conversation,
             conversation_id,
             user_message,
-            response_text
+            response_text,
+            user_id
         )
         
-        return JSONResponse({
+        return FastJSONResponse({
             "reply": response_text,
             "conversation_id": conversation_id
         })
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def chat_stream(request: Request, user_id: str = Depends(current_user)):
+    """Stream a chat reply as Server-Sent Events
+    
+    Sends a "meta" event with the conversation ID, unnamed events with text
+    deltas as the model produces them, and a "done" event with the full reply
+    once it has been saved. If the reply fails, an "error" event ends the
+    stream instead and the turn is not saved. Reminder commands run their
+    tools first and arrive as a single delta. Another user's conversation ID
+    is rejected with a 404 before the stream starts.
+    """
+    data = await request.json()
+    user_message = data.get("message", "")
+    conversation_id = data.get("conversation_id") or str(uuid.uuid4())
+    
+    if not user_message:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    
+    await check_conversation_owner(conversation_id, user_id)
+    conversation_history = await get_conversation_history(conversation_id, limit=config.CONTEXT_HISTORY_LIMIT, user_id=user_id)
+    
+    async def events():
+        yield sse_event({"conversation_id": conversation_id}, "meta")
+        
+        chunks = []
+        try:
+            if await intent_router.route(user_message) == REMINDER:
+                chunks.append(await process_with_gemini(user_message, conversation_history, conversation_id, user_id))
+                yield sse_event({"delta": chunks[-1]})
+            else:
+                async for chunk in stream_general_chat(user_message, conversation_history, conversation_id, user_id):
+                    chunks.append(chunk)
+                    yield sse_event({"delta": chunk})
+        except Exception as e:
+            yield sse_event({"detail": str(e)}, "error")
+            return
+        
+        response_text = "".join(chunks)
+        await save_conversation(conversation_id, user_message, response_text, user_id)
+        yield sse_event({"reply": response_text, "conversation_id": conversation_id}, "done")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Keep the separate endpoints for backward compatibility but route them to the main chat endpoint
 @router.post("/general-chat")
-async def general_chat(request: Request, background_tasks: BackgroundTasks):
+async def general_chat(request: Request, background_tasks: BackgroundTasks, user_id: str = Depends(current_user)):
     """Process a general chat message with Gemini AI (redirects to main chat endpoint)"""
-    return await chat(request, background_tasks)
+    return await chat(request, background_tasks, user_id)
 
 @router.post("/reminder")
-async def create_reminder(reminder: ReminderRequest):
+async def create_reminder(reminder: ReminderRequest, user_id: str = Depends(current_user)):
     """Create a new reminder"""
     try:
         result = await add_reminder(
             reminder.message,
             reminder.date,
             reminder.priority,
-            reminder.tags
+            reminder.tags,
+            user_id
         )
-        return JSONResponse(result)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reminders")
 async def list_reminders(
     date: Optional[str] = None,
-    completed: bool = False
+    completed: bool = False,
+    limit: int = Query(config.REMINDERS_PAGE_SIZE, ge=1, le=config.REMINDERS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    total: bool = False,
+    tag: Optional[str] = None,
+    summary: bool = True,
+    user_id: str = Depends(current_user)
 ):
-    """Get all reminders with optional filtering"""
+    """Get a page of reminders with optional filtering
+    
+    Pass the returned next_cursor as ``cursor`` to get the following page.
+    ``fields`` is a comma-separated subset of the reminder fields, and
+    ``total=true`` adds the number of matching reminders, and ``tag``
+    keeps only reminders with that tag (case-insensitive).
+    
+    The message lists the page's reminders as text. ``summary=false`` skips
+    building that text and returns only a count; so does ``fields``, since
+    the text needs every field.
+    """
+    selected_fields = None
+    if fields:
+        selected_fields = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected_fields if field not in REMINDER_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    
+    try:
+        decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        result = await get_reminders(date, completed)
-        return JSONResponse(result)
+        result = await get_reminders(date, completed, user_id, limit, cursor, selected_fields, total, tag)
+        if summary and selected_fields is None:
+            result["message"] = render_reminders(result)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/reminder/{reminder_id}/complete")
-async def mark_complete(reminder_id: int):
+async def mark_complete(reminder_id: int, user_id: str = Depends(current_user)):
     """Mark a reminder as completed"""
     try:
-        result = await complete_reminder(reminder_id)
-        return JSONResponse(result)
+        result = await complete_reminder(reminder_id, user_id)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/reminder/{reminder_id}")
-async def remove_reminder(reminder_id: int):
+async def remove_reminder(reminder_id: int, user_id: str = Depends(current_user)):
     """Delete a reminder"""
     try:
-        result = await delete_reminder(reminder_id)
-        return JSONResponse(result)
+        result = await delete_reminder(reminder_id, user_id)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reminders/upcoming")
-async def upcoming_reminders():
-    """Get upcoming reminders for today and tomorrow"""
+async def upcoming_reminders(summary: bool = True, user_id: str = Depends(current_user)):
+    """Get upcoming reminders for today and tomorrow
+    
+    The message lists the reminders as text; ``summary=false`` returns only a count.
+    """
     try:
-        result = await get_upcoming_reminders()
-        return JSONResponse(result)
+        result = await get_upcoming_reminders(user_id)
+        if summary:
+            result["message"] = render_upcoming_reminders(result)
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/conversations/{conversation_id}")
-async def get_conversation(conversation_id: str):
-    """Get conversation history"""
+async def get_conversation(
+    conversation_id: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_id: str = Depends(current_user)
+):
+    """Get conversation history, optionally a window of the most recent messages
+    
+    Conversations belonging to another user are reported as not found.
+    """
+    await check_conversation_owner(conversation_id, user_id)
     try:
-        messages = await get_conversation_history(conversation_id)
-        return JSONResponse({
+        messages = await get_conversation_history(conversation_id, limit, offset, user_id)
+        return FastJSONResponse({
             "conversation_id": conversation_id,
             "messages": messages
         })
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/metrics")
+async def metrics():
+    """Get runtime metrics for storage and Gemini calls"""
+    return FastJSONResponse({
+        "database": get_storage().metrics(),
+        "gemini": get_gemini_metrics(),
+        "models": model_registry.metrics(),
+        "context": context_builder.metrics(),
+        "tools": dict(tool_dispatcher.metrics(), format=get_tool_format()),
+        "retries": retry_policy.metrics(),
+        "intents": intent_router.metrics(),
+        "commands": command_fast_path.metrics(),
+        "response_cache": response_cache.metrics(),
+        "semantic_cache": semantic_cache.metrics(),
+        "json_encoder": JSON_ENCODER
+    })
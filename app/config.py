@@ -0,0 +1,166 @@
+import os
+from typing import Dict
+from dotenv import load_dotenv, dotenv_values, find_dotenv
+
+# The .env file; most settings read it once here, hot-reloaded ones re-read it via read_env()
+ENV_FILE = find_dotenv()
+
+# Load environment variables from .env file once, before any setting is read
+_PROCESS_ENV = frozenset(os.environ)
+load_dotenv(ENV_FILE)
+_DOTENV_KEYS = frozenset(os.environ) - _PROCESS_ENV
+
+def read_env() -> Dict[str, str]:
+    """Read the environment with the .env file as it is now
+    
+    Variables from the real environment win over the file, as with load_dotenv;
+    those that came from the file at startup take its current value instead.
+    """
+    environ = {name: value for name, value in os.environ.items() if name not in _DOTENV_KEYS}
+    for name, value in dotenv_values(ENV_FILE).items():
+        if value is not None:
+            environ.setdefault(name, value)
+    return environ
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def _env_pragmas(name: str, default: Dict[str, str]) -> Dict[str, str]:
+    """Read pragma overrides such as "cache_size=-8000;temp_store=MEMORY" from the environment
+    
+    Overrides are merged into the default mapping.
+    """
+    pragmas = dict(default)
+    for item in (os.getenv(name) or "").split(";"):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            pragmas[key.strip()] = value.strip()
+    return pragmas
+
+# Database files: "split" keeps reminders.db and database.db, "single" keeps both schemas in DB_FILE
+DB_LAYOUT = os.getenv("DB_LAYOUT", "split")
+DB_FILE = os.getenv("DB_FILE", "app.db")
+
+# Owner of requests without an X-User-ID header, and of reminders created before users existed
+DEFAULT_USER_ID = os.getenv("DEFAULT_USER_ID", "default")
+# Dependency identifying the user of an API request, as "module:function"; unset trusts
+# the X-User-ID header, which must then be set by an authenticating proxy
+AUTH_DEPENDENCY = os.getenv("AUTH_DEPENDENCY")
+
+# Storage backend: "sqlite" (local files), "postgres" (DATABASE_URL, shared by several nodes) or "memory"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")
+DATABASE_URL = os.getenv("DATABASE_URL")
+PG_POOL_MIN_SIZE = _env_int("PG_POOL_MIN_SIZE", 2)
+PG_POOL_MAX_SIZE = _env_int("PG_POOL_MAX_SIZE", 10)
+
+# Database connection pool
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_POOL_TIMEOUT = _env_float("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_HEALTH_CHECK_INTERVAL = _env_float("DB_POOL_HEALTH_CHECK_INTERVAL", 60.0)
+
+# Pragma profiles for every new database connection
+DB_PRAGMA_PROFILES = {
+    # SQLite's rollback journal with a full fsync per commit; both are set
+    # explicitly because a file switched to WAL stays in WAL until told otherwise
+    "default": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": "5000",
+        "temp_store": "MEMORY",
+    },
+    # WAL lets readers run alongside the writer; commits fsync only at checkpoints
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-16000",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+    },
+}
+DB_PRAGMA_PROFILE = os.getenv("DB_PRAGMA_PROFILE", "wal")
+# Profile pragmas plus any DB_PRAGMAS overrides
+DB_PRAGMAS = _env_pragmas("DB_PRAGMAS", DB_PRAGMA_PROFILES.get(DB_PRAGMA_PROFILE, DB_PRAGMA_PROFILES["wal"]))
+
+# Seconds between WAL checkpoints run off the request path (0 disables them)
+DB_CHECKPOINT_INTERVAL = _env_float("DB_CHECKPOINT_INTERVAL", 60.0)
+
+# Rows or conversations per transaction when migrations rewrite large tables online
+MIGRATION_BATCH_SIZE = _env_int("MIGRATION_BATCH_SIZE", 1000)
+# Seconds between those transactions so waiting writers get the lock
+MIGRATION_BATCH_PAUSE = _env_float("MIGRATION_BATCH_PAUSE", 0.02)
+
+# Threads running blocking database work off the event loop (0 runs it inline)
+DB_EXECUTOR_WORKERS = _env_int("DB_EXECUTOR_WORKERS", DB_POOL_SIZE)
+
+# Gemini request concurrency
+GEMINI_MAX_IN_FLIGHT = _env_int("GEMINI_MAX_IN_FLIGHT", 16)
+# "thread" runs the SDK's blocking calls on a bounded thread pool, "native" uses generate_content_async
+GEMINI_ASYNC_MODE = os.getenv("GEMINI_ASYNC_MODE", "thread")
+# Share one upstream call among identical concurrent generate_content calls
+GEMINI_COALESCE = os.getenv("GEMINI_COALESCE", "true").lower() in ("1", "true", "yes")
+
+# Seconds between checks for changed Gemini settings (0 disables hot reload)
+GEMINI_CONFIG_RELOAD_INTERVAL = _env_float("GEMINI_CONFIG_RELOAD_INTERVAL", 30.0)
+
+# Conversation context sent to Gemini
+CONTEXT_TOKEN_BUDGET = _env_int("CONTEXT_TOKEN_BUDGET", 4000)
+CONTEXT_SUMMARY_TOKENS = _env_int("CONTEXT_SUMMARY_TOKENS", 500)
+CONTEXT_HISTORY_LIMIT = _env_int("CONTEXT_HISTORY_LIMIT", 100)
+
+# Reminder list pages returned by GET /api/reminders
+REMINDERS_PAGE_SIZE = _env_int("REMINDERS_PAGE_SIZE", 50)
+REMINDERS_MAX_PAGE_SIZE = _env_int("REMINDERS_MAX_PAGE_SIZE", 500)
+
+# Chat intent routing: local stages first, Gemini only for messages they are unsure about
+INTENT_MODEL_THRESHOLD = _env_float("INTENT_MODEL_THRESHOLD", 0.9)
+INTENT_LLM_FALLBACK = os.getenv("INTENT_LLM_FALLBACK", "true").lower() in ("1", "true", "yes")
+INTENT_LLM_TIMEOUT = _env_float("INTENT_LLM_TIMEOUT", 3.0)
+
+# Opt-in cache of general chat replies for repeated questions
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "false").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 1000)
+RESPONSE_CACHE_MAX_BYTES = _env_int("RESPONSE_CACHE_MAX_BYTES", 8_000_000)
+RESPONSE_CACHE_TTL = _env_float("RESPONSE_CACHE_TTL", 3600.0)
+# Cache only turns with at most this many history messages (0: only the first message of a conversation)
+RESPONSE_CACHE_MAX_HISTORY = _env_int("RESPONSE_CACHE_MAX_HISTORY", 0)
+# Optional SQLite file that keeps cached replies across restarts
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB") or None
+RESPONSE_CACHE_DB_MAX_ENTRIES = _env_int("RESPONSE_CACHE_DB_MAX_ENTRIES", 100_000)
+
+# Opt-in cache reusing general chat answers for reworded questions (needs numpy)
+SEMANTIC_CACHE = os.getenv("SEMANTIC_CACHE", "false").lower() in ("1", "true", "yes")
+# "hashing" (local, deterministic) or "gemini" (Gemini embedding API)
+SEMANTIC_CACHE_EMBEDDER = os.getenv("SEMANTIC_CACHE_EMBEDDER", "hashing")
+SEMANTIC_CACHE_EMBEDDING_MODEL = os.getenv("SEMANTIC_CACHE_EMBEDDING_MODEL", "models/text-embedding-004")
+SEMANTIC_CACHE_THRESHOLD = _env_float("SEMANTIC_CACHE_THRESHOLD", 0.8)
+SEMANTIC_CACHE_MAX_ENTRIES = _env_int("SEMANTIC_CACHE_MAX_ENTRIES", 10_000)
+SEMANTIC_CACHE_TTL = _env_float("SEMANTIC_CACHE_TTL", 3600.0)
+
+# Tool calling
+# Run common commands ("delete reminder 2", "show my reminders") without calling Gemini
+COMMAND_FAST_PATH = os.getenv("COMMAND_FAST_PATH", "true").lower() in ("1", "true", "yes")
+# Model calls per chat turn; at least one
+TOOL_MAX_STEPS = max(1, _env_int("TOOL_MAX_STEPS", 4))
+# Ask the model to phrase tool results instead of returning the service messages directly
+TOOL_FOLLOW_UP = os.getenv("TOOL_FOLLOW_UP", "false").lower() in ("1", "true", "yes")
+
+# Gemini retries
+GEMINI_MAX_ATTEMPTS = _env_int("GEMINI_MAX_ATTEMPTS", 3)
+GEMINI_RETRY_BASE_DELAY = _env_float("GEMINI_RETRY_BASE_DELAY", 0.5)
+GEMINI_RETRY_MAX_DELAY = _env_float("GEMINI_RETRY_MAX_DELAY", 8.0)
+# Total seconds a chat turn may spend on Gemini calls, including retries
+GEMINI_REQUEST_DEADLINE = _env_float("GEMINI_REQUEST_DEADLINE", 30.0)
+# Tool call format ("function_declarations", "tools", "tools_with_config"); probed at startup when unset
+GEMINI_TOOL_FORMAT = os.getenv("GEMINI_TOOL_FORMAT")
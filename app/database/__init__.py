@@ -1,6 +1,34 @@
-from app.database.connection import get_db_connection, init_db
+from app.database.connection import (
+    get_db_connection,
+    db_connection,
+    conversations_db_connection
+)
+from app.database.migrations import init_db, migrate, get_schema_version
+from app.database.executor import run_db, get_db_executor, configure_db_executor, shutdown_db_executor, run_checkpoints
+from app.database.storage import BACKENDS, get_storage, configure_storage
+from app.database.pool import ConnectionPool, PoolTimeoutError, apply_pragmas, get_pool, configure_pool, get_pool_stats, checkpoint_all_pools, close_all_pools
 
 __all__ = [
     'get_db_connection',
-    'init_db'
-] 
\ No newline at end of file
+    'db_connection',
+    'conversations_db_connection',
+    'init_db',
+    'migrate',
+    'get_schema_version',
+    'run_db',
+    'get_db_executor',
+    'configure_db_executor',
+    'shutdown_db_executor',
+    'run_checkpoints',
+    'ConnectionPool',
+    'PoolTimeoutError',
+    'apply_pragmas',
+    'get_pool',
+    'configure_pool',
+    'get_pool_stats',
+    'checkpoint_all_pools',
+    'close_all_pools',
+    'BACKENDS',
+    'get_storage',
+    'configure_storage'
+]
@@ -0,0 +1,10 @@
+"""
+Apply pending schema migrations.
+
+Usage: python -m app.database [--database NAME] [--dry-run] [--offline] [--batch-size N]
+"""
+
+from app.database.migrations import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+from app.database.backends.base import ReminderKey, ReminderRepository, ConversationRepository, StorageBackend
+from app.database.backends.memory import MemoryBackend
+from app.database.backends.postgres import PostgresBackend
+from app.database.backends.sqlite import SQLiteBackend
+
+__all__ = [
+    'ReminderKey',
+    'ReminderRepository',
+    'ConversationRepository',
+    'StorageBackend',
+    'SQLiteBackend',
+    'PostgresBackend',
+    'MemoryBackend'
+]
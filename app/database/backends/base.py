@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+# Position of a reminder in list order: (date, priority, id)
+ReminderKey = Tuple[str, str, int]
+
+# Columns a reminder page can select; the keyset columns are always selected
+REMINDER_COLUMNS = ("id", "user_message", "date", "priority", "tags", "completed")
+KEYSET_COLUMNS = ("date", "priority", "id")
+
+class ReminderRepository(ABC):
+    """Stores reminders
+    
+    Rows are mappings with the reminders table's columns (id, user_id,
+    user_message, date, priority, tags as a JSON string, completed). Every
+    method is scoped to one user; other users' reminders are never returned
+    or changed.
+    """
+    
+    @abstractmethod
+    async def insert(self, user_id: str, message: str, date: str, priority: str, tags: List[str]) -> Mapping[str, Any]:
+        """Insert a reminder and return the stored row"""
+    
+    @abstractmethod
+    async def select(
+        self,
+        user_id: str,
+        date_filter: Optional[str] = None,
+        completed: bool = False,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        """Get reminders by completion and optional date and tag, ordered by date then priority"""
+    
+    @abstractmethod
+    async def select_page(
+        self,
+        user_id: str,
+        date_filter: Optional[str],
+        completed: bool,
+        limit: int,
+        after: Optional[ReminderKey] = None,
+        columns: Optional[List[str]] = None,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        """Get up to ``limit`` reminders ordered by date, priority (descending) then id
+        
+        Args:
+            after: Only return reminders after this key (keyset pagination)
+            columns: Columns to select; id, date and priority are always included
+            tag: Only return reminders with this tag (compared after normalize_tag)
+        """
+    
+    @abstractmethod
+    async def count(self, user_id: str, date_filter: Optional[str] = None, completed: bool = False, tag: Optional[str] = None) -> int:
+        """Count the reminders select() would return"""
+    
+    @abstractmethod
+    async def select_upcoming(self, user_id: str, dates: List[str]) -> List[Mapping[str, Any]]:
+        """Get open reminders due on any of the given dates, ordered by date then priority"""
+    
+    @abstractmethod
+    async def complete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        """Mark a reminder as completed and return its row, or None if the user has no such reminder"""
+    
+    @abstractmethod
+    async def delete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        """Delete a reminder and return its row, or None if the user has no such reminder"""
+
+class ConversationRepository(ABC):
+    """Stores conversation messages and rolling summaries
+    
+    Each conversation belongs to the user who started it. Every method except
+    select_owner is scoped to one user; another user's conversation reads as
+    empty and is never changed.
+    """
+    
+    @abstractmethod
+    async def select_owner(self, conversation_id: str) -> Optional[str]:
+        """Get the user a conversation belongs to, or None if it does not exist"""
+    
+    @abstractmethod
+    async def append_messages(self, user_id: str, conversation_id: str, user_message: str, ai_response: str) -> bool:
+        """Append a user message and AI response to a conversation atomically
+        
+        Returns:
+            False, without writing, if the conversation belongs to another user
+        """
+    
+    @abstractmethod
+    async def select_messages(self, user_id: str, conversation_id: str, limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+        """Get a window of messages counted from the most recent, in chronological order"""
+    
+    @abstractmethod
+    async def select_message_range(self, user_id: str, conversation_id: str, after_seq: int, before_seq: int) -> List[Dict[str, Any]]:
+        """Get the messages with after_seq < seq < before_seq in chronological order"""
+    
+    @abstractmethod
+    async def select_summary(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored rolling summary with its through_seq, or None"""
+    
+    @abstractmethod
+    async def upsert_summary(self, user_id: str, conversation_id: str, summary: str, through_seq: int) -> None:
+        """Store a rolling summary unless a newer one is already stored"""
+
+class StorageBackend(ABC):
+    """A storage backend providing the reminder and conversation repositories"""
+    
+    name = "base"
+    reminders: ReminderRepository
+    conversations: ConversationRepository
+    
+    @abstractmethod
+    async def start(self) -> None:
+        """Open connections and bring the schema up to date"""
+    
+    @abstractmethod
+    async def close(self) -> None:
+        """Release every connection"""
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get backend usage metrics
+        
+        Returns:
+            A dictionary with the backend name and its pool statistics
+        """
+        return {"backend": self.name}
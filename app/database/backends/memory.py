@@ -0,0 +1,150 @@
+import json
+from datetime import datetime
+from typing import Dict, Any, List, Mapping, Optional
+
+from app.database.backends.base import ConversationRepository, ReminderKey, ReminderRepository, StorageBackend
+from app.utils import normalize_tag, normalize_tags
+
+def _in_list_order(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort reminders like ORDER BY date ASC, priority DESC"""
+    rows.sort(key=lambda row: row["priority"], reverse=True)
+    rows.sort(key=lambda row: row["date"])
+    return rows
+
+class MemoryReminderRepository(ReminderRepository):
+    """Reminders in a dictionary"""
+    
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.next_id = 1
+    
+    async def insert(self, user_id: str, message: str, date: str, priority: str, tags: List[str]) -> Mapping[str, Any]:
+        row = {"id": self.next_id, "user_id": user_id, "user_message": message, "date": date, "priority": priority, "tags": json.dumps(tags), "completed": 0}
+        self.rows[row["id"]] = row
+        self.next_id += 1
+        return dict(row)
+    
+    async def select(
+        self,
+        user_id: str,
+        date_filter: Optional[str] = None,
+        completed: bool = False,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        tag = normalize_tag(tag) if tag else None
+        rows = [
+            dict(row) for row in self.rows.values()
+            if row["user_id"] == user_id and bool(row["completed"]) == completed and (not date_filter or row["date"] == date_filter)
+            and (not tag or tag in normalize_tags(json.loads(row["tags"])))
+        ]
+        return _in_list_order(rows)
+    
+    async def select_page(
+        self,
+        user_id: str,
+        date_filter: Optional[str],
+        completed: bool,
+        limit: int,
+        after: Optional[ReminderKey] = None,
+        columns: Optional[List[str]] = None,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        rows = await self.select(user_id, date_filter, completed, tag)
+        # Ties on date and priority keep insertion (id) order, matching the SQL tiebreaker
+        if after:
+            after_date, after_priority, after_id = after
+            rows = [
+                row for row in rows
+                if row["date"] > after_date or (row["date"] == after_date and (
+                    row["priority"] < after_priority or (row["priority"] == after_priority and row["id"] > after_id)
+                ))
+            ]
+        return rows[:limit]
+    
+    async def count(self, user_id: str, date_filter: Optional[str] = None, completed: bool = False, tag: Optional[str] = None) -> int:
+        return len(await self.select(user_id, date_filter, completed, tag))
+    
+    async def select_upcoming(self, user_id: str, dates: List[str]) -> List[Mapping[str, Any]]:
+        rows = [
+            dict(row) for row in self.rows.values()
+            if row["user_id"] == user_id and row["date"] in dates and not row["completed"]
+        ]
+        return _in_list_order(rows)
+    
+    async def complete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        row = self.rows.get(reminder_id)
+        if row is None or row["user_id"] != user_id:
+            return None
+        before = dict(row)
+        row["completed"] = 1
+        return before
+    
+    async def delete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        row = self.rows.get(reminder_id)
+        if row is None or row["user_id"] != user_id:
+            return None
+        return self.rows.pop(reminder_id)
+
+class MemoryConversationRepository(ConversationRepository):
+    """Conversations in dictionaries"""
+    
+    def __init__(self):
+        self.owners: Dict[str, str] = {}
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+    
+    def _owned(self, user_id: str, conversation_id: str) -> bool:
+        """Whether a conversation exists and belongs to the user"""
+        return self.owners.get(conversation_id) == user_id
+    
+    async def select_owner(self, conversation_id: str) -> Optional[str]:
+        return self.owners.get(conversation_id)
+    
+    async def append_messages(self, user_id: str, conversation_id: str, user_message: str, ai_response: str) -> bool:
+        if self.owners.setdefault(conversation_id, user_id) != user_id:
+            return False
+        timestamp = datetime.now().isoformat()
+        messages = self.messages.setdefault(conversation_id, [])
+        seq = len(messages)
+        messages.append({"role": "user", "content": user_message, "timestamp": timestamp, "seq": seq + 1})
+        messages.append({"role": "assistant", "content": ai_response, "timestamp": timestamp, "seq": seq + 2})
+        return True
+    
+    async def select_messages(self, user_id: str, conversation_id: str, limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+        messages = self.messages.get(conversation_id, []) if self._owned(user_id, conversation_id) else []
+        end = len(messages) - offset
+        start = 0 if limit is None else max(0, end - limit)
+        return [dict(message) for message in messages[start:max(0, end)]]
+    
+    async def select_message_range(self, user_id: str, conversation_id: str, after_seq: int, before_seq: int) -> List[Dict[str, Any]]:
+        messages = self.messages.get(conversation_id, []) if self._owned(user_id, conversation_id) else []
+        return [dict(message) for message in messages if after_seq < message["seq"] < before_seq]
+    
+    async def select_summary(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
+        summary = self.summaries.get(conversation_id) if self._owned(user_id, conversation_id) else None
+        return dict(summary) if summary else None
+    
+    async def upsert_summary(self, user_id: str, conversation_id: str, summary: str, through_seq: int) -> None:
+        if not self._owned(user_id, conversation_id):
+            return
+        stored = self.summaries.get(conversation_id)
+        if stored is None or through_seq > stored["through_seq"]:
+            self.summaries[conversation_id] = {"summary": summary, "through_seq": through_seq}
+
+class MemoryBackend(StorageBackend):
+    """Process-local storage for offline runs and benchmarks; nothing is persisted
+    
+    Operations complete without awaiting, so each one is atomic on the event loop.
+    """
+    
+    name = "memory"
+    
+    def __init__(self):
+        self.reminders = MemoryReminderRepository()
+        self.conversations = MemoryConversationRepository()
+    
+    async def start(self) -> None:
+        pass
+    
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,367 @@
+import json
+import logging
+import uuid
+from datetime import datetime
+from sqlite3 import Connection, Row
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+
+from app.database.backends.base import (
+    KEYSET_COLUMNS,
+    REMINDER_COLUMNS,
+    ConversationRepository,
+    ReminderKey,
+    ReminderRepository,
+    StorageBackend
+)
+from app.database.connection import REMINDERS_DB_FILE, CONVERSATIONS_DB_FILE
+from app.database.executor import run_db, shutdown_db_executor
+from app.database.migrate_conversations import convert_conversation_blob
+from app.database.migrations import init_db
+from app.database.pool import get_pool_stats, close_all_pools
+from app.utils import normalize_tag, normalize_tags
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database.sqlite")
+
+# Reminder list queries, served by idx_reminders_user_completed_date_priority
+UPCOMING_REMINDERS_QUERY = "SELECT * FROM reminders WHERE user_id = ? AND date IN (?, ?) AND completed = 0 ORDER BY date ASC, priority DESC"
+
+def _reminders_filter(user_id: str, date_filter: Optional[str], completed: bool, tag: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """Build the FROM and WHERE clauses shared by the reminder list, page and count queries
+    
+    A tag filter starts from the user's rows in reminder_tags and looks each
+    reminder up by id; the matches are then sorted, since a tag holds a small
+    share of a user's reminders.
+    """
+    if tag:
+        where = (
+            "FROM reminder_tags JOIN reminders ON reminders.id = reminder_tags.reminder_id "
+            "WHERE reminder_tags.user_id = ? AND reminder_tags.tag = ? AND completed = ?"
+        )
+        params: List[Any] = [user_id, normalize_tag(tag), 1 if completed else 0]
+    else:
+        where = "FROM reminders WHERE user_id = ? AND completed = ?"
+        params = [user_id, 1 if completed else 0]
+    
+    if date_filter:
+        where += " AND date = ?"
+        params.append(date_filter)
+    return where, params
+
+def build_reminders_query(
+    user_id: str,
+    date_filter: Optional[str] = None,
+    completed: bool = False,
+    tag: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """Build the query used by get_reminders
+    
+    Args:
+        user_id: The owner of the reminders
+        date_filter: Optional date to filter reminders
+        completed: Whether to select completed reminders
+        tag: Optional tag to filter reminders
+        
+    Returns:
+        A tuple of (query, params)
+    """
+    where, params = _reminders_filter(user_id, date_filter, completed, tag)
+    return f"SELECT reminders.* {where} ORDER BY date ASC, priority DESC", params
+
+def build_reminders_page_query(
+    user_id: str,
+    date_filter: Optional[str] = None,
+    completed: bool = False,
+    limit: int = 50,
+    after: Optional[ReminderKey] = None,
+    columns: Optional[List[str]] = None,
+    tag: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """Build a keyset-paginated reminder list query
+    
+    Rows are ordered by (date, priority DESC, id). The index ends in the
+    rowid, so the scan starts at the cursor and stops after ``limit`` rows
+    without sorting; only reminders on the cursor's own date are skipped.
+    
+    Args:
+        user_id: The owner of the reminders
+        date_filter: Optional date to filter reminders
+        completed: Whether to select completed reminders
+        limit: Maximum rows to return
+        after: Key of the last reminder on the previous page
+        columns: Columns to select (default: all)
+        tag: Optional tag to filter reminders
+        
+    Returns:
+        A tuple of (query, params)
+    """
+    selected = [column for column in REMINDER_COLUMNS if columns is None or column in columns or column in KEYSET_COLUMNS]
+    where, params = _reminders_filter(user_id, date_filter, completed, tag)
+    query = f"SELECT {', '.join(selected)} {where}"
+    
+    if after:
+        after_date, after_priority, after_id = after
+        query += " AND date >= ? AND (date > ? OR priority < ? OR (priority = ? AND id > ?))"
+        params.extend([after_date, after_date, after_priority, after_priority, after_id])
+    
+    query += " ORDER BY date ASC, priority DESC, id ASC LIMIT ?"
+    params.append(limit)
+    return query, params
+
+def build_reminders_count_query(
+    user_id: str,
+    date_filter: Optional[str] = None,
+    completed: bool = False,
+    tag: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """Build a count of the reminders get_reminders would list, answered from the index alone
+    
+    Returns:
+        A tuple of (query, params)
+    """
+    where, params = _reminders_filter(user_id, date_filter, completed, tag)
+    return f"SELECT COUNT(*) {where}", params
+
+def _insert_reminder(conn: Connection, user_id: str, message: str, date: str, priority: str, tags: List[str]) -> Row:
+    """Insert a reminder and return the stored row"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO reminders (user_id, user_message, date, priority, tags) VALUES (?, ?, ?, ?, ?)",
+        (user_id, message, date, priority, json.dumps(tags))
+    )
+    reminder_id = cursor.lastrowid
+    cursor.executemany(
+        "INSERT OR IGNORE INTO reminder_tags (user_id, tag, reminder_id) VALUES (?, ?, ?)",
+        [(user_id, tag, reminder_id) for tag in normalize_tags(tags)]
+    )
+    conn.commit()
+    
+    # Fetch the inserted reminder
+    cursor.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,))
+    return cursor.fetchone()
+
+def _select_reminders(conn: Connection, query: str, params: List[Any]) -> List[Row]:
+    """Run a reminder query and return all rows"""
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+def _count_reminders(conn: Connection, query: str, params: List[Any]) -> int:
+    """Run a count query and return the count"""
+    return conn.execute(query, params).fetchone()[0]
+
+def _update_reminder(conn: Connection, user_id: str, reminder_id: int, statement: str) -> Optional[Row]:
+    """Run an update or delete for one of a user's reminders
+    
+    The statement is called with (reminder_id, user_id) parameters.
+    
+    Returns:
+        The reminder row as it was before the statement, or None if the user has no such reminder
+    """
+    cursor = conn.cursor()
+    
+    # Check if the reminder exists and belongs to the user
+    cursor.execute("SELECT * FROM reminders WHERE id = ? AND user_id = ?", (reminder_id, user_id))
+    reminder = cursor.fetchone()
+    
+    if reminder:
+        cursor.execute(statement, (reminder_id, user_id))
+        conn.commit()
+    return reminder
+
+def _select_owner(conn: Connection, conversation_id: str) -> Optional[str]:
+    """Fetch the user a conversation belongs to"""
+    row = conn.execute("SELECT user_id FROM conversations WHERE id = ?", (conversation_id,)).fetchone()
+    return row["user_id"] if row else None
+
+def _append_messages(conn: Connection, user_id: str, conversation_id: str, user_message: str, ai_response: str) -> bool:
+    """Append a user message and AI response to a conversation in one transaction
+    
+    Nothing is written, and False is returned, if the conversation belongs to another user.
+    """
+    timestamp = datetime.now().isoformat()
+    
+    # Take the write lock up front so concurrent turns cannot pick the same seq
+    conn.execute("BEGIN IMMEDIATE")
+    cursor = conn.execute(
+        "INSERT INTO conversations (id, user_id) VALUES (?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP "
+        "WHERE conversations.user_id = excluded.user_id",
+        (conversation_id, user_id)
+    )
+    if cursor.rowcount == 0:
+        conn.rollback()
+        return False
+    
+    # Conversations saved before the message table existed are converted on first write
+    convert_conversation_blob(conn, conversation_id)
+    
+    last_seq = conn.execute(
+        "SELECT COALESCE(MAX(seq), 0) FROM conversation_messages WHERE conversation_id = ?",
+        (conversation_id,)
+    ).fetchone()[0]
+    
+    conn.executemany(
+        "INSERT INTO conversation_messages (conversation_id, seq, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+        [
+            (conversation_id, last_seq + 1, "user", user_message, timestamp),
+            (conversation_id, last_seq + 2, "assistant", ai_response, timestamp)
+        ]
+    )
+    conn.commit()
+    return True
+
+def _select_messages(conn: Connection, user_id: str, conversation_id: str, limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+    """Fetch a window of messages, newest window first, returned in chronological order"""
+    if _select_owner(conn, conversation_id) != user_id:
+        return []
+    
+    rows = conn.execute(
+        "SELECT seq, role, content, timestamp FROM conversation_messages "
+        "WHERE conversation_id = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+        (conversation_id, -1 if limit is None else limit, offset)
+    ).fetchall()
+    
+    if not rows and offset == 0:
+        # Fall back to a legacy JSON blob that has not been converted yet
+        legacy = conn.execute("SELECT messages FROM conversations WHERE id = ?", (conversation_id,)).fetchone()
+        if legacy and legacy["messages"] and legacy["messages"] != "[]":
+            messages = json.loads(legacy["messages"])
+            return messages[-limit:] if limit else messages
+    
+    return [
+        {"role": row["role"], "content": row["content"], "timestamp": row["timestamp"], "seq": row["seq"]}
+        for row in reversed(rows)
+    ]
+
+def _select_message_range(conn: Connection, user_id: str, conversation_id: str, after_seq: int, before_seq: int) -> List[Dict[str, Any]]:
+    """Fetch the messages between two seqs (exclusive) in chronological order"""
+    rows = conn.execute(
+        "SELECT seq, role, content, timestamp FROM conversation_messages "
+        "WHERE conversation_id = ? AND seq > ? AND seq < ? "
+        "AND EXISTS (SELECT 1 FROM conversations WHERE id = ? AND user_id = ?) ORDER BY seq",
+        (conversation_id, after_seq, before_seq, conversation_id, user_id)
+    ).fetchall()
+    return [
+        {"role": row["role"], "content": row["content"], "timestamp": row["timestamp"], "seq": row["seq"]}
+        for row in rows
+    ]
+
+def _select_summary(conn: Connection, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the stored rolling summary for a conversation"""
+    row = conn.execute(
+        "SELECT summary, through_seq FROM conversation_summaries "
+        "JOIN conversations ON conversations.id = conversation_summaries.conversation_id "
+        "WHERE conversation_id = ? AND conversations.user_id = ?",
+        (conversation_id, user_id)
+    ).fetchone()
+    return {"summary": row["summary"], "through_seq": row["through_seq"]} if row else None
+
+def _upsert_summary(conn: Connection, user_id: str, conversation_id: str, summary: str, through_seq: int) -> None:
+    """Store a rolling summary unless a newer one is already stored"""
+    conn.execute(
+        "INSERT INTO conversation_summaries (conversation_id, summary, through_seq) "
+        "SELECT id, ?, ? FROM conversations WHERE id = ? AND user_id = ? "
+        "ON CONFLICT(conversation_id) DO UPDATE SET summary = excluded.summary, "
+        "through_seq = excluded.through_seq, updated_at = CURRENT_TIMESTAMP "
+        "WHERE excluded.through_seq > conversation_summaries.through_seq",
+        (summary, through_seq, conversation_id, user_id)
+    )
+    conn.commit()
+
+class SQLiteReminderRepository(ReminderRepository):
+    """Reminders in a local SQLite file, queried on the database executor"""
+    
+    def __init__(self, db_file: str = REMINDERS_DB_FILE):
+        self.db_file = db_file
+    
+    async def insert(self, user_id: str, message: str, date: str, priority: str, tags: List[str]) -> Mapping[str, Any]:
+        return await run_db(_insert_reminder, user_id, message, date, priority, tags, db_file=self.db_file)
+    
+    async def select(
+        self,
+        user_id: str,
+        date_filter: Optional[str] = None,
+        completed: bool = False,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        query, params = build_reminders_query(user_id, date_filter, completed, tag)
+        return await run_db(_select_reminders, query, params, db_file=self.db_file)
+    
+    async def select_page(
+        self,
+        user_id: str,
+        date_filter: Optional[str],
+        completed: bool,
+        limit: int,
+        after: Optional[ReminderKey] = None,
+        columns: Optional[List[str]] = None,
+        tag: Optional[str] = None
+    ) -> List[Mapping[str, Any]]:
+        query, params = build_reminders_page_query(user_id, date_filter, completed, limit, after, columns, tag)
+        return await run_db(_select_reminders, query, params, db_file=self.db_file)
+    
+    async def count(self, user_id: str, date_filter: Optional[str] = None, completed: bool = False, tag: Optional[str] = None) -> int:
+        query, params = build_reminders_count_query(user_id, date_filter, completed, tag)
+        return await run_db(_count_reminders, query, params, db_file=self.db_file)
+    
+    async def select_upcoming(self, user_id: str, dates: List[str]) -> List[Mapping[str, Any]]:
+        return await run_db(_select_reminders, UPCOMING_REMINDERS_QUERY, [user_id, *dates], db_file=self.db_file)
+    
+    async def complete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        return await run_db(
+            _update_reminder, user_id, reminder_id,
+            "UPDATE reminders SET completed = 1 WHERE id = ? AND user_id = ?",
+            db_file=self.db_file
+        )
+    
+    async def delete(self, user_id: str, reminder_id: int) -> Optional[Mapping[str, Any]]:
+        return await run_db(
+            _update_reminder, user_id, reminder_id,
+            "DELETE FROM reminders WHERE id = ? AND user_id = ?",
+            db_file=self.db_file
+        )
+
+class SQLiteConversationRepository(ConversationRepository):
+    """Conversations in a local SQLite file, queried on the database executor"""
+    
+    def __init__(self, db_file: str = CONVERSATIONS_DB_FILE):
+        self.db_file = db_file
+    
+    async def select_owner(self, conversation_id: str) -> Optional[str]:
+        return await run_db(_select_owner, conversation_id, db_file=self.db_file)
+    
+    async def append_messages(self, user_id: str, conversation_id: str, user_message: str, ai_response: str) -> bool:
+        return await run_db(_append_messages, user_id, conversation_id, user_message, ai_response, db_file=self.db_file)
+    
+    async def select_messages(self, user_id: str, conversation_id: str, limit: Optional[int], offset: int) -> List[Dict[str, Any]]:
+        return await run_db(_select_messages, user_id, conversation_id, limit, offset, db_file=self.db_file)
+    
+    async def select_message_range(self, user_id: str, conversation_id: str, after_seq: int, before_seq: int) -> List[Dict[str, Any]]:
+        return await run_db(_select_message_range, user_id, conversation_id, after_seq, before_seq, db_file=self.db_file)
+    
+    async def select_summary(self, user_id: str, conversation_id: str) -> Optional[Dict[str, Any]]:
+        return await run_db(_select_summary, user_id, conversation_id, db_file=self.db_file)
+    
+    async def upsert_summary(self, user_id: str, conversation_id: str, summary: str, through_seq: int) -> None:
+        await run_db(_upsert_summary, user_id, conversation_id, summary, through_seq, db_file=self.db_file)
+
+class SQLiteBackend(StorageBackend):
+    """Local SQLite files behind pooled connections; suitable for a single app node"""
+    
+    name = "sqlite"
+    
+    def __init__(self, reminders_file: str = REMINDERS_DB_FILE, conversations_file: str = CONVERSATIONS_DB_FILE):
+        self.reminders = SQLiteReminderRepository(reminders_file)
+        self.conversations = SQLiteConversationRepository(conversations_file)
+    
+    async def start(self) -> None:
+        # Apply pending schema migrations; this also opens the pooled connections
+        init_db()
+    
+    async def close(self) -> None:
+        shutdown_db_executor()
+        close_all_pools()
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {"backend": self.name, "pools": get_pool_stats()}
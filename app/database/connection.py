@@ -1,13 +1,21 @@
 import sqlite3
 import logging
+from contextlib import contextmanager
 from sqlite3 import Connection, Row
+from typing import Iterator
+
+from app import config
+from app.database.pool import get_pool, apply_pragmas
 
 # Configure logger
 logger = logging.getLogger("reminder-ai.database")
 
 # Database file paths
-REMINDERS_DB_FILE = "reminders.db"
-CONVERSATIONS_DB_FILE = "database.db"
+if config.DB_LAYOUT == "single":
+    REMINDERS_DB_FILE = CONVERSATIONS_DB_FILE = config.DB_FILE
+else:
+    REMINDERS_DB_FILE = "reminders.db"
+    CONVERSATIONS_DB_FILE = "database.db"
 
 def get_db_connection(db_file=REMINDERS_DB_FILE) -> Connection:
     """Get a connection to the SQLite database with row factory
@@ -20,6 +28,7 @@ def get_db_connection(db_file=REMINDERS_DB_FILE) -> Connection:
     """
     conn = sqlite3.connect(db_file)
     conn.row_factory = sqlite3.Row
+    apply_pragmas(conn, config.DB_PRAGMAS)
     return conn
 
 def get_conversations_db_connection() -> Connection:
@@ -30,47 +39,23 @@ def get_conversations_db_connection() -> Connection:
     """
     return get_db_connection(CONVERSATIONS_DB_FILE)
 
-def init_db() -> None:
-    """Initialize the database with required tables"""
-    try:
-        # Initialize reminders database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create reminders table with additional fields
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                message TEXT NOT NULL,
-                date TEXT NOT NULL,
-                priority TEXT DEFAULT 'normal',
-                tags TEXT DEFAULT '[]',
-                completed BOOLEAN DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        
-        # Initialize conversations database
-        conn = get_conversations_db_connection()
-        cursor = conn.cursor()
-        
-        # Create conversation history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversations (
-                id TEXT PRIMARY KEY,
-                messages TEXT DEFAULT '[]',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+@contextmanager
+def db_connection(db_file=REMINDERS_DB_FILE) -> Iterator[Connection]:
+    """Check out a pooled connection to a database for a ``with`` block
+    
+    Args:
+        db_file: The database file to connect to
         
-        conn.commit()
-        conn.close()
-        logger.info("Databases initialized")
-    except Exception as e:
-        logger.error(f"Error initializing database: {str(e)}")
+    Yields:
+        A pooled database connection; it is returned to the pool on exit
+    """
+    with get_pool(db_file).connection() as conn:
+        yield conn
 
-# Initialize database on module import
-init_db() 
\ No newline at end of file
+def conversations_db_connection():
+    """Check out a pooled connection to the conversations database
+    
+    Returns:
+        A context manager yielding a pooled connection
+    """
+    return db_connection(CONVERSATIONS_DB_FILE)
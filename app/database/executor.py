@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from sqlite3 import Connection
+from typing import Any, Callable, Optional, TypeVar
+
+from app import config
+from app.database.connection import REMINDERS_DB_FILE
+from app.database.pool import get_pool, checkpoint_all_pools
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database")
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = config.DB_EXECUTOR_WORKERS
+_executor_lock = threading.Lock()
+
+def get_db_executor() -> Optional[ThreadPoolExecutor]:
+    """Get the shared executor for database work
+    
+    Returns:
+        The executor, or None when database work runs inline on the event loop
+    """
+    global _executor
+    if _executor_workers <= 0:
+        return None
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_executor_workers,
+                    thread_name_prefix="reminder-ai-db"
+                )
+    return _executor
+
+def configure_db_executor(max_workers: int) -> None:
+    """Replace the shared database executor
+    
+    Args:
+        max_workers: Number of database threads (0 runs database work inline)
+    """
+    global _executor_workers
+    shutdown_db_executor()
+    _executor_workers = max_workers
+
+def shutdown_db_executor() -> None:
+    """Stop the shared database executor after pending work finishes"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+async def run_db(func: Callable[..., T], *args: Any, db_file: str = REMINDERS_DB_FILE) -> T:
+    """Run blocking database work with a pooled connection without blocking the event loop
+    
+    Args:
+        func: A function called as ``func(conn, *args)``
+        *args: Extra arguments for ``func``
+        db_file: The database file to connect to
+        
+    Returns:
+        The value returned by ``func``
+    """
+    def work() -> T:
+        with get_pool(db_file).connection() as conn:
+            return func(conn, *args)
+    
+    executor = get_db_executor()
+    if executor is None:
+        return work()
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, work)
+
+async def run_checkpoints(interval: float = config.DB_CHECKPOINT_INTERVAL) -> None:
+    """Checkpoint the WAL of every pooled database periodically until cancelled
+    
+    Keeps the WAL short and moves checkpoint work off the request path, where
+    SQLite would otherwise run it inside whichever commit crosses the limit.
+    
+    Args:
+        interval: Seconds between checkpoints
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await loop.run_in_executor(get_db_executor(), checkpoint_all_pools)
+        except Exception as e:
+            logger.warning(f"Periodic checkpoint failed: {str(e)}")
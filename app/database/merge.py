@@ -0,0 +1,115 @@
+"""
+Merge reminders.db and database.db into the single database file used by
+DB_LAYOUT=single.
+
+Both source files are first brought up to the latest schema version, then all
+rows are copied into the target in one transaction. Existing IDs are kept.
+
+Usage: python -m app.database.merge [--reminders FILE] [--conversations FILE] [--output FILE] [--dry-run]
+"""
+
+import argparse
+import sys
+import time
+import logging
+from typing import Dict, Any
+
+from app import config
+from app.database.migrations import migrate, table_columns
+from app.database.pool import get_pool
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database.merge")
+
+# Tables copied from each source database, parents first
+MERGED_TABLES = {
+    "reminders": ["reminders", "reminder_tags"],
+    "conversations": ["conversations", "conversation_messages", "conversation_summaries"],
+}
+
+def merge_databases(reminders_file: str, conversations_file: str, output_file: str, dry_run: bool = False) -> Dict[str, Any]:
+    """Copy both databases into one file
+    
+    Args:
+        reminders_file: The reminders database file
+        conversations_file: The conversations database file
+        output_file: The merged database file; it must not hold any rows yet
+        dry_run: Only count the rows that would be copied
+        
+    Returns:
+        A dictionary mapping each table to its copied row count
+    """
+    sources = {"reminders": reminders_file, "conversations": conversations_file}
+    counts = {}
+    
+    for database, db_file in sources.items():
+        if not dry_run:
+            migrate(database, db_file)
+        with get_pool(db_file).connection() as conn:
+            for table in MERGED_TABLES[database]:
+                if table_columns(conn, table):
+                    counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                else:
+                    counts[table] = 0
+    if dry_run:
+        return counts
+    
+    for database in sources:
+        migrate(database, output_file)
+    
+    with get_pool(output_file).connection() as conn:
+        for table in counts:
+            if conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                raise ValueError(f"{output_file} already holds rows in {table}")
+        
+        for database, db_file in sources.items():
+            conn.execute(f"ATTACH DATABASE ? AS {database}_source", (db_file,))
+        
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for database in sources:
+                for table in MERGED_TABLES[database]:
+                    columns = ", ".join(table_columns(conn, table))
+                    conn.execute(f"INSERT INTO main.{table} ({columns}) SELECT {columns} FROM {database}_source.{table}")
+            
+            # Keep new reminder IDs above every ID the old file handed out
+            conn.execute(
+                "UPDATE main.sqlite_sequence SET seq = MAX(seq, COALESCE("
+                "(SELECT seq FROM reminders_source.sqlite_sequence WHERE name = 'reminders'), 0)) "
+                "WHERE name = 'reminders'"
+            )
+            conn.commit()
+        finally:
+            for database in sources:
+                conn.execute(f"DETACH DATABASE {database}_source")
+        
+        for table, expected in counts.items():
+            copied = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if copied != expected:
+                raise RuntimeError(f"Copied {copied} of {expected} rows into {table}")
+    
+    logger.info(f"Merged {reminders_file} and {conversations_file} into {output_file}")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the reminders and conversations databases into one file")
+    parser.add_argument("--reminders", default="reminders.db", help="Reminders database file")
+    parser.add_argument("--conversations", default="database.db", help="Conversations database file")
+    parser.add_argument("--output", default=config.DB_FILE, help="Merged database file")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many rows would be copied")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    try:
+        counts = merge_databases(args.reminders, args.conversations, args.output, args.dry_run)
+    except ValueError as e:
+        sys.exit(str(e))
+    elapsed = time.perf_counter() - start
+    
+    for table, count in counts.items():
+        print(f"{table}: {count} rows{' to copy' if args.dry_run else ''}")
+    if not args.dry_run:
+        print(f"Merged into {args.output} in {elapsed:.2f}s; set DB_LAYOUT=single to use it")
+
+if __name__ == "__main__":
+    main()
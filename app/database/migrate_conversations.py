@@ -0,0 +1,99 @@
+"""
+Convert conversations stored as JSON blobs in ``conversations.messages`` into
+rows of the append-only ``conversation_messages`` table.
+
+Runs as conversations migration 4 (see app.database.migrations) and lazily on
+each conversation's next write.
+"""
+
+import json
+import time
+import logging
+from sqlite3 import Connection
+from typing import Dict, Any, Optional
+
+from app import config
+from app.database.connection import CONVERSATIONS_DB_FILE
+from app.database.pool import get_pool
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database.migrate")
+
+def convert_conversation_blob(conn: Connection, conversation_id: str) -> int:
+    """Move one conversation's legacy JSON messages into conversation_messages
+    
+    Must run inside a write transaction. Conversations that already have message
+    rows are left untouched apart from clearing the legacy blob.
+    
+    Args:
+        conn: A connection to the conversations database
+        conversation_id: The ID of the conversation
+        
+    Returns:
+        The number of messages inserted
+    """
+    row = conn.execute("SELECT messages FROM conversations WHERE id = ?", (conversation_id,)).fetchone()
+    if not row or not row["messages"] or row["messages"] == "[]":
+        return 0
+    
+    inserted = 0
+    existing = conn.execute(
+        "SELECT 1 FROM conversation_messages WHERE conversation_id = ? LIMIT 1",
+        (conversation_id,)
+    ).fetchone()
+    
+    if not existing:
+        try:
+            messages = json.loads(row["messages"])
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping unreadable messages for conversation {conversation_id}")
+            messages = []
+        
+        conn.executemany(
+            "INSERT INTO conversation_messages (conversation_id, seq, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+            [
+                (conversation_id, seq, msg.get("role", "user"), msg.get("content", ""), msg.get("timestamp", ""))
+                for seq, msg in enumerate(messages, start=1)
+            ]
+        )
+        inserted = len(messages)
+    
+    conn.execute("UPDATE conversations SET messages = '[]' WHERE id = ?", (conversation_id,))
+    return inserted
+
+def migrate_conversation_blobs(db_file: str = CONVERSATIONS_DB_FILE, batch_size: Optional[int] = 500, dry_run: bool = False) -> Dict[str, Any]:
+    """Convert every legacy conversation blob, committing one batch at a time
+    
+    Args:
+        db_file: The conversations database file
+        batch_size: Conversations converted per transaction (None converts all in one)
+        dry_run: Only count the conversations that would be converted
+        
+    Returns:
+        A dictionary with conversation and message counts
+    """
+    stats = {"conversations": 0, "messages": 0}
+    
+    with get_pool(db_file).connection() as conn:
+        if dry_run:
+            stats["conversations"] = conn.execute(
+                "SELECT COUNT(*) FROM conversations WHERE messages IS NOT NULL AND messages != '[]'"
+            ).fetchone()[0]
+            return stats
+        
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = [row["id"] for row in conn.execute(
+                "SELECT id FROM conversations WHERE messages IS NOT NULL AND messages != '[]' LIMIT ?",
+                (batch_size or -1,)
+            )]
+            for conversation_id in ids:
+                stats["messages"] += convert_conversation_blob(conn, conversation_id)
+            conn.commit()
+            
+            stats["conversations"] += len(ids)
+            if batch_size is None or len(ids) < batch_size:
+                break
+            time.sleep(config.MIGRATION_BATCH_PAUSE)
+    
+    return stats
@@ -0,0 +1,458 @@
+"""
+Versioned schema migrations for the reminders and conversations databases.
+
+Each database records the migrations it has applied in a ``schema_version``
+table (keyed by database, so both schemas can share one file), and pending migrations run in version order. Schema changes run in one
+transaction together with their version row. Large table rewrites are batched:
+in online mode every batch is its own short transaction, so the app keeps
+serving while they run.
+
+Usage: python -m app.database [--database NAME] [--dry-run] [--offline] [--batch-size N]
+"""
+
+import argparse
+import json
+import time
+import logging
+from sqlite3 import Connection
+from typing import Dict, Any, Callable, List, Optional
+
+from app import config
+from app.database.connection import REMINDERS_DB_FILE, CONVERSATIONS_DB_FILE
+from app.database.migrate_conversations import migrate_conversation_blobs
+from app.database.pool import get_pool
+from app.utils import normalize_tags
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database.migrations")
+
+class Migration:
+    """One forward schema change
+    
+    A plain migration is called as ``apply(conn)`` inside a write transaction
+    that also records its version. A batched migration is called as
+    ``apply(db_file, batch_size)``, commits its own batches and must be safe to
+    run again if it is interrupted; ``batch_size`` is None in offline mode.
+    """
+    
+    def __init__(self, version: int, name: str, apply: Callable[..., Any], batched: bool = False):
+        self.version = version
+        self.name = name
+        self.apply = apply
+        self.batched = batched
+
+def table_columns(conn: Connection, table: str) -> List[str]:
+    """Get the column names of a table
+    
+    Args:
+        conn: A database connection
+        table: The table name
+        
+    Returns:
+        The column names, or an empty list if the table does not exist
+    """
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+def rebuild_table(db_file: str, table: str, create_sql: str, column_map: Dict[str, str], batch_size: Optional[int]) -> int:
+    """Rewrite a table into a new definition while it stays in use
+    
+    Rows are copied by rowid into a shadow table one batch at a time. Triggers
+    mirror writes made to the old table during the copy, and a final short
+    transaction swaps the shadow table in. An interrupted rebuild resumes from
+    the last copied row.
+    
+    Args:
+        db_file: The database file
+        table: The table to rewrite
+        create_sql: CREATE TABLE statement for the new definition, with ``{table}`` for the name
+        column_map: Maps each new column to the old column it is copied from
+        batch_size: Rows copied per transaction (None copies everything at once)
+        
+    Returns:
+        The number of rows copied
+    """
+    shadow = f"{table}__rebuild"
+    new_columns = ", ".join(column_map)
+    old_columns = ", ".join(column_map.values())
+    new_values = ", ".join(f"NEW.{column}" for column in column_map.values())
+    copied = 0
+    
+    with get_pool(db_file).connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if not table_columns(conn, shadow):
+            conn.execute(create_sql.format(table=shadow))
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT OR REPLACE INTO {shadow} (rowid, {new_columns}) VALUES (NEW.rowid, {new_values}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_update AFTER UPDATE ON {table} BEGIN "
+            f"INSERT OR REPLACE INTO {shadow} (rowid, {new_columns}) VALUES (NEW.rowid, {new_values}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {shadow}_delete AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {shadow} WHERE rowid = OLD.rowid; END"
+        )
+        conn.commit()
+        
+        last_rowid = 0
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size or -1)
+            ).fetchall()
+            if rows:
+                # Rows already mirrored by the triggers are newer; keep them
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {shadow} (rowid, {new_columns}) "
+                    f"SELECT rowid, {old_columns} FROM {table} WHERE rowid > ? AND rowid <= ?",
+                    (last_rowid, rows[-1][0])
+                )
+                last_rowid = rows[-1][0]
+                copied += len(rows)
+            conn.commit()
+            
+            if batch_size is None or len(rows) < batch_size:
+                break
+            time.sleep(config.MIGRATION_BATCH_PAUSE)
+        
+        conn.execute("BEGIN IMMEDIATE")
+        for suffix in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {shadow}_{suffix}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+        conn.commit()
+    
+    logger.info(f"Rebuilt table {table} ({copied} rows)")
+    return copied
+
+REMINDERS_TABLE_SQL = '''
+    CREATE TABLE {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_message TEXT NOT NULL,
+        date TEXT NOT NULL,
+        priority TEXT DEFAULT 'normal',
+        tags TEXT DEFAULT '[]',
+        completed BOOLEAN DEFAULT 0
+    )
+'''
+
+def _create_reminders(conn: Connection) -> None:
+    """Create the reminders table"""
+    conn.execute(REMINDERS_TABLE_SQL.format(table="IF NOT EXISTS reminders"))
+
+def _rename_reminder_message(db_file: str, batch_size: Optional[int]) -> None:
+    """Rewrite reminders tables created with a ``message`` column to use ``user_message``"""
+    with get_pool(db_file).connection() as conn:
+        columns = table_columns(conn, "reminders")
+    if "message" not in columns or "user_message" in columns:
+        return
+    
+    column_map = {"id": "id", "user_message": "message"}
+    column_map.update({column: column for column in ("date", "priority", "tags", "completed") if column in columns})
+    rebuild_table(db_file, "reminders", REMINDERS_TABLE_SQL, column_map, batch_size)
+
+def _index_reminders(conn: Connection) -> None:
+    """Serve the reminder list queries from one index range without sorting"""
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_completed_date_priority
+        ON reminders (completed, date, priority DESC)
+    ''')
+
+def _add_reminder_owner(conn: Connection) -> None:
+    """Give every reminder an owner and index the list queries per user
+    
+    Adding a column with a constant default does not rewrite the table; rows
+    created before users existed belong to DEFAULT_USER_ID.
+    """
+    default_user = config.DEFAULT_USER_ID.replace("'", "''")
+    conn.execute(f"ALTER TABLE reminders ADD COLUMN user_id TEXT NOT NULL DEFAULT '{default_user}'")
+    conn.execute("DROP INDEX IF EXISTS idx_reminders_completed_date_priority")
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_user_completed_date_priority
+        ON reminders (user_id, completed, date, priority DESC)
+    ''')
+
+def _create_reminder_tags(conn: Connection) -> None:
+    """Create the tag table used to filter reminders by tag
+    
+    reminders.tags keeps the tags as entered for display; reminder_tags holds
+    one normalized row per tag, keyed for (user_id, tag) lookups.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminder_tags (
+            user_id TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            reminder_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, tag, reminder_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminder_tags_reminder ON reminder_tags (reminder_id)")
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS reminder_tags_delete AFTER DELETE ON reminders BEGIN
+            DELETE FROM reminder_tags WHERE reminder_id = OLD.id;
+        END
+    ''')
+
+def _backfill_reminder_tags(db_file: str, batch_size: Optional[int]) -> None:
+    """Copy the JSON tags of existing reminders into reminder_tags
+    
+    Reminders are read in id order, one batch per transaction. Rows the app
+    has already written are left alone, so the backfill can be run again.
+    """
+    last_id = 0
+    tagged = 0
+    with get_pool(db_file).connection() as conn:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, user_id, tags FROM reminders WHERE id > ? AND tags NOT IN ('[]', '') ORDER BY id LIMIT ?",
+                (last_id, batch_size or -1)
+            ).fetchall()
+            tag_rows = []
+            for row in rows:
+                try:
+                    tags = json.loads(row["tags"])
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(tags, list):
+                    tag_rows.extend((row["user_id"], tag, row["id"]) for tag in normalize_tags(tags))
+            conn.executemany("INSERT OR IGNORE INTO reminder_tags (user_id, tag, reminder_id) VALUES (?, ?, ?)", tag_rows)
+            conn.commit()
+            tagged += len(rows)
+            
+            if batch_size is None or len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
+            time.sleep(config.MIGRATION_BATCH_PAUSE)
+    logger.info(f"Backfilled tags of {tagged} reminders")
+
+def _create_conversations(conn: Connection) -> None:
+    """Create the conversations table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conversations (
+            id TEXT PRIMARY KEY,
+            messages TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _create_conversation_messages(conn: Connection) -> None:
+    """Create the append-only message table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conversation_messages (
+            conversation_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (conversation_id, seq)
+        )
+    ''')
+
+def _create_conversation_summaries(conn: Connection) -> None:
+    """Create the rolling summary table for older messages"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conversation_summaries (
+            conversation_id TEXT PRIMARY KEY,
+            summary TEXT NOT NULL,
+            through_seq INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _convert_conversation_blobs(db_file: str, batch_size: Optional[int]) -> None:
+    """Move legacy JSON conversation blobs into conversation_messages"""
+    stats = migrate_conversation_blobs(db_file, batch_size)
+    logger.info(f"Converted {stats['conversations']} conversations ({stats['messages']} messages)")
+
+def _add_conversation_owner(conn: Connection) -> None:
+    """Give every conversation an owner
+    
+    Conversations created before users existed belong to DEFAULT_USER_ID.
+    """
+    default_user = config.DEFAULT_USER_ID.replace("'", "''")
+    conn.execute(f"ALTER TABLE conversations ADD COLUMN user_id TEXT NOT NULL DEFAULT '{default_user}'")
+
+def _create_response_cache(conn: Connection) -> None:
+    """Create the persistent tier of the general chat response cache"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS response_cache (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_created ON response_cache (created_at)")
+
+# Database files and their migrations, in version order
+DATABASES = {
+    "reminders": REMINDERS_DB_FILE,
+    "conversations": CONVERSATIONS_DB_FILE,
+}
+
+MIGRATIONS = {
+    "reminders": [
+        Migration(1, "create_reminders", _create_reminders),
+        Migration(2, "rename_reminder_message", _rename_reminder_message, batched=True),
+        Migration(3, "index_reminders_completed_date_priority", _index_reminders),
+        Migration(4, "add_reminder_owner", _add_reminder_owner),
+        Migration(5, "create_reminder_tags", _create_reminder_tags),
+        Migration(6, "backfill_reminder_tags", _backfill_reminder_tags, batched=True),
+    ],
+    "conversations": [
+        Migration(1, "create_conversations", _create_conversations),
+        Migration(2, "create_conversation_messages", _create_conversation_messages),
+        Migration(3, "create_conversation_summaries", _create_conversation_summaries),
+        Migration(4, "convert_conversation_blobs", _convert_conversation_blobs, batched=True),
+        Migration(5, "add_conversation_owner", _add_conversation_owner),
+    ],
+    # Only used when RESPONSE_CACHE_DB is set; migrated by the response cache itself
+    "response_cache": [
+        Migration(1, "create_response_cache", _create_response_cache),
+    ],
+}
+
+def _ensure_version_table(conn: Connection, database: str) -> None:
+    """Create the schema_version table
+    
+    Versions are kept per database so both schemas can share one file. Tables
+    created before that (one database per file, no component column) are
+    upgraded in place.
+    """
+    columns = table_columns(conn, "schema_version")
+    if "component" in columns:
+        return
+    
+    conn.execute("BEGIN IMMEDIATE")
+    if columns:
+        conn.execute("ALTER TABLE schema_version RENAME TO schema_version_old")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            component TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration_ms REAL,
+            PRIMARY KEY (component, version)
+        )
+    ''')
+    if columns:
+        conn.execute(
+            "INSERT INTO schema_version (component, version, name, applied_at, duration_ms) "
+            "SELECT ?, version, name, applied_at, duration_ms FROM schema_version_old",
+            (database,)
+        )
+        conn.execute("DROP TABLE schema_version_old")
+    conn.commit()
+
+def get_schema_version(conn: Connection, database: str) -> int:
+    """Get the latest applied migration version of a database
+    
+    Args:
+        conn: A database connection
+        database: The database name ("reminders" or "conversations")
+        
+    Returns:
+        The version number, or 0 for a database without migrations
+    """
+    _ensure_version_table(conn, database)
+    return conn.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version WHERE component = ?",
+        (database,)
+    ).fetchone()[0]
+
+def migrate(
+    database: str,
+    db_file: Optional[str] = None,
+    online: bool = True,
+    batch_size: int = config.MIGRATION_BATCH_SIZE,
+    dry_run: bool = False
+) -> List[Dict[str, Any]]:
+    """Apply the pending migrations of one database in order
+    
+    Args:
+        database: The database name ("reminders" or "conversations")
+        db_file: The database file (default: the app's file for that database)
+        online: Run batched migrations in short transactions so the app keeps serving
+        batch_size: Rows or conversations per transaction in online mode
+        dry_run: Only list the pending migrations
+        
+    Returns:
+        A list of dictionaries with version, name and duration_ms for each pending migration
+    """
+    db_file = db_file or DATABASES[database]
+    pool = get_pool(db_file)
+    results = []
+    
+    with pool.connection() as conn:
+        current = get_schema_version(conn, database)
+    
+    for migration in MIGRATIONS[database]:
+        if migration.version <= current:
+            continue
+        if dry_run:
+            results.append({"version": migration.version, "name": migration.name, "duration_ms": None})
+            continue
+        
+        start = time.perf_counter()
+        if migration.batched:
+            migration.apply(db_file, batch_size if online else None)
+        
+        with pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another process may have applied it while we waited for the lock
+            applied = conn.execute(
+                "SELECT 1 FROM schema_version WHERE component = ? AND version = ?",
+                (database, migration.version)
+            ).fetchone()
+            if applied:
+                conn.rollback()
+                continue
+            if not migration.batched:
+                migration.apply(conn)
+            duration_ms = (time.perf_counter() - start) * 1000
+            conn.execute(
+                "INSERT INTO schema_version (component, version, name, duration_ms) VALUES (?, ?, ?, ?)",
+                (database, migration.version, migration.name, duration_ms)
+            )
+            conn.commit()
+        
+        logger.info(f"Applied {database} migration {migration.version} {migration.name} in {duration_ms:.1f}ms")
+        results.append({"version": migration.version, "name": migration.name, "duration_ms": duration_ms})
+    
+    return results
+
+def init_db() -> None:
+    """Bring every database up to the latest schema version"""
+    try:
+        for database in DATABASES:
+            migrate(database)
+        logger.info("Databases initialized")
+    except Exception as e:
+        logger.error(f"Error initializing database: {str(e)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--database", choices=sorted(DATABASES), help="Only migrate one database")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the pending migrations")
+    parser.add_argument("--offline", action="store_true", help="Run batched migrations in a single transaction")
+    parser.add_argument("--batch-size", type=int, default=config.MIGRATION_BATCH_SIZE, help="Rows per transaction in online mode")
+    args = parser.parse_args()
+    
+    for database in [args.database] if args.database else DATABASES:
+        start = time.perf_counter()
+        results = migrate(database, online=not args.offline, batch_size=args.batch_size, dry_run=args.dry_run)
+        
+        if not results:
+            print(f"{database}: up to date")
+        for result in results:
+            if args.dry_run:
+                print(f"{database}: would apply {result['version']} {result['name']}")
+            else:
+                print(f"{database}: applied {result['version']} {result['name']} in {result['duration_ms']:.1f}ms")
+        if results and not args.dry_run:
+            print(f"{database}: done in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,274 @@
+import queue
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from sqlite3 import Connection
+from typing import Dict, Any, Iterator, List, Optional
+
+from app import config
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.database.pool")
+
+def apply_pragmas(conn: Connection, pragmas: Dict[str, Any]) -> None:
+    """Apply pragmas to a connection
+    
+    Args:
+        conn: A database connection
+        pragmas: Pragma names and values, e.g. {"journal_mode": "WAL"}
+    """
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available before the checkout timeout"""
+
+class ConnectionPool:
+    """A bounded pool of long-lived SQLite connections for a single database file
+    
+    Connections are created lazily, configured once with the pool's pragmas and
+    handed out through the ``connection()`` context manager. Idle connections are
+    reused most-recently-used first so that their page cache stays warm.
+    """
+    
+    def __init__(
+        self,
+        db_file: str,
+        max_size: int = config.DB_POOL_SIZE,
+        timeout: float = config.DB_POOL_TIMEOUT,
+        pragmas: Optional[Dict[str, Any]] = None,
+        max_idle: Optional[int] = None,
+        health_check_interval: float = config.DB_POOL_HEALTH_CHECK_INTERVAL
+    ):
+        """Create a pool
+        
+        Args:
+            db_file: The database file to connect to
+            max_size: Maximum number of connections checked out at once
+            timeout: Seconds to wait for a free connection before giving up
+            pragmas: Pragmas applied to every new connection (default: config.DB_PRAGMAS)
+            max_idle: Maximum number of idle connections kept open (default: max_size)
+            health_check_interval: Idle seconds after which a connection is checked before reuse
+        """
+        self.db_file = db_file
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.pragmas = dict(config.DB_PRAGMAS if pragmas is None else pragmas)
+        self.max_idle = self.max_size if max_idle is None else max_idle
+        self.health_check_interval = health_check_interval
+        
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"created": 0, "closed": 0, "checkouts": 0, "health_check_failures": 0, "checkpoints": 0}
+        self._last_checkpoint: Optional[Dict[str, int]] = None
+    
+    def _connect(self) -> Connection:
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, self.pragmas)
+        
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+    
+    def _discard(self, conn: Connection) -> None:
+        """Close a connection that will not be returned to the pool"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._stats["closed"] += 1
+    
+    def _is_healthy(self, conn: Connection) -> bool:
+        """Check that a connection can still run queries"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding unhealthy connection to {self.db_file}: {str(e)}")
+            with self._lock:
+                self._stats["health_check_failures"] += 1
+            return False
+    
+    def acquire(self) -> Connection:
+        """Check out a connection, waiting up to the pool timeout for a free slot
+        
+        Returns:
+            A database connection which must be given back with ``release()``
+        """
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_file} is closed")
+        
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeoutError(f"Timed out waiting for a connection to {self.db_file}")
+        
+        try:
+            conn = None
+            while conn is None:
+                try:
+                    conn, idle_since = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connect()
+                    break
+                
+                if time.monotonic() - idle_since > self.health_check_interval and not self._is_healthy(conn):
+                    self._discard(conn)
+                    conn = None
+            
+            with self._lock:
+                self._stats["checkouts"] += 1
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, conn: Connection) -> None:
+        """Return a checked out connection to the pool
+        
+        Args:
+            conn: A connection obtained from ``acquire()``
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            
+            if self._closed or self._idle.qsize() >= self.max_idle:
+                self._discard(conn)
+            else:
+                self._idle.put((conn, time.monotonic()))
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding connection to {self.db_file} after error: {str(e)}")
+            self._discard(conn)
+        finally:
+            self._slots.release()
+    
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Check out a connection for the duration of a ``with`` block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[Dict[str, int]]:
+        """Copy committed WAL frames back into the database file
+        
+        A passive checkpoint never blocks readers or writers; it copies what it
+        can and leaves the rest for the next run.
+        
+        Args:
+            mode: The checkpoint mode (PASSIVE, FULL, RESTART or TRUNCATE)
+            
+        Returns:
+            A dictionary with busy, log and checkpointed frame counts, or None if the database is not in WAL mode
+        """
+        with self.connection() as conn:
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+                return None
+            busy, log, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        
+        result = {"busy": busy, "log": log, "checkpointed": checkpointed}
+        with self._lock:
+            self._stats["checkpoints"] += 1
+            self._last_checkpoint = result
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool usage counters
+        
+        Returns:
+            A dictionary with pool size and usage statistics
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["db_file"] = self.db_file
+        stats["max_size"] = self.max_size
+        stats["idle"] = self._idle.qsize()
+        stats["open"] = stats["created"] - stats["closed"]
+        stats["last_checkpoint"] = self._last_checkpoint
+        return stats
+    
+    def close(self) -> None:
+        """Close all idle connections; checked out connections are closed on release"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+# One pool per database file
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_file: str) -> ConnectionPool:
+    """Get the shared connection pool for a database file, creating it on first use
+    
+    Args:
+        db_file: The database file
+        
+    Returns:
+        The connection pool for the file
+    """
+    pool = _pools.get(db_file)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_file)
+            if pool is None:
+                pool = ConnectionPool(db_file)
+                _pools[db_file] = pool
+    return pool
+
+def configure_pool(db_file: str, **options) -> ConnectionPool:
+    """Replace the shared pool for a database file with one using custom options
+    
+    Args:
+        db_file: The database file
+        **options: Keyword arguments passed to ConnectionPool
+        
+    Returns:
+        The new connection pool
+    """
+    with _pools_lock:
+        old_pool = _pools.get(db_file)
+        pool = ConnectionPool(db_file, **options)
+        _pools[db_file] = pool
+    if old_pool is not None:
+        old_pool.close()
+    return pool
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Get usage statistics for every shared connection pool
+    
+    Returns:
+        A list of pool statistics dictionaries
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+def checkpoint_all_pools() -> None:
+    """Run a passive WAL checkpoint on every shared connection pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        try:
+            pool.checkpoint()
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint of {pool.db_file} failed: {str(e)}")
+
+def close_all_pools() -> None:
+    """Close every shared connection pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
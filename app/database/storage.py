@@ -0,0 +1,44 @@
+import threading
+from typing import Dict, Optional, Type, Union
+
+from app import config
+from app.database.backends import StorageBackend, SQLiteBackend, PostgresBackend, MemoryBackend
+
+# Backends selectable with STORAGE_BACKEND
+BACKENDS: Dict[str, Type[StorageBackend]] = {
+    "sqlite": SQLiteBackend,
+    "postgres": PostgresBackend,
+    "memory": MemoryBackend,
+}
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> StorageBackend:
+    """Get the shared storage backend, creating the configured one on first use
+    
+    Returns:
+        The storage backend
+    """
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if config.STORAGE_BACKEND not in BACKENDS:
+                    raise ValueError(f"Unknown STORAGE_BACKEND '{config.STORAGE_BACKEND}'; expected one of {', '.join(BACKENDS)}")
+                _storage = BACKENDS[config.STORAGE_BACKEND]()
+    return _storage
+
+def configure_storage(backend: Union[str, StorageBackend]) -> StorageBackend:
+    """Replace the shared storage backend
+    
+    Args:
+        backend: A backend name from BACKENDS or a backend instance
+        
+    Returns:
+        The new storage backend; it still has to be started
+    """
+    global _storage
+    with _storage_lock:
+        _storage = BACKENDS[backend]() if isinstance(backend, str) else backend
+    return _storage
@@ -1,9 +1,68 @@
-from app.gemini.client import process_with_gemini
+from app.gemini.client import process_with_gemini, tool_dispatcher, command_fast_path, probe_tool_format, get_tool_format, reset_tool_format, ToolFormatUnavailable
 from app.gemini.tools import create_gemini_tools
-from app.gemini.general_client import process_general_chat
+from app.gemini.general_client import process_general_chat, stream_general_chat
+from app.gemini.runtime import generate_content, stream_content, get_gemini_metrics, configure_gemini_runtime, shutdown_gemini_runtime
+from app.gemini.singleflight import SingleFlight, single_flight
+from app.gemini.models import ModelRegistry, model_registry, get_model
+from app.gemini.context import ContextBuilder, ApproximateTokenizer, ExtractiveSummarizer, context_builder
+from app.gemini.dispatcher import ToolRegistry, ToolDispatcher, ToolArgumentError, create_tool_registry
+from app.gemini.retry import RetryPolicy, RetryDeadlineExceeded, retry_policy, deadline_budget, time_remaining, is_retryable
+from app.gemini.fake import FakeGenerativeModel, FakeResponse
+from app.gemini.commands import CommandFastPath
+from app.gemini.cache import ResponseCache, response_cache, normalize_prompt
+from app.gemini.semantic_cache import SemanticCache, VectorIndex, HashingEmbedder, GeminiEmbedder, semantic_cache
+from app.gemini.intent import IntentRouter, KeywordStage, HashedBayesStage, intent_router, REMINDER, GENERAL
 
 __all__ = [
     'process_with_gemini',
+    'tool_dispatcher',
+    'command_fast_path',
+    'CommandFastPath',
+    'ResponseCache',
+    'response_cache',
+    'normalize_prompt',
+    'SemanticCache',
+    'VectorIndex',
+    'HashingEmbedder',
+    'GeminiEmbedder',
+    'semantic_cache',
+    'probe_tool_format',
+    'get_tool_format',
+    'reset_tool_format',
+    'ToolFormatUnavailable',
     'create_gemini_tools',
-    'process_general_chat'
+    'process_general_chat',
+    'stream_general_chat',
+    'generate_content',
+    'stream_content',
+    'get_gemini_metrics',
+    'configure_gemini_runtime',
+    'shutdown_gemini_runtime',
+    'SingleFlight',
+    'single_flight',
+    'ModelRegistry',
+    'model_registry',
+    'get_model',
+    'ContextBuilder',
+    'ApproximateTokenizer',
+    'ExtractiveSummarizer',
+    'context_builder',
+    'ToolRegistry',
+    'ToolDispatcher',
+    'ToolArgumentError',
+    'create_tool_registry',
+    'RetryPolicy',
+    'RetryDeadlineExceeded',
+    'retry_policy',
+    'deadline_budget',
+    'time_remaining',
+    'is_retryable',
+    'FakeGenerativeModel',
+    'FakeResponse',
+    'IntentRouter',
+    'KeywordStage',
+    'HashedBayesStage',
+    'intent_router',
+    'REMINDER',
+    'GENERAL'
 ] 
\ No newline at end of file
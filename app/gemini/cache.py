@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+import logging
+from collections import OrderedDict
+from sqlite3 import Connection
+from typing import Dict, Any, List, Optional, Tuple
+
+from app import config
+from app.database import migrate, run_db, get_db_executor
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.cache")
+
+def normalize_prompt(text: str) -> str:
+    """Normalize a prompt for cache keys: case-folded, single spaces, no trailing punctuation"""
+    return re.sub(r"[\s.!?]+$", "", " ".join(text.casefold().split()))
+
+def _load_response(conn: Connection, key: str, now: float) -> Optional[Tuple[str, float]]:
+    """Read an unexpired response from the persistent tier"""
+    row = conn.execute(
+        "SELECT response, expires_at FROM response_cache WHERE key = ? AND expires_at > ?",
+        (key, now)
+    ).fetchone()
+    return (row[0], row[1]) if row else None
+
+def _store_response(conn: Connection, key: str, response: str, now: float, expires_at: float, max_entries: int, trim: bool) -> None:
+    """Write a response to the persistent tier, trimming old and expired rows when asked"""
+    conn.execute(
+        "INSERT OR REPLACE INTO response_cache (key, response, created_at, expires_at) VALUES (?, ?, ?, ?)",
+        (key, response, now, expires_at)
+    )
+    if trim:
+        conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM response_cache WHERE created_at < ("
+            "SELECT created_at FROM response_cache ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+            (max_entries - 1,)
+        )
+    conn.commit()
+
+class ResponseCache:
+    """Caches general chat replies for repeated prompts
+    
+    Keys cover the normalized prompt, the system prompt, the model settings and
+    any history, so only identical turns share a reply. The in-memory tier is
+    an LRU bounded by ``max_entries`` and ``max_bytes``; every entry expires
+    after ``ttl`` seconds. With ``db_file`` set, replies are also written to a
+    SQLite table that survives restarts and is read on in-memory misses; it
+    keeps the newest ``db_max_entries`` rows.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = config.RESPONSE_CACHE,
+        max_entries: int = config.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = config.RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = config.RESPONSE_CACHE_TTL,
+        max_history: int = config.RESPONSE_CACHE_MAX_HISTORY,
+        db_file: Optional[str] = config.RESPONSE_CACHE_DB,
+        db_max_entries: int = config.RESPONSE_CACHE_DB_MAX_ENTRIES
+    ):
+        """Create a cache
+        
+        Args:
+            enabled: Whether replies are cached at all
+            max_entries: Maximum replies kept in memory
+            max_bytes: Maximum UTF-8 bytes of replies kept in memory
+            ttl: Seconds a reply stays valid
+            max_history: Cache only turns with at most this many history messages
+            db_file: Optional SQLite file for the persistent tier
+            db_max_entries: Maximum replies kept in the persistent tier
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_history = max_history
+        self.db_file = db_file
+        self.db_max_entries = db_max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._db_ready = False
+        self._db_writes = 0
+        self.reset_metrics()
+    
+    def reset_metrics(self) -> None:
+        """Reset the hit and miss counters"""
+        self._metrics = {
+            "hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "skipped": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "db_errors": 0,
+        }
+    
+    def key(
+        self,
+        user_message: str,
+        system_prompt: str,
+        settings: Dict[str, Any],
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """Build the cache key of a chat turn
+        
+        Args:
+            user_message: The user's message
+            system_prompt: The system prompt of the chat client
+            settings: The model name and generation config
+            conversation_history: Optional conversation history
+            
+        Returns:
+            The key, or None if the turn should not be cached
+        """
+        history = conversation_history or []
+        if not self.enabled or len(history) > self.max_history:
+            self._metrics["skipped"] += self.enabled
+            return None
+        
+        material = [
+            normalize_prompt(user_message),
+            system_prompt,
+            settings,
+            [(msg["role"], normalize_prompt(msg["content"])) for msg in history],
+        ]
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+    
+    async def start(self) -> None:
+        """Create the persistent tier's table if it is configured"""
+        if self.db_file and not self._db_ready:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(get_db_executor(), migrate, "response_cache", self.db_file)
+            self._db_ready = True
+    
+    def _drop(self, key: str) -> None:
+        """Remove an in-memory entry"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _remember(self, key: str, response: str, expires_at: float) -> bool:
+        """Add an in-memory entry, evicting the least recently used ones over the limits"""
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (response, expires_at, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._metrics["evictions"] += 1
+        return True
+    
+    async def get(self, key: Optional[str]) -> Optional[str]:
+        """Get the cached reply for a key
+        
+        Args:
+            key: The key from ``key()``; None always misses
+            
+        Returns:
+            The reply, or None on a miss
+        """
+        if key is None:
+            return None
+        
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self._metrics["hits"] += 1
+                return entry[0]
+            self._drop(key)
+            self._metrics["expirations"] += 1
+        
+        if self.db_file:
+            try:
+                await self.start()
+                stored = await run_db(_load_response, key, now, db_file=self.db_file)
+            except Exception as e:
+                logger.warning(f"Response cache read failed: {str(e)}")
+                self._metrics["db_errors"] += 1
+                stored = None
+            if stored is not None:
+                self._remember(key, *stored)
+                self._metrics["db_hits"] += 1
+                return stored[0]
+        
+        self._metrics["misses"] += 1
+        return None
+    
+    async def set(self, key: Optional[str], response: str) -> None:
+        """Cache a reply
+        
+        Args:
+            key: The key from ``key()``; None is ignored
+            response: The reply text
+        """
+        if key is None or not response:
+            return
+        
+        now = time.time()
+        if self._remember(key, response, now + self.ttl):
+            self._metrics["stores"] += 1
+        
+        if self.db_file:
+            # Trim the table every few hundred writes rather than on each one
+            self._db_writes += 1
+            trim = self._db_writes % 256 == 0
+            try:
+                await self.start()
+                await run_db(_store_response, key, response, now, now + self.ttl, self.db_max_entries, trim, db_file=self.db_file)
+            except Exception as e:
+                logger.warning(f"Response cache write failed: {str(e)}")
+                self._metrics["db_errors"] += 1
+    
+    def clear(self) -> None:
+        """Drop every in-memory entry"""
+        self._entries.clear()
+        self._bytes = 0
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get cache counters
+        
+        Returns:
+            A dictionary with hit, miss and eviction counters and the in-memory size
+        """
+        metrics = dict(self._metrics)
+        lookups = metrics["hits"] + metrics["db_hits"] + metrics["misses"]
+        metrics["enabled"] = self.enabled
+        metrics["entries"] = len(self._entries)
+        metrics["bytes"] = self._bytes
+        metrics["hit_rate"] = (metrics["hits"] + metrics["db_hits"]) / lookups if lookups else 0.0
+        return metrics
+
+# Shared cache used by the general chat client
+response_cache = ResponseCache()
@@ -1,30 +1,20 @@
+import asyncio
 import json
 import logging
-import os
 from typing import Dict, Any, List, Optional, Tuple
-from dotenv import load_dotenv
-
-import google.generativeai as genai
 
+from app import config
 from app.gemini.tools import create_gemini_tools
-from app.services import (
-    add_reminder,
-    get_reminders,
-    complete_reminder,
-    delete_reminder,
-    get_upcoming_reminders
-)
-
-# Load environment variables from .env file
-load_dotenv()
+from app.gemini.commands import CommandFastPath
+from app.gemini.context import context_builder
+from app.gemini.dispatcher import ToolDispatcher, create_tool_registry, to_python
+from app.gemini.models import get_model
+from app.gemini.retry import retry_policy, is_retryable, time_remaining
+from app.gemini.runtime import generate_content
 
 # Configure logger
 logger = logging.getLogger("reminder-ai.gemini")
 
-# Set up Google Gemini AI
-API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=API_KEY)
-
 # System prompt for Gemini
 SYSTEM_PROMPT = """
 You are an advanced AI assistant that helps users manage their reminders and tasks.
@@ -44,303 +34,189 @@ IMPORTANT: Always use the appropriate function call when the user wants to:
 Be helpful, concise, and friendly in your responses.
 """
 
-async def process_with_gemini(user_message: str, conversation_history: Optional[List[Dict[str, Any]]] = None) -> str:
+async def process_with_gemini(
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None,
+    conversation_id: Optional[str] = None,
+    user_id: str = config.DEFAULT_USER_ID
+) -> str:
     """Process user message with Gemini AI and tools
     
     Args:
         user_message: The user's message
         conversation_history: Optional conversation history
+        conversation_id: Optional conversation ID used to store the rolling summary
+        user_id: The user whose reminders the tools act on and who owns the conversation
         
     Returns:
         The AI's response
     """
     try:
-        # Initialize model with tools
-        model = genai.GenerativeModel(
-            "gemini-1.5-flash",
-            generation_config={
-                "temperature": 0.7,
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 1024,
-            }
-        )
+        # Common commands need no model call
+        reply = await command_fast_path.try_run(user_message, user_id)
+        if reply is not None:
+            return reply
         
-        # Prepare conversation context
-        messages = []
+        # Get the shared model
+        model = get_model("reminder")
         
-        # Add system prompt first
-        messages.append({"role": "user", "parts": [SYSTEM_PROMPT]})
-        messages.append({"role": "model", "parts": ["I understand. I'll help with reminders and tasks."]})
-        
-        # Add conversation history if available
-        if conversation_history:
-            logger.info(f"Including conversation history with {len(conversation_history)} messages")
-            for msg in conversation_history:
-                role = "user" if msg["role"] == "user" else "model"
-                messages.append({"role": role, "parts": [msg["content"]]})
-        
-        # Add current user message
-        messages.append({"role": "user", "parts": [user_message]})
+        # Prepare conversation context within the token budget
+        messages = await context_builder.build(
+            SYSTEM_PROMPT,
+            "I understand. I'll help with reminders and tasks.",
+            user_message,
+            conversation_history,
+            conversation_id,
+            user_id
+        )
         
         logger.info(f"Sending message with {len(messages)} context messages")
         
-        # First try without tools to see if we can extract function call from text
-        logger.info("Trying without tools first to extract function call from text...")
-        response = model.generate_content(messages)
-        
-        response_text = None
-        if hasattr(response, 'text'):
-            response_text = response.text
-        elif hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'content') and candidate.content.parts:
-                for part in candidate.content.parts:
-                    if hasattr(part, 'text'):
-                        response_text = part.text
-        
-        logger.info(f"Response text: {response_text}")
-        
-        # Check for function call in text
-        if response_text:
-            # Look for add_reminder function call
-            if "add_reminder" in response_text:
-                import re
-                # Extract parameters from text
-                message_match = re.search(r'message\s*=\s*["\']([^"\']+)["\']', response_text)
-                date_match = re.search(r'date\s*=\s*["\']([^"\']+)["\']', response_text)
-                priority_match = re.search(r'priority\s*=\s*["\']([^"\']+)["\']', response_text)
-                
-                if message_match and date_match:
-                    message = message_match.group(1)
-                    date = date_match.group(1)
-                    priority = priority_match.group(1) if priority_match else "normal"
-                    
-                    logger.info(f"Extracted reminder: message={message}, date={date}, priority={priority}")
-                    
-                    # Call add_reminder service
-                    result = await add_reminder(message, date, priority, [])
-                    return result.get("message")
-            
-            # Look for get_reminders function call
-            elif any(keyword in response_text.lower() for keyword in ["get_reminders", "show reminders", "list reminders"]):
-                date = None
-                completed = False
-                
-                # Check for date in text
-                if "today" in response_text.lower():
-                    date = "today"
-                elif "tomorrow" in response_text.lower():
-                    date = "tomorrow"
-                
-                # Check for completed status
-                if "completed" in response_text.lower():
-                    completed = True
-                
-                logger.info(f"Getting reminders with date={date}, completed={completed}")
-                
-                # Call get_reminders service
-                result = await get_reminders(date, completed)
-                return result.get("message")
-            
-            # Look for complete_reminder function call
-            elif "complete_reminder" in response_text or "mark as complete" in response_text.lower():
-                import re
-                reminder_id_match = re.search(r'reminder_id\s*=\s*(\d+)', response_text)
-                
-                if reminder_id_match:
-                    reminder_id = int(reminder_id_match.group(1))
-                    logger.info(f"Completing reminder with ID: {reminder_id}")
-                    
-                    # Call complete_reminder service
-                    result = await complete_reminder(reminder_id)
-                    return result.get("message")
-            
-            # Look for delete_reminder function call
-            elif "delete_reminder" in response_text or "delete reminder" in response_text.lower():
-                import re
-                reminder_id_match = re.search(r'reminder_id\s*=\s*(\d+)', response_text)
-                
-                if reminder_id_match:
-                    reminder_id = int(reminder_id_match.group(1))
-                    logger.info(f"Deleting reminder with ID: {reminder_id}")
-                    
-                    # Call delete_reminder service
-                    result = await delete_reminder(reminder_id)
-                    return result.get("message")
-            
-            # Look for get_upcoming_reminders function call
-            elif "get_upcoming_reminders" in response_text or "upcoming reminders" in response_text.lower():
-                logger.info("Getting upcoming reminders")
-                
-                # Call get_upcoming_reminders service
-                result = await get_upcoming_reminders()
-                return result.get("message")
-        
-        # If we couldn't extract a function call, return the response text
-        if "remind" in user_message.lower() and "tomorrow" in user_message.lower():
-            # Extract the task from the message
-            task = user_message.lower().replace("remind me to", "").replace("tomorrow", "").strip()
-            if task:
-                logger.info(f"Extracted task from message: {task}")
-                result = await add_reminder(task, "tomorrow", "normal", [])
-                return result.get("message")
-        
-        # If all else fails, return the model's response
-        return response_text or "I'm sorry, I couldn't process your request. Please try rephrasing your message."
+        # Let the model call the reminder tools directly
+        return await tool_dispatcher.run(model, messages, user_id)
     
     except Exception as e:
         logger.error(f"Error processing with Gemini: {str(e)}")
         return f"I'm sorry, I encountered an error: {str(e)}"
 
-async def try_gemini_with_tools(model, messages, tools) -> Tuple[Any, Optional[str]]:
-    """Try different methods to call Gemini with tools
+def read_response_parts(response) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+    """Read function calls and text from a Gemini response
     
     Args:
-        model: The Gemini model
-        messages: The conversation messages
-        tools: The tools definition
+        response: The Gemini response
         
     Returns:
-        A tuple of (function_call, response_text)
+        A tuple of ([(function_name, args), ...], response_text)
     """
-    function_call = None
-    response_text = None
+    function_calls = []
+    texts = []
     
-    # Try the first format (preferred)
-    try:
-        # Format tools correctly for function calling
-        formatted_tools = tools
-        
-        response = model.generate_content(
-            messages,
-            tools=formatted_tools,
-            tool_config={"function_calling": "auto"}
-        )
-        
-        logger.info(f"Response type: {type(response)}")
-        
-        # Check if the model wants to call a function
-        if hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'content') and candidate.content.parts:
-                for part in candidate.content.parts:
-                    if hasattr(part, 'function_call'):
-                        function_call = part.function_call
-                        logger.info(f"Function call detected: {function_call.name}")
-                        break
-                    elif hasattr(part, 'text'):
-                        response_text = part.text
+    if hasattr(response, 'candidates') and response.candidates:
+        candidate = response.candidates[0]
+        if hasattr(candidate, 'content') and candidate.content.parts:
+            for part in candidate.content.parts:
+                # Proto parts always have a function_call attribute; only named calls are real
+                function_call = getattr(part, 'function_call', None)
+                if function_call is not None and getattr(function_call, 'name', None):
+                    logger.info(f"Function call detected: {function_call.name}")
+                    function_calls.append((function_call.name, extract_function_args(function_call)))
+                elif getattr(part, 'text', None):
+                    texts.append(part.text)
+    
+    return function_calls, "".join(texts) or None
+
+# Ways of passing tools to generate_content, in the order they are probed
+TOOL_CALL_FORMATS = {
+    "function_declarations": lambda tools: {"tools": [{"function_declarations": tools}]},
+    "tools": lambda tools: {"tools": tools},
+    "tools_with_config": lambda tools: {"tools": tools, "tool_config": {"function_calling": "auto"}},
+}
+
+# Tool call format that works with the installed SDK, found once by probe_tool_format
+_tool_format: Optional[str] = config.GEMINI_TOOL_FORMAT if config.GEMINI_TOOL_FORMAT in TOOL_CALL_FORMATS else None
+# Set when the probe found no working format, so requests stop probing
+_tool_format_unavailable = False
+
+# Errors meaning the SDK or API rejected the request shape, matched by class name
+# like RETRYABLE_ERRORS so google.api_core need not be imported
+REQUEST_SHAPE_ERRORS = {"TypeError", "ValueError", "InvalidArgument"}
+
+class ToolFormatUnavailable(RuntimeError):
+    """Raised when the model accepts none of the tool call formats"""
+
+def is_request_shape_error(error: BaseException) -> bool:
+    """Decide if an error means the tool call format was rejected
+    
+    Args:
+        error: The exception raised by a Gemini call
         
-        logger.info("Successfully processed with first format")
+    Returns:
+        True for TypeError, ValueError and InvalidArgument errors
+    """
+    return any(cls.__name__ in REQUEST_SHAPE_ERRORS for cls in type(error).__mro__)
+
+async def probe_tool_format(model, tools: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Find the tool call format accepted by the model and cache it
+    
+    Each format is tried once with a tiny prompt within the current deadline
+    budget. Transient errors stop the probe without caching anything, so the
+    next call probes again. When every format is rejected that result is cached
+    too, until reset_tool_format is called.
+    
+    Args:
+        model: The Gemini model
+        tools: The tools definition (default: create_gemini_tools())
         
-    except Exception as e1:
-        logger.warning(f"First attempt failed: {str(e1)}")
+    Returns:
+        The working format name
         
-        # Try the second format
-        try:
-            response = model.generate_content(
-                messages,
-                tools=[{"function_declarations": tools}]
-            )
-            
-            # Check if the model wants to call a function
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and candidate.content.parts:
-                    for part in candidate.content.parts:
-                        if hasattr(part, 'function_call'):
-                            function_call = part.function_call
-                            logger.info(f"Function call detected (second format): {function_call.name}")
-                            break
-                        elif hasattr(part, 'text'):
-                            response_text = part.text
-            
-            logger.info("Successfully processed with second format")
-            
-        except Exception as e2:
-            logger.warning(f"Second attempt failed: {str(e2)}")
-            
-            # Try a third format
-            try:
-                response = model.generate_content(
-                    messages,
-                    tools=tools
-                )
-                
-                # Check for function call
-                if hasattr(response, 'candidates') and response.candidates:
-                    candidate = response.candidates[0]
-                    if hasattr(candidate, 'content') and candidate.content.parts:
-                        for part in candidate.content.parts:
-                            if hasattr(part, 'function_call'):
-                                function_call = part.function_call
-                                logger.info(f"Function call detected (third format): {function_call.name}")
-                                break
-                            elif hasattr(part, 'text'):
-                                response_text = part.text
-                
-                logger.info("Successfully processed with third format")
-                
-            except Exception as e3:
-                logger.warning(f"Third attempt failed: {str(e3)}")
-                
-                # Fall back to no tools as a last resort
-                try:
-                    response = model.generate_content(messages)
-                    
-                    if hasattr(response, 'text'):
-                        response_text = response.text
-                    elif hasattr(response, 'candidates') and response.candidates:
-                        candidate = response.candidates[0]
-                        if hasattr(candidate, 'content') and candidate.content.parts:
-                            for part in candidate.content.parts:
-                                if hasattr(part, 'text'):
-                                    response_text = part.text
-                    
-                    logger.info("Successfully processed without tools")
-                    
-                except Exception as e4:
-                    logger.error(f"All attempts failed: {str(e4)}")
-                    return None, "I'm sorry, I'm having trouble processing your request right now. Please try again later."
+    Raises:
+        ToolFormatUnavailable: If no format works
+    """
+    global _tool_format, _tool_format_unavailable
+    if _tool_format:
+        return _tool_format
+    if _tool_format_unavailable:
+        raise ToolFormatUnavailable("No tool call format accepted; reminder tools are unavailable")
     
-    # If we have response text but no function call, check for function call in text
-    if response_text and not function_call:
-        logger.info(f"Checking text for function call: {response_text[:100]}...")
+    tools = tools if tools is not None else create_gemini_tools()
+    probe = [{"role": "user", "parts": ["Reply with the single word OK."]}]
+    
+    for name, build_kwargs in TOOL_CALL_FORMATS.items():
+        try:
+            await asyncio.wait_for(generate_content(model, probe, **build_kwargs(tools)), timeout=max(0.0, time_remaining()))
+        except Exception as e:
+            if is_retryable(e):
+                logger.warning(f"Tool format probe interrupted by {type(e).__name__}: {str(e)}")
+                raise
+            logger.info(f"Tool format '{name}' rejected: {str(e)}")
+            continue
         
-        # Look for function call pattern in text
-        import re
-        function_match = re.search(r'add_reminder\(.*?\)', response_text, re.DOTALL)
-        if function_match:
-            function_text = function_match.group(0)
-            logger.info(f"Found function call in text: {function_text}")
-            
-            # Extract function name and arguments
-            try:
-                function_name = "add_reminder"
-                args_text = function_text.replace("add_reminder(", "").rstrip(")")
-                
-                # Parse arguments
-                args_dict = {}
-                for arg_pair in args_text.split(","):
-                    if "=" in arg_pair:
-                        key, value = arg_pair.split("=", 1)
-                        key = key.strip()
-                        value = value.strip().strip('"\'')
-                        args_dict[key] = value
-                
-                # Create a simple function call object
-                class FunctionCall:
-                    def __init__(self, name, args):
-                        self.name = name
-                        self.args = args
-                
-                function_call = FunctionCall(function_name, json.dumps(args_dict))
-                logger.info(f"Created function call from text: {function_name} with args {args_dict}")
-            except Exception as e:
-                logger.error(f"Failed to parse function call from text: {str(e)}")
+        logger.info(f"Using tool call format '{name}'")
+        _tool_format = name
+        return name
+    
+    logger.error("No tool call format accepted; reminder tools are unavailable")
+    _tool_format_unavailable = True
+    raise ToolFormatUnavailable("No tool call format accepted; reminder tools are unavailable")
+
+def reset_tool_format() -> None:
+    """Forget the cached tool call format so it is probed again"""
+    global _tool_format, _tool_format_unavailable
+    _tool_format = None
+    _tool_format_unavailable = False
+
+def get_tool_format() -> Optional[str]:
+    """Get the cached tool call format"""
+    return _tool_format
+
+async def try_gemini_with_tools(model, messages, tools) -> Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]:
+    """Call Gemini with tools using the probed tool call format
+    
+    Transient errors are retried by the shared retry policy within the request
+    deadline; other errors fail the call after a single round trip. The model is
+    never called without tools.
     
-    return function_call, response_text
+    Args:
+        model: The Gemini model
+        messages: The conversation messages
+        tools: The tools definition
+        
+    Returns:
+        A tuple of ([(function_name, args), ...], response_text)
+    """
+    tool_format = _tool_format
+    try:
+        tool_format = tool_format or await probe_tool_format(model, tools)
+        kwargs = TOOL_CALL_FORMATS[tool_format](tools)
+        response = await retry_policy.run(lambda: generate_content(model, messages, **kwargs))
+        return read_response_parts(response)
+    except Exception as e:
+        logger.error(f"Gemini call with tool format '{tool_format}' failed: {type(e).__name__}: {str(e)}")
+        if tool_format and is_request_shape_error(e):
+            # The SDK or API rejected the request shape; probe again on the next request
+            reset_tool_format()
+        return [], "I'm sorry, I'm having trouble processing your request right now. Please try again later."
 
 def extract_function_args(function_call) -> Dict[str, Any]:
     """Extract function arguments from a function call object
@@ -372,43 +248,17 @@ def extract_function_args(function_call) -> Dict[str, Any]:
                     logger.info(f"Extracted args via key=value parsing: {args_dict}")
                     return args_dict
         
-        # If that fails, try handling MapComposite objects
-        try:
-            # Initialize empty dict for arguments
-            function_args = {}
-            
-            # Check if it has _pb attribute (MapComposite structure)
-            if hasattr(function_call.args, '_pb'):
-                pb_dict = function_call.args._pb
-                
-                # Extract values from the nested structure
-                for key, value in pb_dict.items():
-                    # Extract the actual string value from the protobuf structure
-                    if hasattr(value, 'string_value') and value.string_value:
-                        function_args[key] = value.string_value
-                    elif hasattr(value, 'bool_value'):
-                        function_args[key] = value.bool_value
-                    elif hasattr(value, 'number_value'):
-                        function_args[key] = value.number_value
-                    elif hasattr(value, 'list_value') and hasattr(value.list_value, 'values'):
-                        # Handle list values
-                        function_args[key] = [
-                            v.string_value if hasattr(v, 'string_value') else v 
-                            for v in value.list_value.values
-                        ]
-            # If no _pb attribute, try __dict__ or dict() conversion
-            elif hasattr(function_call.args, '__dict__'):
-                function_args = function_call.args.__dict__
-            else:
-                function_args = dict(function_call.args)
-            
-            logger.info(f"Extracted args via object attributes: {function_args}")
-            return function_args
-                
-        except Exception as e:
-            logger.error(f"Failed to extract function args from MapComposite: {str(e)}")
-            return {}
+        # Structured arguments (MapComposite or dict) convert to plain Python values
+        function_args = to_python(function_call.args) or {}
+        logger.info(f"Extracted args via object attributes: {function_args}")
+        return dict(function_args)
     
     except Exception as e:
         logger.error(f"Failed to extract function args: {str(e)}")
-        return {} 
\ No newline at end of file
+        return {}
+
+# Shared function-calling engine for reminder chat
+tool_dispatcher = ToolDispatcher(create_tool_registry(), try_gemini_with_tools)
+
+# Commands run through the same tools without a model call
+command_fast_path = CommandFastPath(tool_dispatcher.registry)
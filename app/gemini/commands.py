@@ -0,0 +1,74 @@
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from app import config
+from app.gemini.dispatcher import ToolRegistry
+from app.utils.command_parser import parse_command
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.commands")
+
+class CommandFastPath:
+    """Runs common reminder commands without calling Gemini
+    
+    Messages recognized by parse_command go straight to the tool registry, so
+    they are validated and executed exactly like a model's function call. A
+    command whose tool fails (e.g. an unknown reminder ID) falls through to
+    Gemini, which can ask the user what they meant.
+    """
+    
+    def __init__(self, registry: ToolRegistry, enabled: bool = config.COMMAND_FAST_PATH):
+        """Create the fast path
+        
+        Args:
+            registry: The tool registry shared with the function-calling loop
+            enabled: Whether commands are recognized at all
+        """
+        self.registry = registry
+        self.enabled = enabled
+        self._metrics = {"messages": 0, "served": 0, "fell_through": 0, "by_command": {}, "seconds": 0.0}
+    
+    async def try_run(self, message: str, user_id: str = config.DEFAULT_USER_ID) -> Optional[str]:
+        """Run a message as a command if it is one
+        
+        Args:
+            message: The user's message
+            user_id: The user whose reminders the command acts on
+            
+        Returns:
+            The reply text, or None if Gemini should handle the message
+        """
+        if not self.enabled:
+            return None
+        
+        start = time.perf_counter()
+        self._metrics["messages"] += 1
+        try:
+            command = parse_command(message)
+            if command is None:
+                return None
+            
+            name, args = command
+            result = await self.registry.call(name, args, user_id=user_id)
+            if not result.get("success", False):
+                logger.info(f"Command {name} failed, passing the message to Gemini: {result.get('message')}")
+                self._metrics["fell_through"] += 1
+                return None
+            
+            self._metrics["served"] += 1
+            self._metrics["by_command"][name] = self._metrics["by_command"].get(name, 0) + 1
+            return result.get("message", "")
+        finally:
+            self._metrics["seconds"] += time.perf_counter() - start
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get fast path counters
+        
+        Returns:
+            A dictionary with message, served and fall-through counts
+        """
+        metrics = dict(self._metrics)
+        metrics["by_command"] = dict(self._metrics["by_command"])
+        metrics["served_fraction"] = metrics["served"] / metrics["messages"] if metrics["messages"] else 0.0
+        return metrics
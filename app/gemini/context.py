@@ -0,0 +1,210 @@
+import re
+import logging
+from typing import Dict, Any, List, Optional, Protocol
+
+from app import config
+from app.services import get_conversation_range, get_conversation_summary, save_conversation_summary
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.context")
+
+class Tokenizer(Protocol):
+    """Counts the tokens in a piece of text"""
+    
+    def count(self, text: str) -> int:
+        ...
+
+class Summarizer(Protocol):
+    """Folds older messages into a rolling summary"""
+    
+    async def summarize(self, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        ...
+
+class ApproximateTokenizer:
+    """Deterministic local token estimate of roughly four characters per token"""
+    
+    def count(self, text: str) -> int:
+        return (len(text) + 3) // 4
+
+class ExtractiveSummarizer:
+    """Deterministic local summarizer keeping the first sentence of each message
+    
+    The summary is trimmed from the oldest end so it never exceeds ``max_tokens``.
+    """
+    
+    def __init__(self, max_tokens: int = config.CONTEXT_SUMMARY_TOKENS, tokenizer: Optional[Tokenizer] = None, max_line_chars: int = 200):
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+        self.max_line_chars = max_line_chars
+    
+    async def summarize(self, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        lines = previous_summary.splitlines() if previous_summary else []
+        for msg in messages:
+            speaker = "User" if msg["role"] == "user" else "Assistant"
+            first_sentence = re.split(r"(?<=[.!?])\s", msg["content"].strip(), maxsplit=1)[0]
+            lines.append(f"- {speaker}: {first_sentence[:self.max_line_chars]}")
+        
+        while len(lines) > 1 and self.tokenizer.count("\n".join(lines)) > self.max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+class ContextBuilder:
+    """Fits conversation history into a token budget for a Gemini prompt
+    
+    The most recent messages are kept verbatim. Older messages are folded into a
+    rolling summary that is stored with the conversation, so each message is
+    summarized only once. Messages that left the loaded history window
+    (CONTEXT_HISTORY_LIMIT) while they still fit in the budget, and so were
+    never summarized, are read back from storage and folded in too.
+    """
+    
+    def __init__(
+        self,
+        token_budget: int = config.CONTEXT_TOKEN_BUDGET,
+        summary_tokens: int = config.CONTEXT_SUMMARY_TOKENS,
+        tokenizer: Optional[Tokenizer] = None,
+        summarizer: Optional[Summarizer] = None
+    ):
+        """Create a context builder
+        
+        Args:
+            token_budget: Maximum prompt tokens including the system prompt and user message
+            summary_tokens: Tokens reserved for the summary of older messages
+            tokenizer: Token counter (default: ApproximateTokenizer)
+            summarizer: Summarizer for older messages (default: ExtractiveSummarizer)
+        """
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+        self.summarizer = summarizer or ExtractiveSummarizer(summary_tokens, self.tokenizer)
+        self.reset_metrics()
+    
+    def reset_metrics(self) -> None:
+        """Reset the prompt size counters"""
+        self._metrics = {
+            "requests": 0,
+            "prompt_tokens_total": 0,
+            "prompt_tokens_last": 0,
+            "prompt_tokens_max": 0,
+            "messages_summarized": 0,
+            "messages_outside_window": 0,
+            "messages_outside_history": 0,
+        }
+    
+    async def _load_summary(
+        self,
+        conversation_id: Optional[str],
+        older: List[Dict[str, Any]],
+        first_seq: Optional[int],
+        user_id: str
+    ) -> str:
+        """Get the rolling summary covering the older messages, updating it if needed
+        
+        Args:
+            conversation_id: Optional ID used to store the rolling summary
+            older: Loaded messages that do not fit in the budget
+            first_seq: The seq of the first loaded message, if known
+            user_id: The owner of the conversation
+            
+        Returns:
+            The summary text
+        """
+        stored = await get_conversation_summary(conversation_id, user_id) if conversation_id else None
+        summary = stored["summary"] if stored else ""
+        through_seq = stored["through_seq"] if stored else 0
+        
+        # Only messages newer than the stored summary need summarizing
+        pending = [msg for msg in older if msg.get("seq") is None or msg["seq"] > through_seq]
+        
+        # Including any that were never loaded because they left the history window first
+        if conversation_id and first_seq is not None and first_seq - 1 > through_seq:
+            missed = await get_conversation_range(conversation_id, through_seq, first_seq, user_id)
+            self._metrics["messages_outside_history"] += len(missed)
+            pending = missed + pending
+        
+        if not pending:
+            return summary
+        
+        summary = await self.summarizer.summarize(summary, pending)
+        self._metrics["messages_summarized"] += len(pending)
+        
+        if conversation_id and all(msg.get("seq") is not None for msg in pending):
+            await save_conversation_summary(conversation_id, summary, pending[-1]["seq"], user_id)
+        return summary
+    
+    async def build(
+        self,
+        system_prompt: str,
+        acknowledgement: str,
+        user_message: str,
+        conversation_history: Optional[List[Dict[str, Any]]] = None,
+        conversation_id: Optional[str] = None,
+        user_id: str = config.DEFAULT_USER_ID
+    ) -> List[Dict[str, Any]]:
+        """Build the Gemini contents for a chat turn
+        
+        Args:
+            system_prompt: The system prompt sent as the first user message
+            acknowledgement: The model's reply to the system prompt
+            user_message: The user's message
+            conversation_history: Optional conversation history in chronological order
+            conversation_id: Optional ID used to store the rolling summary
+            user_id: The owner of the conversation
+            
+        Returns:
+            The list of contents for generate_content
+        """
+        history = conversation_history or []
+        fixed_tokens = sum(self.tokenizer.count(text) for text in (system_prompt, acknowledgement, user_message))
+        available = self.token_budget - fixed_tokens - self.summary_tokens
+        
+        # Keep as many recent messages as fit in the budget
+        recent: List[Dict[str, Any]] = []
+        used = 0
+        for msg in reversed(history):
+            tokens = self.tokenizer.count(msg["content"])
+            if used + tokens > available:
+                break
+            recent.append(msg)
+            used += tokens
+        recent.reverse()
+        older = history[:len(history) - len(recent)]
+        
+        # Messages before the loaded history also belong in the summary
+        first_seq = history[0].get("seq") if history else None
+        has_earlier = conversation_id is not None and first_seq is not None and first_seq > 1
+        summary = await self._load_summary(conversation_id, older, first_seq, user_id) if older or has_earlier else ""
+        if summary:
+            system_prompt = f"{system_prompt}\nSummary of the earlier conversation:\n{summary}\n"
+        
+        messages = [
+            {"role": "user", "parts": [system_prompt]},
+            {"role": "model", "parts": [acknowledgement]}
+        ]
+        for msg in recent:
+            role = "user" if msg["role"] == "user" else "model"
+            messages.append({"role": role, "parts": [msg["content"]]})
+        messages.append({"role": "user", "parts": [user_message]})
+        
+        prompt_tokens = sum(self.tokenizer.count(part) for msg in messages for part in msg["parts"])
+        self._metrics["requests"] += 1
+        self._metrics["prompt_tokens_total"] += prompt_tokens
+        self._metrics["prompt_tokens_last"] = prompt_tokens
+        self._metrics["prompt_tokens_max"] = max(self._metrics["prompt_tokens_max"], prompt_tokens)
+        self._metrics["messages_outside_window"] += len(older)
+        
+        logger.info(f"Built context with {len(recent)} recent messages, {len(older)} summarized, ~{prompt_tokens} prompt tokens")
+        return messages
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get prompt size counters
+        
+        Returns:
+            A dictionary with prompt token and summarization counters
+        """
+        metrics = dict(self._metrics)
+        metrics["prompt_tokens_avg"] = metrics["prompt_tokens_total"] / metrics["requests"] if metrics["requests"] else 0.0
+        return metrics
+
+# Shared context builder used by the chat clients
+context_builder = ContextBuilder()
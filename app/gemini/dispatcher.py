@@ -0,0 +1,258 @@
+import logging
+from collections.abc import Mapping
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+
+from app import config
+from app.gemini.retry import deadline_budget
+from app.gemini.tools import create_gemini_tools
+from app.services import (
+    add_reminder,
+    get_reminders,
+    complete_reminder,
+    delete_reminder,
+    get_upcoming_reminders
+)
+from app.utils import parse_date, render_reminders, render_upcoming_reminders
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.dispatcher")
+
+Handler = Callable[..., Awaitable[Dict[str, Any]]]
+
+class ToolArgumentError(ValueError):
+    """Raised when a function call's arguments do not match the tool schema"""
+
+def to_python(value: Any) -> Any:
+    """Convert SDK argument containers (MapComposite, RepeatedComposite) to plain Python values"""
+    if isinstance(value, Mapping):
+        return {key: to_python(item) for key, item in value.items()}
+    if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+        return value
+    return [to_python(item) for item in value]
+
+def _coerce(name: str, value: Any, schema: Dict[str, Any]) -> Any:
+    """Check a single argument against its JSON schema, converting compatible values"""
+    expected = schema.get("type")
+    
+    if expected == "string":
+        if not isinstance(value, str):
+            raise ToolArgumentError(f"'{name}' must be a string")
+    elif expected == "integer":
+        # Structured arguments arrive as floats; numeric strings come from loose models
+        if isinstance(value, bool):
+            raise ToolArgumentError(f"'{name}' must be an integer")
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        elif isinstance(value, str) and value.strip().lstrip("#").isdigit():
+            value = int(value.strip().lstrip("#"))
+        if not isinstance(value, int):
+            raise ToolArgumentError(f"'{name}' must be an integer")
+    elif expected == "boolean":
+        if isinstance(value, str) and value.lower() in ("true", "false"):
+            value = value.lower() == "true"
+        if not isinstance(value, bool):
+            raise ToolArgumentError(f"'{name}' must be a boolean")
+    elif expected == "array":
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            raise ToolArgumentError(f"'{name}' must be a list")
+        item_schema = schema.get("items", {})
+        value = [_coerce(f"{name}[{i}]", item, item_schema) for i, item in enumerate(value)]
+    
+    if "enum" in schema and value not in schema["enum"]:
+        raise ToolArgumentError(f"'{name}' must be one of {', '.join(schema['enum'])}")
+    return value
+
+class ToolRegistry:
+    """Maps Gemini tool names to async handlers and validates their arguments"""
+    
+    def __init__(self, schemas: Optional[List[Dict[str, Any]]] = None):
+        """Create a registry
+        
+        Args:
+            schemas: Tool definitions (default: create_gemini_tools())
+        """
+        self.schemas = schemas if schemas is not None else create_gemini_tools()
+        self._schemas_by_name = {schema["name"]: schema for schema in self.schemas}
+        self._handlers: Dict[str, Handler] = {}
+    
+    def register(self, name: str, handler: Handler) -> None:
+        """Register the handler for a tool
+        
+        Args:
+            name: The tool name, which must have a schema
+            handler: An async function called with the validated arguments
+        """
+        if name not in self._schemas_by_name:
+            raise KeyError(f"No schema for tool '{name}'")
+        self._handlers[name] = handler
+    
+    def validate(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate function call arguments against the tool schema
+        
+        Unknown arguments are dropped and compatible values are converted.
+        
+        Args:
+            name: The tool name
+            args: The arguments from the function call
+            
+        Returns:
+            The validated arguments
+        """
+        schema = self._schemas_by_name.get(name)
+        if schema is None or name not in self._handlers:
+            raise ToolArgumentError(f"Unknown function '{name}'")
+        
+        parameters = schema.get("parameters", {})
+        properties = parameters.get("properties", {})
+        missing = [key for key in parameters.get("required", []) if args.get(key) in (None, "")]
+        if missing:
+            raise ToolArgumentError(f"Missing required argument(s): {', '.join(missing)}")
+        
+        return {
+            key: _coerce(key, value, properties[key])
+            for key, value in args.items()
+            if key in properties and value is not None
+        }
+    
+    async def call(self, name: str, args: Dict[str, Any], **context: Any) -> Dict[str, Any]:
+        """Validate arguments and run a tool
+        
+        Args:
+            name: The tool name
+            args: The arguments from the function call
+            **context: Trusted values passed to the handler as-is, such as user_id;
+                the model cannot set them because validation drops unknown arguments
+                
+        Returns:
+            The handler's result dictionary, or a failure result for invalid arguments
+        """
+        try:
+            validated = self.validate(name, args)
+        except ToolArgumentError as e:
+            logger.warning(f"Rejected call to {name}: {str(e)}")
+            return {"success": False, "message": f"Invalid call to {name}: {str(e)}"}
+        
+        logger.info(f"Calling tool {name} with {validated}")
+        return await self._handlers[name](**validated, **context)
+
+def create_tool_registry() -> ToolRegistry:
+    """Create a registry mapping the reminder tools to the app.services functions
+    
+    Returns:
+        A ToolRegistry with a handler for every tool in create_gemini_tools()
+    """
+    registry = ToolRegistry()
+    
+    async def add_reminder_tool(message: str, date: str, priority: str = "normal", tags: Optional[List[str]] = None, **context):
+        return await add_reminder(message, date, priority, tags or [], **context)
+    
+    # Chat replies list the reminders as text; the API returns them as data only
+    async def get_reminders_tool(date: Optional[str] = None, completed: bool = False, tag: Optional[str] = None, **context):
+        result = await get_reminders(parse_date(date) if date else None, completed, tag=tag, **context)
+        return dict(result, message=render_reminders(result))
+    
+    async def get_upcoming_reminders_tool(**context):
+        result = await get_upcoming_reminders(**context)
+        return dict(result, message=render_upcoming_reminders(result))
+    
+    registry.register("add_reminder", add_reminder_tool)
+    registry.register("get_reminders", get_reminders_tool)
+    registry.register("complete_reminder", complete_reminder)
+    registry.register("delete_reminder", delete_reminder)
+    registry.register("get_upcoming_reminders", get_upcoming_reminders_tool)
+    return registry
+
+# Calls the model with tools: (model, messages, tools) -> ([(name, args), ...], response_text)
+ModelCaller = Callable[[Any, List[Any], List[Dict[str, Any]]], Awaitable[Tuple[List[Tuple[str, Dict[str, Any]]], Optional[str]]]]
+
+class ToolDispatcher:
+    """Runs the function-calling loop for a chat turn
+    
+    The model is called with the tool schemas. Function calls it returns are
+    validated and executed through the registry. When every call succeeds the
+    service messages are returned directly, saving a round trip; otherwise (or
+    when TOOL_FOLLOW_UP is set) the results are sent back as function responses
+    and the loop continues for up to ``max_steps`` model calls. The whole turn
+    shares one GEMINI_REQUEST_DEADLINE budget.
+    """
+    
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        call_model: ModelCaller,
+        max_steps: int = config.TOOL_MAX_STEPS,
+        follow_up: bool = config.TOOL_FOLLOW_UP
+    ):
+        if max_steps < 1:
+            raise ValueError(f"max_steps must be at least 1, got {max_steps}")
+        self.registry = registry
+        self.call_model = call_model
+        self.max_steps = max_steps
+        self.follow_up = follow_up
+        self._metrics = {"turns": 0, "model_calls": 0, "tool_calls": 0, "invalid_calls": 0, "step_limit_hits": 0}
+    
+    async def run(self, model: Any, messages: List[Any], user_id: str = config.DEFAULT_USER_ID) -> str:
+        """Run one chat turn
+        
+        Args:
+            model: The Gemini model
+            messages: The conversation contents; function calls and responses are appended
+            user_id: The user whose reminders the tools act on
+            
+        Returns:
+            The reply text
+        """
+        self._metrics["turns"] += 1
+        
+        with deadline_budget():
+            return await self._run_steps(model, messages, user_id)
+    
+    async def _run_steps(self, model: Any, messages: List[Any], user_id: str) -> str:
+        """Call the model and tools until a reply is ready or the step limit is hit"""
+        for step in range(self.max_steps):
+            function_calls, response_text = await self.call_model(model, messages, self.registry.schemas)
+            self._metrics["model_calls"] += 1
+            
+            if not function_calls:
+                return response_text or "I'm sorry, I couldn't process your request. Please try rephrasing your message."
+            
+            calls = function_calls
+            results = []
+            for name, args in calls:
+                self._metrics["tool_calls"] += 1
+                result = await self.registry.call(name, args, user_id=user_id)
+                if not result.get("success", False):
+                    self._metrics["invalid_calls"] += 1
+                results.append(result)
+            
+            if not self.follow_up and all(result.get("success", False) for result in results):
+                return "\n".join(result.get("message", "") for result in results)
+            
+            # Send the results back so the model can recover or continue
+            messages.append({
+                "role": "model",
+                "parts": [{"function_call": {"name": name, "args": args}} for name, args in calls]
+            })
+            messages.append({
+                "role": "function",
+                "parts": [
+                    {"function_response": {"name": name, "response": result}}
+                    for (name, _), result in zip(calls, results)
+                ]
+            })
+        
+        self._metrics["step_limit_hits"] += 1
+        logger.warning(f"Tool loop stopped after {self.max_steps} model calls")
+        return "\n".join(result.get("message", "") for result in results)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get tool loop counters
+        
+        Returns:
+            A dictionary with turn, model call and tool call counters
+        """
+        metrics = dict(self._metrics)
+        metrics["model_calls_per_turn"] = metrics["model_calls"] / metrics["turns"] if metrics["turns"] else 0.0
+        return metrics
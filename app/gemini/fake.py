@@ -0,0 +1,120 @@
+import re
+import time
+from typing import Dict, Any, Callable, Iterator, List, Optional, Union
+
+class FakeFunctionCall:
+    """A function call requested by the model"""
+    
+    def __init__(self, name: str, args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.args = args or {}
+
+class FakePart:
+    """A response part holding text or a function call"""
+    
+    def __init__(self, text: Optional[str] = None, function_call: Any = None):
+        self.text = text
+        self.function_call = function_call
+
+class FakeContent:
+    """Response content with a list of parts"""
+    
+    def __init__(self, parts: List[FakePart]):
+        self.role = "model"
+        self.parts = parts
+
+class FakeCandidate:
+    """A single response candidate"""
+    
+    def __init__(self, parts: List[FakePart]):
+        self.content = FakeContent(parts)
+
+class FakeResponse:
+    """A stand-in for a Gemini GenerateContentResponse"""
+    
+    def __init__(self, text: str = "", parts: Optional[List[FakePart]] = None):
+        self.candidates = [FakeCandidate(parts if parts is not None else [FakePart(text=text)])]
+    
+    @classmethod
+    def function_call(cls, name: str, **args) -> "FakeResponse":
+        """Build a response asking for a single function call"""
+        return cls(parts=[FakePart(function_call=FakeFunctionCall(name, args))])
+    
+    @property
+    def text(self) -> str:
+        return "".join(part.text or "" for part in self.candidates[0].content.parts)
+
+class FakeStreamResponse:
+    """A streamed response yielding the reply a few words at a time"""
+    
+    def __init__(self, text: str, delay: float, chunk_delay: float, words_per_chunk: int = 3):
+        self._words = re.findall(r"\S+\s*", text)
+        self._delay = delay
+        self._chunk_delay = chunk_delay
+        self._words_per_chunk = words_per_chunk
+    
+    @property
+    def duration(self) -> float:
+        """Seconds needed to produce every chunk"""
+        chunks = -(-len(self._words) // self._words_per_chunk)
+        return self._delay + self._chunk_delay * max(0, chunks - 1)
+    
+    def __iter__(self) -> Iterator[FakeResponse]:
+        if self._delay:
+            time.sleep(self._delay)
+        for i in range(0, len(self._words), self._words_per_chunk):
+            if i and self._chunk_delay:
+                time.sleep(self._chunk_delay)
+            yield FakeResponse("".join(self._words[i:i + self._words_per_chunk]))
+
+class FakeGenerativeModel:
+    """A local stand-in for genai.GenerativeModel used by benchmarks and offline runs
+    
+    Replies come from ``reply``, which may be a fixed string, a list of responses
+    returned in turn, or a callable receiving the contents. Exceptions are raised. Every call sleeps for
+    ``delay`` seconds to imitate a network round trip. With ``stream=True`` the
+    first chunk arrives after ``delay`` and later chunks every ``chunk_delay``.
+    """
+    
+    def __init__(
+        self,
+        reply: Union[str, List[Any], Callable[[Any], Any]] = "This is a fake reply.",
+        delay: float = 0.0,
+        chunk_delay: float = 0.0
+    ):
+        self.reply = reply
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+    
+    def _next_reply(self, contents) -> Any:
+        """Pick the reply for the current call"""
+        if callable(self.reply):
+            return self.reply(contents)
+        if isinstance(self.reply, list):
+            return self.reply[min(self.calls - 1, len(self.reply) - 1)]
+        return self.reply
+    
+    def generate_content(self, contents, stream: bool = False, **kwargs) -> Union[FakeResponse, FakeStreamResponse]:
+        """Return the next fake reply after sleeping for the configured delay"""
+        self.calls += 1
+        if stream:
+            reply = self._next_reply(contents)
+            if isinstance(reply, Exception):
+                raise reply
+            text = reply.text if isinstance(reply, FakeResponse) else str(reply)
+            return FakeStreamResponse(text, self.delay, self.chunk_delay)
+        
+        reply = self._next_reply(contents)
+        delay = self.delay
+        if self.chunk_delay and not isinstance(reply, (Exception, FakeResponse)):
+            # A full reply takes as long as streaming every chunk
+            delay = FakeStreamResponse(str(reply), self.delay, self.chunk_delay).duration
+        if delay:
+            time.sleep(delay)
+        
+        if isinstance(reply, Exception):
+            raise reply
+        if isinstance(reply, FakeResponse):
+            return reply
+        return FakeResponse(str(reply))
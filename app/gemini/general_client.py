@@ -1,21 +1,18 @@
 import json
 import logging
-import os
-from typing import Dict, Any, List, Optional
-from dotenv import load_dotenv
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 
-import google.generativeai as genai
-
-# Load environment variables from .env file
-load_dotenv()
+from app import config
+from app.gemini.cache import response_cache
+from app.gemini.context import context_builder
+from app.gemini.models import get_model, model_registry
+from app.gemini.retry import retry_policy, deadline_budget
+from app.gemini.runtime import generate_content, stream_content
+from app.gemini.semantic_cache import semantic_cache
 
 # Configure logger
 logger = logging.getLogger("reminder-ai.gemini.general")
 
-# Set up Google Gemini AI (reusing the same API key)
-API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=API_KEY)
-
 # System prompt for general chat
 GENERAL_SYSTEM_PROMPT = """
 You are an advanced AI assistant that can help with a wide range of topics.
@@ -30,51 +27,79 @@ You should be:
 If the user asks about reminders or tasks, suggest they use the reminder-specific features of the application.
 """
 
-async def process_general_chat(user_message: str, conversation_history: Optional[List[Dict[str, Any]]] = None) -> str:
+GENERAL_ACKNOWLEDGEMENT = "I understand. I'll help with general questions and conversations."
+
+async def _cached_reply(
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]]
+) -> Tuple[Optional[str], Callable[[str], Awaitable[None]]]:
+    """Look a turn up in the exact and semantic reply caches
+    
+    Args:
+        user_message: The user's message
+        conversation_history: Optional conversation history
+        
+    Returns:
+        The cached reply (or None) and a coroutine function that caches a new reply
+    """
+    settings = model_registry.settings("general")
+    cache_key = response_cache.key(user_message, GENERAL_SYSTEM_PROMPT, settings, conversation_history)
+    cached = await response_cache.get(cache_key)
+    
+    namespace = vector = None
+    if cached is None and semantic_cache.enabled and not conversation_history:
+        namespace = semantic_cache.namespace(GENERAL_SYSTEM_PROMPT, settings)
+        cached, vector = await semantic_cache.lookup(user_message, namespace)
+    
+    async def remember(reply: str) -> None:
+        await response_cache.set(cache_key, reply)
+        semantic_cache.store(vector, reply, namespace)
+    
+    return cached, remember
+
+async def process_general_chat(
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None,
+    conversation_id: Optional[str] = None,
+    user_id: str = config.DEFAULT_USER_ID
+) -> str:
     """Process user message with Gemini AI for general chat
     
     Args:
         user_message: The user's message
         conversation_history: Optional conversation history
+        conversation_id: Optional conversation ID used to store the rolling summary
+        user_id: The owner of the conversation
         
     Returns:
         The AI's response
     """
     try:
-        # Initialize model without tools for general chat
-        model = genai.GenerativeModel(
-            "gemini-1.5-flash",
-            generation_config={
-                "temperature": 0.7,
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 1024,
-            }
-        )
-        
-        # Prepare conversation context
-        messages = []
+        # Repeated or reworded history-free questions can reuse an earlier reply
+        cached, remember = await _cached_reply(user_message, conversation_history)
+        if cached is not None:
+            return cached
         
-        # Add system prompt first
-        messages.append({"role": "user", "parts": [GENERAL_SYSTEM_PROMPT]})
-        messages.append({"role": "model", "parts": ["I understand. I'll help with general questions and conversations."]})
+        # Get the shared model
+        model = get_model("general")
         
-        # Add conversation history if available
-        if conversation_history:
-            logger.info(f"Including conversation history with {len(conversation_history)} messages")
-            for msg in conversation_history:
-                role = "user" if msg["role"] == "user" else "model"
-                messages.append({"role": role, "parts": [msg["content"]]})
-        
-        # Add current user message
-        messages.append({"role": "user", "parts": [user_message]})
+        # Prepare conversation context within the token budget
+        messages = await context_builder.build(
+            GENERAL_SYSTEM_PROMPT,
+            GENERAL_ACKNOWLEDGEMENT,
+            user_message,
+            conversation_history,
+            conversation_id,
+            user_id
+        )
         
         logger.info(f"Sending general chat message with {len(messages)} context messages")
         logger.info("Sending general chat request to Gemini...")
         
         # Generate response without tools
         try:
-            response = model.generate_content(messages)
+            with deadline_budget():
+                response = await retry_policy.run(lambda: generate_content(model, messages))
             
             response_text = None
             if hasattr(response, 'text'):
@@ -88,12 +113,66 @@ async def process_general_chat(user_message: str, conversation_history: Optional
             
             logger.info("Successfully processed general chat")
             
-            return response_text or "I'm sorry, I couldn't process your request. Please try again."
-            
+            if not response_text:
+                return "I'm sorry, I couldn't process your request. Please try again."
+            await remember(response_text)
+            return response_text
+        
         except Exception as e:
             logger.error(f"Error in general chat: {str(e)}")
             return f"I'm sorry, I encountered an error: {str(e)}"
     
     except Exception as e:
         logger.error(f"Error processing with Gemini: {str(e)}")
-        return f"I'm sorry, I encountered an error: {str(e)}" 
\ No newline at end of file
+        return f"I'm sorry, I encountered an error: {str(e)}"
+
+async def stream_general_chat(
+    user_message: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None,
+    conversation_id: Optional[str] = None,
+    user_id: str = config.DEFAULT_USER_ID
+) -> AsyncIterator[str]:
+    """Stream a general chat reply from Gemini as it is generated
+    
+    Args:
+        user_message: The user's message
+        conversation_history: Optional conversation history
+        conversation_id: Optional conversation ID used to store the rolling summary
+        user_id: The owner of the conversation
+        
+    Yields:
+        Chunks of the AI's response
+        
+    Raises:
+        Exception: If Gemini fails or returns nothing; no error text is yielded as part of the reply
+    """
+    try:
+        cached, remember = await _cached_reply(user_message, conversation_history)
+        if cached is not None:
+            yield cached
+            return
+        
+        model = get_model("general")
+        messages = await context_builder.build(
+            GENERAL_SYSTEM_PROMPT,
+            GENERAL_ACKNOWLEDGEMENT,
+            user_message,
+            conversation_history,
+            conversation_id,
+            user_id
+        )
+        
+        logger.info(f"Streaming general chat message with {len(messages)} context messages")
+        
+        chunks = []
+        async for chunk in stream_content(model, messages):
+            chunks.append(chunk)
+            yield chunk
+        
+        if not chunks:
+            raise RuntimeError("Gemini returned an empty reply")
+        await remember("".join(chunks))
+    
+    except Exception as e:
+        logger.error(f"Error streaming general chat: {str(e)}")
+        raise
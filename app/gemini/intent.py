@@ -0,0 +1,389 @@
+import asyncio
+import math
+import re
+import time
+import zlib
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+from app import config
+from app.gemini.models import get_model
+from app.gemini.runtime import generate_content
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.intent")
+
+# Intents a chat message can be routed to
+REMINDER = "reminder"
+GENERAL = "general"
+INTENTS = (REMINDER, GENERAL)
+
+# High precision phrases for the keyword stage. Anything vaguer (a bare "task"
+# or "schedule") is left to the local model.
+KEYWORD_PATTERNS = {
+    REMINDER: [
+        r"\bremind (?:me|us|him|her|them)\b",
+        r"\b(?:set|add|create|make|new|schedule)\b(?:\s+\w+){0,2}\s+(?:reminder|to-?do|task)s?\b",
+        r"\b(?:my|all|any|upcoming|pending|open|completed|done|today'?s|tomorrow'?s)\s+(?:\w+\s+)?(?:reminders|to-?dos|tasks)\b",
+        r"\b(?:reminder|task|to-?do)\s*#?\s*\d+\b",
+        r"\b(?:mark|tick|check)\b.{0,40}\b(?:as\s+)?(?:done|complete|completed|finished)\b",
+        r"\b(?:delete|remove|cancel|clear|complete|finish)\b.{0,30}\b(?:reminder|to-?do|task)s?\b",
+        r"\bto-?do list\b",
+        r"\bdon'?t let me forget\b",
+        r"\bwhat(?:'s| is) (?:on my|due)\b",
+    ],
+    GENERAL: [
+        r"^\W*(?:hi|hello|hey|yo|thanks|thank you|thx|cheers|bye|goodbye|good (?:morning|afternoon|evening|night))(?: there)?\W*$",
+    ],
+}
+
+# Labeled messages the local model is trained on
+TRAINING_EXAMPLES: Tuple[Tuple[str, str], ...] = (
+    ("remind me to call mom tomorrow", REMINDER),
+    ("I need to pay the electricity bill on friday", REMINDER),
+    ("don't forget the dentist appointment next week", REMINDER),
+    ("set an alarm style note for the team meeting at 10", REMINDER),
+    ("what do I have to do today", REMINDER),
+    ("what's coming up this week", REMINDER),
+    ("show everything I still have to do", REMINDER),
+    ("list what is due tomorrow", REMINDER),
+    ("I finished the report, tick it off", REMINDER),
+    ("the grocery shopping is done", REMINDER),
+    ("get rid of the gym one", REMINDER),
+    ("drop the item about the car wash", REMINDER),
+    ("please note that I have to renew my passport by june", REMINDER),
+    ("make a note to water the plants on sunday", REMINDER),
+    ("I have to submit the tax forms next monday", REMINDER),
+    ("put pick up the kids at 3pm on my list", REMINDER),
+    ("add buy milk to my list for tomorrow", REMINDER),
+    ("anything due this weekend", REMINDER),
+    ("do I have anything planned for tomorrow", REMINDER),
+    ("what's left on my list", REMINDER),
+    ("which items are overdue", REMINDER),
+    ("high priority: send the invoice on monday", REMINDER),
+    ("I must book the flights before the end of the month", REMINDER),
+    ("notify me about the rent on the first", REMINDER),
+    ("ping me next tuesday about the contract", REMINDER),
+    ("alert me tomorrow morning to take my medicine", REMINDER),
+    ("I called the plumber already, that one is finished", REMINDER),
+    ("scratch the laundry item", REMINDER),
+    ("I want to remember to buy a birthday present for anna", REMINDER),
+    ("help me remember the vet appointment on thursday", REMINDER),
+    ("jot down: email the landlord tomorrow", REMINDER),
+    ("what are my upcoming deadlines", REMINDER),
+    ("show me what's pending", REMINDER),
+    ("list the completed items", REMINDER),
+    ("tag the meeting prep with work", REMINDER),
+    ("show only the ones tagged family", REMINDER),
+    ("I have a doctor's appointment on the 12th, keep track of it", REMINDER),
+    ("keep track of the library books due next friday", REMINDER),
+    ("on monday I need to call the bank", REMINDER),
+    ("tomorrow at noon lunch with sam, please save it", REMINDER),
+    ("note for next week: prepare slides", REMINDER),
+    ("mark the first one as done", REMINDER),
+    ("I'm done with the dishes item", REMINDER),
+    ("clear out everything for today", REMINDER),
+    ("what's planned for the weekend", REMINDER),
+    ("what should I do tomorrow", REMINDER),
+    ("hello", GENERAL),
+    ("how are you doing today", GENERAL),
+    ("tell me a joke", GENERAL),
+    ("what is the capital of australia", GENERAL),
+    ("explain how photosynthesis works", GENERAL),
+    ("write a short poem about the sea", GENERAL),
+    ("what's the weather usually like in lisbon in may", GENERAL),
+    ("can you help me write an email to my boss", GENERAL),
+    ("who won the world cup in 2010", GENERAL),
+    ("give me a recipe for banana bread", GENERAL),
+    ("how do I reverse a list in python", GENERAL),
+    ("what does the word ephemeral mean", GENERAL),
+    ("recommend a good science fiction book", GENERAL),
+    ("what's the difference between a virus and bacteria", GENERAL),
+    ("summarize the plot of hamlet", GENERAL),
+    ("how many calories are in an apple", GENERAL),
+    ("translate good morning into spanish", GENERAL),
+    ("what time zone is tokyo in", GENERAL),
+    ("why is the sky blue", GENERAL),
+    ("how can I be more productive at work", GENERAL),
+    ("what are some tips for better sleep", GENERAL),
+    ("tell me about the history of rome", GENERAL),
+    ("what is machine learning", GENERAL),
+    ("suggest a name for my new puppy", GENERAL),
+    ("how far is the moon from earth", GENERAL),
+    ("what is a healthy breakfast", GENERAL),
+    ("how do memory techniques like the memory palace work", GENERAL),
+    ("what's a good way to learn a new language", GENERAL),
+    ("can you explain compound interest", GENERAL),
+    ("what movies came out last year", GENERAL),
+    ("help me plan a birthday party menu", GENERAL),
+    ("what are the rules of chess", GENERAL),
+    ("how do I change a flat tire", GENERAL),
+    ("who painted the mona lisa", GENERAL),
+    ("what's your name", GENERAL),
+    ("are you a robot", GENERAL),
+    ("what can you do", GENERAL),
+    ("I'm feeling a bit stressed today", GENERAL),
+    ("what's 15 percent of 80", GENERAL),
+    ("convert 10 miles to kilometers", GENERAL),
+    ("how does a project manager schedule a sprint", GENERAL),
+    ("what apps are good for managing tasks", GENERAL),
+    ("explain the getting things done method", GENERAL),
+    ("what is a cron schedule expression", GENERAL),
+    ("how do I forget a wifi network on my phone", GENERAL),
+    ("good question, tell me more", GENERAL),
+    ("that's interesting, why", GENERAL),
+    ("write a haiku about autumn", GENERAL),
+    ("what is the tallest mountain in europe", GENERAL),
+)
+
+def tokenize(text: str) -> List[str]:
+    """Split a message into lowercase word tokens"""
+    return re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.casefold())
+
+class IntentStage(Protocol):
+    """One stage of the intent router; returns None when it is unsure"""
+    
+    name: str
+    
+    def classify(self, message: str) -> Optional[str]:
+        ...
+
+class KeywordStage:
+    """Matches precompiled high precision phrases; one regex alternation per intent
+    
+    Intents are tried in order, so a message with both reminder and general
+    phrases is a reminder.
+    """
+    
+    name = "keywords"
+    
+    def __init__(self, patterns: Optional[Dict[str, Sequence[str]]] = None):
+        patterns = patterns or KEYWORD_PATTERNS
+        self._patterns = [
+            (intent, re.compile("|".join(f"(?:{pattern})" for pattern in phrases), re.IGNORECASE))
+            for intent, phrases in patterns.items()
+        ]
+    
+    def classify(self, message: str) -> Optional[str]:
+        for intent, pattern in self._patterns:
+            if pattern.search(message):
+                return intent
+        return None
+
+class HashedBayesStage:
+    """A small naive Bayes model over hashed word and word-pair features
+    
+    Features are hashed into ``buckets`` slots with CRC32, so the model is a
+    dictionary of per-bucket log-odds learned from the labeled examples. It
+    answers only when the reminder probability is outside
+    [1 - ``threshold``, ``threshold``]. Training runs on first use.
+    """
+    
+    name = "model"
+    
+    def __init__(
+        self,
+        examples: Iterable[Tuple[str, str]] = TRAINING_EXAMPLES,
+        threshold: float = config.INTENT_MODEL_THRESHOLD,
+        buckets: int = 1 << 18,
+        smoothing: float = 0.5
+    ):
+        """Create the model stage
+        
+        Args:
+            examples: Labeled (message, intent) pairs
+            threshold: Minimum probability of the predicted intent
+            buckets: Number of hash buckets
+            smoothing: Additive smoothing for feature counts
+        """
+        self.examples = list(examples)
+        self.threshold = threshold
+        self.buckets = buckets
+        self.smoothing = smoothing
+        self._weights: Optional[Dict[int, float]] = None
+        self._default_weight = 0.0
+        self._bias = 0.0
+    
+    def features(self, message: str) -> List[int]:
+        """Hash the words and word pairs of a message into buckets"""
+        tokens = tokenize(message)
+        grams = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode()) % self.buckets for gram in grams]
+    
+    def train(self) -> None:
+        """Learn per-bucket log-odds of the reminder intent"""
+        counts = {REMINDER: {}, GENERAL: {}}
+        totals = {REMINDER: 0, GENERAL: 0}
+        documents = {REMINDER: 0, GENERAL: 0}
+        for message, intent in self.examples:
+            documents[intent] += 1
+            for bucket in self.features(message):
+                counts[intent][bucket] = counts[intent].get(bucket, 0) + 1
+                totals[intent] += 1
+        
+        vocabulary = len(counts[REMINDER].keys() | counts[GENERAL].keys())
+        denominators = {intent: totals[intent] + self.smoothing * vocabulary for intent in INTENTS}
+        
+        def log_odds(bucket):
+            reminder = (counts[REMINDER].get(bucket, 0) + self.smoothing) / denominators[REMINDER]
+            general = (counts[GENERAL].get(bucket, 0) + self.smoothing) / denominators[GENERAL]
+            return math.log(reminder / general)
+        
+        self._bias = math.log(documents[REMINDER] / documents[GENERAL])
+        self._default_weight = math.log(denominators[GENERAL] / denominators[REMINDER])
+        self._weights = {bucket: log_odds(bucket) for bucket in counts[REMINDER].keys() | counts[GENERAL].keys()}
+    
+    def probability(self, message: str) -> float:
+        """Get the probability that a message is about reminders"""
+        if self._weights is None:
+            self.train()
+        weights, default = self._weights, self._default_weight
+        score = self._bias + sum(weights.get(bucket, default) for bucket in self.features(message))
+        return 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, score))))
+    
+    def classify(self, message: str) -> Optional[str]:
+        probability = self.probability(message)
+        if probability >= self.threshold:
+            return REMINDER
+        if probability <= 1.0 - self.threshold:
+            return GENERAL
+        return None
+    
+    def best_guess(self, message: str) -> str:
+        """Get the more likely intent, however unsure"""
+        return REMINDER if self.probability(message) >= 0.5 else GENERAL
+
+INTENT_PROMPT = """Classify the message sent to a reminder assistant.
+Reply with exactly one word:
+reminder - it asks to create, list, complete, delete or check reminders, tasks or plans
+general - anything else
+
+Message: {message}"""
+
+class IntentRouter:
+    """Routes chat messages to the reminder or general chat client
+    
+    Local stages run in order and the first confident answer wins. Messages
+    no stage is sure about are classified by Gemini, with the last stage's
+    best guess as the answer if that call fails or the LLM stage is disabled.
+    """
+    
+    def __init__(
+        self,
+        stages: Optional[List[IntentStage]] = None,
+        llm_fallback: bool = config.INTENT_LLM_FALLBACK,
+        llm_timeout: float = config.INTENT_LLM_TIMEOUT
+    ):
+        """Create a router
+        
+        Args:
+            stages: Local classification stages (default: keywords, then the hashed model)
+            llm_fallback: Ask Gemini about messages no local stage is sure about
+            llm_timeout: Seconds to wait for Gemini before using the local best guess
+        """
+        self.stages = stages if stages is not None else [KeywordStage(), HashedBayesStage()]
+        self.llm_fallback = llm_fallback
+        self.llm_timeout = llm_timeout
+        self.reset_metrics()
+    
+    def reset_metrics(self) -> None:
+        """Reset the routing counters"""
+        self._metrics = {
+            "messages": 0,
+            "by_stage": {stage.name: 0 for stage in self.stages},
+            "by_intent": {intent: 0 for intent in INTENTS},
+            "llm": 0,
+            "llm_failures": 0,
+            "guessed": 0,
+            "local_seconds": 0.0,
+            "llm_seconds": 0.0,
+        }
+    
+    def best_guess(self, message: str) -> str:
+        """Get the local answer for a message no stage is sure about"""
+        for stage in reversed(self.stages):
+            if hasattr(stage, "best_guess"):
+                return stage.best_guess(message)
+        return GENERAL
+    
+    def classify_local(self, message: str) -> Tuple[Optional[str], Optional[str]]:
+        """Classify a message with the local stages only
+        
+        Args:
+            message: The user's message
+            
+        Returns:
+            The intent and the name of the stage that decided, or (None, None)
+        """
+        for stage in self.stages:
+            intent = stage.classify(message)
+            if intent is not None:
+                return intent, stage.name
+        return None, None
+    
+    async def classify_with_llm(self, message: str) -> str:
+        """Ask Gemini for the intent of a message
+        
+        Args:
+            message: The user's message
+            
+        Returns:
+            The intent
+        """
+        response = await asyncio.wait_for(
+            generate_content(
+                get_model("reminder"),
+                INTENT_PROMPT.format(message=message),
+                generation_config={"temperature": 0.0, "max_output_tokens": 5}
+            ),
+            timeout=self.llm_timeout
+        )
+        return REMINDER if REMINDER in response.text.strip().lower() else GENERAL
+    
+    async def route(self, message: str) -> str:
+        """Get the intent of a chat message
+        
+        Args:
+            message: The user's message
+            
+        Returns:
+            REMINDER or GENERAL
+        """
+        start = time.perf_counter()
+        intent, stage = self.classify_local(message)
+        self._metrics["local_seconds"] += time.perf_counter() - start
+        
+        if intent is not None:
+            self._metrics["by_stage"][stage] += 1
+        elif self.llm_fallback:
+            start = time.perf_counter()
+            self._metrics["llm"] += 1
+            try:
+                intent = await self.classify_with_llm(message)
+            except Exception as e:
+                logger.warning(f"Intent classification by Gemini failed, using the local guess: {str(e)}")
+                self._metrics["llm_failures"] += 1
+                intent = self.best_guess(message)
+            self._metrics["llm_seconds"] += time.perf_counter() - start
+        else:
+            self._metrics["guessed"] += 1
+            intent = self.best_guess(message)
+        
+        self._metrics["messages"] += 1
+        self._metrics["by_intent"][intent] += 1
+        return intent
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get routing counters
+        
+        Returns:
+            A dictionary with per-stage and per-intent counts and timings
+        """
+        metrics = dict(self._metrics)
+        metrics["by_stage"] = dict(self._metrics["by_stage"])
+        metrics["by_intent"] = dict(self._metrics["by_intent"])
+        metrics["avg_local_seconds"] = metrics["local_seconds"] / metrics["messages"] if metrics["messages"] else 0.0
+        return metrics
+
+# Shared router used by the chat endpoints
+intent_router = IntentRouter()
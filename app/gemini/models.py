@@ -0,0 +1,237 @@
+import json
+import os
+import threading
+import time
+import logging
+from typing import Dict, Any, Callable, Mapping, Optional, Tuple
+
+from app import config
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.models")
+
+DEFAULT_MODEL_NAME = "gemini-1.5-flash"
+
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 1024,
+}
+
+# Model profiles used by the chat clients
+MODEL_PROFILES = ("reminder", "general")
+
+def _default_factory(model_name: str, generation_config: Dict[str, Any]):
+    """Build a real Gemini model"""
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name, generation_config=generation_config)
+
+def load_gemini_settings(profile: str, environ: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Read the current Gemini settings for a model profile from the environment
+    
+    Profile specific variables (e.g. GEMINI_GENERAL_MODEL) override the shared ones.
+    
+    Args:
+        profile: The model profile name
+        environ: The variables to read (default: the process environment)
+        
+    Returns:
+        A dictionary with the model name and generation config
+    """
+    environ = os.environ if environ is None else environ
+    prefix = f"GEMINI_{profile.upper()}_"
+    
+    def setting(name, default, cast):
+        raw = environ.get(prefix + name) or environ.get("GEMINI_" + name)
+        if raw is None:
+            return default
+        try:
+            return cast(raw)
+        except ValueError:
+            logger.warning(f"Ignoring invalid value for GEMINI_{name}: {raw}")
+            return default
+    
+    return {
+        "model_name": setting("MODEL", DEFAULT_MODEL_NAME, str),
+        "generation_config": {
+            "temperature": setting("TEMPERATURE", DEFAULT_GENERATION_CONFIG["temperature"], float),
+            "top_p": setting("TOP_P", DEFAULT_GENERATION_CONFIG["top_p"], float),
+            "top_k": setting("TOP_K", DEFAULT_GENERATION_CONFIG["top_k"], int),
+            "max_output_tokens": setting("MAX_OUTPUT_TOKENS", DEFAULT_GENERATION_CONFIG["max_output_tokens"], int),
+        }
+    }
+
+class ModelRegistry:
+    """Builds each Gemini model once and reuses it across requests
+    
+    Models are keyed by model name and generation config, so profiles that share
+    settings share one instance. The SDK is configured once per API key and models
+    are rebuilt only when the settings change. Every check re-reads the .env
+    file (see config.read_env), so editing it takes effect without a restart.
+    """
+    
+    def __init__(
+        self,
+        factory: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+        reload_interval: float = config.GEMINI_CONFIG_RELOAD_INTERVAL
+    ):
+        """Create a registry
+        
+        Args:
+            factory: Builds a model from a model name and generation config (default: genai.GenerativeModel)
+            reload_interval: Seconds between checks for changed settings (0 disables hot reload)
+        """
+        self._factory = factory or _default_factory
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._profiles: Dict[str, Tuple[str, str]] = {}
+        self._api_key: Optional[str] = None
+        self._fingerprint: Optional[str] = None
+        self._settings: Dict[str, Any] = {}
+        self._last_check = 0.0
+        self._metrics = {
+            "builds": 0,
+            "hits": 0,
+            "reloads": 0,
+            "build_seconds": 0.0,
+            "lookup_seconds": 0.0,
+        }
+    
+    def _current_settings(self) -> Dict[str, Any]:
+        """Read the API key and every profile's settings as they are now"""
+        environ = config.read_env()
+        settings = {profile: load_gemini_settings(profile, environ) for profile in MODEL_PROFILES}
+        settings["api_key"] = environ.get("GEMINI_API_KEY")
+        return settings
+    
+    def _configure_sdk(self, api_key: Optional[str]) -> None:
+        """Configure the Gemini SDK when the API key changes"""
+        if self._factory is _default_factory and api_key != self._api_key:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+        self._api_key = api_key
+    
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild models if the Gemini settings changed
+        
+        Args:
+            force: Drop cached models even if the settings are unchanged
+            
+        Returns:
+            True if cached models were dropped
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            settings = self._current_settings()
+            fingerprint = json.dumps(settings, sort_keys=True)
+            if not force and fingerprint == self._fingerprint:
+                return False
+            
+            if self._fingerprint is not None:
+                logger.info("Gemini settings changed, rebuilding models")
+                self._metrics["reloads"] += 1
+            
+            self._fingerprint = fingerprint
+            self._settings = settings
+            self._models.clear()
+            self._profiles.clear()
+            self._configure_sdk(settings["api_key"])
+            return True
+    
+    def _check_reload(self) -> None:
+        """Reload on first use and then every ``reload_interval`` seconds"""
+        if self._fingerprint is None or (
+            self.reload_interval > 0 and time.monotonic() - self._last_check > self.reload_interval
+        ):
+            self.reload()
+    
+    def settings(self, profile: str = "reminder") -> Dict[str, Any]:
+        """Get the settings the profile's model is built from
+        
+        Args:
+            profile: The model profile name
+            
+        Returns:
+            A dictionary with the model name and generation config
+        """
+        self._check_reload()
+        return self._settings.get(profile) or load_gemini_settings(profile, config.read_env())
+    
+    def get_model(self, profile: str = "reminder") -> Any:
+        """Get the shared model for a profile, building it on first use
+        
+        Args:
+            profile: The model profile name
+            
+        Returns:
+            The model instance
+        """
+        start = time.perf_counter()
+        self._check_reload()
+        
+        key = self._profiles.get(profile)
+        model = self._models.get(key) if key else None
+        
+        if model is None:
+            with self._lock:
+                settings = self._settings.get(profile) or load_gemini_settings(profile, config.read_env())
+                key = (settings["model_name"], json.dumps(settings["generation_config"], sort_keys=True))
+                model = self._models.get(key)
+                if model is None:
+                    build_start = time.perf_counter()
+                    model = self._factory(settings["model_name"], settings["generation_config"])
+                    self._metrics["builds"] += 1
+                    self._metrics["build_seconds"] += time.perf_counter() - build_start
+                    self._models[key] = model
+                    logger.info(f"Built Gemini model {settings['model_name']} for profile '{profile}'")
+                else:
+                    self._metrics["hits"] += 1
+                self._profiles[profile] = key
+        else:
+            self._metrics["hits"] += 1
+        
+        self._metrics["lookup_seconds"] += time.perf_counter() - start
+        return model
+    
+    def warm_up(self) -> None:
+        """Build the model for every profile ahead of the first request"""
+        for profile in MODEL_PROFILES:
+            self.get_model(profile)
+    
+    def set_factory(self, factory: Optional[Callable[[str, Dict[str, Any]], Any]]) -> None:
+        """Replace the model factory and drop cached models
+        
+        Args:
+            factory: Builds a model from a model name and generation config (None restores the default)
+        """
+        self._factory = factory or _default_factory
+        self._api_key = None
+        self.reload(force=True)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get model build and lookup counters
+        
+        Returns:
+            A dictionary with build, hit and timing counters
+        """
+        metrics = dict(self._metrics)
+        lookups = metrics["builds"] + metrics["hits"]
+        metrics["cached_models"] = len(self._models)
+        metrics["avg_setup_seconds"] = metrics["lookup_seconds"] / lookups if lookups else 0.0
+        return metrics
+
+# Shared registry used by the chat clients
+model_registry = ModelRegistry()
+
+def get_model(profile: str = "reminder") -> Any:
+    """Get the shared Gemini model for a profile
+    
+    Args:
+        profile: The model profile name ("reminder" or "general")
+        
+    Returns:
+        The model instance
+    """
+    return model_registry.get_model(profile)
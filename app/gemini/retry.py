@@ -0,0 +1,172 @@
+import asyncio
+import random
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from app import config
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.retry")
+
+T = TypeVar("T")
+
+# Errors worth retrying: rate limits, overload, timeouts and dropped connections.
+# Matched by class name so the google.api_core exceptions need not be imported.
+RETRYABLE_ERRORS = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "DeadlineExceeded",
+    "GatewayTimeout",
+    "Aborted",
+    "TimeoutError",
+    "ConnectionError",
+    "ConnectionResetError",
+}
+
+# Absolute monotonic deadline for the current request, if one is set
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+class RetryDeadlineExceeded(TimeoutError):
+    """Raised when a request's deadline budget runs out"""
+
+@contextmanager
+def deadline_budget(seconds: float = config.GEMINI_REQUEST_DEADLINE) -> Iterator[float]:
+    """Limit the total time Gemini calls in this block may take, including retries
+    
+    Nested budgets never extend an outer deadline.
+    
+    Args:
+        seconds: The budget in seconds
+        
+    Yields:
+        The absolute monotonic deadline
+    """
+    deadline = time.monotonic() + seconds
+    outer = _request_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _request_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _request_deadline.reset(token)
+
+def time_remaining(default: float = config.GEMINI_REQUEST_DEADLINE) -> float:
+    """Get the seconds left in the current deadline budget
+    
+    Args:
+        default: The value returned when no budget is active
+        
+    Returns:
+        The remaining seconds, which may be negative once the deadline has passed
+    """
+    deadline = _request_deadline.get()
+    return default if deadline is None else deadline - time.monotonic()
+
+def is_retryable(error: BaseException) -> bool:
+    """Decide if an error is transient and worth retrying
+    
+    Args:
+        error: The exception raised by a Gemini call
+        
+    Returns:
+        True for rate limit, overload, timeout and connection errors
+    """
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+class RetryPolicy:
+    """Retries transient Gemini errors with exponential backoff and full jitter
+    
+    Non-retryable errors (invalid arguments, permissions, schema mismatches) are
+    raised immediately. Retries stop once ``max_attempts`` is reached or the next
+    attempt could not start before the request deadline.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = config.GEMINI_MAX_ATTEMPTS,
+        base_delay: float = config.GEMINI_RETRY_BASE_DELAY,
+        max_delay: float = config.GEMINI_RETRY_MAX_DELAY,
+        deadline: float = config.GEMINI_REQUEST_DEADLINE
+    ):
+        """Create a retry policy
+        
+        Args:
+            max_attempts: Maximum attempts per call, including the first
+            base_delay: Backoff before the first retry, doubled for each further retry
+            max_delay: Upper bound for a single backoff
+            deadline: Seconds allowed per call when no request budget is active
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._metrics = {"calls": 0, "attempts": 0, "retries": 0, "non_retryable": 0, "exhausted": 0, "deadline_exceeded": 0}
+    
+    def backoff(self, retry: int) -> float:
+        """Get the jittered delay before a retry
+        
+        Args:
+            retry: The retry number, starting at 0
+            
+        Returns:
+            A delay in seconds between 0 and the exponential cap
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+    
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call with retries inside the current deadline budget
+        
+        Args:
+            call: A function returning a new awaitable for each attempt
+            
+        Returns:
+            The result of the first successful attempt
+        """
+        self._metrics["calls"] += 1
+        deadline = _request_deadline.get() or time.monotonic() + self.deadline
+        
+        for attempt in range(self.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._metrics["deadline_exceeded"] += 1
+                raise RetryDeadlineExceeded("Request deadline exceeded before Gemini replied")
+            
+            self._metrics["attempts"] += 1
+            try:
+                return await asyncio.wait_for(call(), timeout=remaining)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError) and time.monotonic() >= deadline:
+                    self._metrics["deadline_exceeded"] += 1
+                    raise RetryDeadlineExceeded("Request deadline exceeded while waiting for Gemini") from e
+                if not is_retryable(e):
+                    self._metrics["non_retryable"] += 1
+                    raise
+                if attempt + 1 >= self.max_attempts:
+                    self._metrics["exhausted"] += 1
+                    raise
+                
+                delay = self.backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    self._metrics["deadline_exceeded"] += 1
+                    raise
+                
+                logger.warning(f"Gemini call failed ({type(e).__name__}: {str(e)}), retrying in {delay:.2f}s")
+                self._metrics["retries"] += 1
+                await asyncio.sleep(delay)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get retry counters
+        
+        Returns:
+            A dictionary with call, attempt and failure counters
+        """
+        return dict(self._metrics)
+
+# Shared retry policy for Gemini calls
+retry_policy = RetryPolicy()
@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, AsyncIterator, Optional
+
+from app import config
+from app.gemini.singleflight import single_flight, request_key
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.runtime")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_semaphore: Optional[asyncio.Semaphore] = None
+_max_in_flight = config.GEMINI_MAX_IN_FLIGHT
+
+_metrics = {
+    "in_flight": 0,
+    "queued": 0,
+    "max_in_flight": 0,
+    "max_queued": 0,
+    "completed": 0,
+    "failed": 0,
+    "cancelled": 0,
+    "total_seconds": 0.0,
+}
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used for blocking SDK calls"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_in_flight,
+                    thread_name_prefix="reminder-ai-gemini"
+                )
+    return _executor
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent Gemini calls"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(_max_in_flight)
+    return _semaphore
+
+def configure_gemini_runtime(max_in_flight: int) -> None:
+    """Change the maximum number of concurrent Gemini calls
+    
+    Args:
+        max_in_flight: Maximum number of calls sent to Gemini at once
+    """
+    global _max_in_flight, _semaphore
+    shutdown_gemini_runtime()
+    _max_in_flight = max(1, max_in_flight)
+    _semaphore = None
+
+def shutdown_gemini_runtime() -> None:
+    """Stop the Gemini thread pool after pending calls finish"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+def get_gemini_metrics() -> Dict[str, Any]:
+    """Get concurrency metrics for Gemini calls
+    
+    Returns:
+        A dictionary with in-flight, queue depth and completion counters
+    """
+    metrics = dict(_metrics)
+    metrics["limit"] = _max_in_flight
+    finished = metrics["completed"] + metrics["failed"]
+    metrics["avg_seconds"] = metrics["total_seconds"] / finished if finished else 0.0
+    metrics["coalescing"] = single_flight.metrics()
+    return metrics
+
+async def generate_content(model, contents, **kwargs) -> Any:
+    """Call ``model.generate_content`` without blocking the event loop
+    
+    Calls wait in a queue once GEMINI_MAX_IN_FLIGHT calls are running. With
+    GEMINI_COALESCE on, a call identical to one already in flight (same model,
+    contents and arguments) waits for that call's response instead of making
+    its own.
+    
+    Args:
+        model: The Gemini model (or a stand-in with the same interface)
+        contents: The conversation contents
+        **kwargs: Extra arguments for generate_content
+        
+    Returns:
+        The model response
+    """
+    if not single_flight.enabled:
+        return await _generate_content(model, contents, **kwargs)
+    key = request_key(model, contents, kwargs)
+    return await single_flight.run(key, partial(_generate_content, model, contents, **kwargs))
+
+async def _generate_content(model, contents, **kwargs) -> Any:
+    """Make one upstream generate_content call under the concurrency limit"""
+    _metrics["queued"] += 1
+    _metrics["max_queued"] = max(_metrics["max_queued"], _metrics["queued"])
+    
+    async with _get_semaphore():
+        _metrics["queued"] -= 1
+        _metrics["in_flight"] += 1
+        _metrics["max_in_flight"] = max(_metrics["max_in_flight"], _metrics["in_flight"])
+        start = asyncio.get_running_loop().time()
+        
+        try:
+            if config.GEMINI_ASYNC_MODE == "native" and hasattr(model, "generate_content_async"):
+                response = await model.generate_content_async(contents, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    _get_executor(),
+                    partial(model.generate_content, contents, **kwargs)
+                )
+            _metrics["completed"] += 1
+            return response
+        except Exception:
+            _metrics["failed"] += 1
+            raise
+        finally:
+            _metrics["in_flight"] -= 1
+            _metrics["total_seconds"] += asyncio.get_running_loop().time() - start
+
+async def stream_content(model, contents, **kwargs) -> AsyncIterator[str]:
+    """Stream the text of a ``generate_content(stream=True)`` call as it is produced
+    
+    The blocking stream is read on the Gemini thread pool and each chunk is handed
+    to the event loop as soon as it arrives. The call counts against
+    GEMINI_MAX_IN_FLIGHT for its whole duration. If the consumer stops early
+    (a client disconnect, ``aclose()``), the reader stops at the next chunk
+    and releases its thread and slot instead of reading the rest of the stream.
+    
+    Args:
+        model: The Gemini model (or a stand-in with the same interface)
+        contents: The conversation contents
+        **kwargs: Extra arguments for generate_content
+        
+    Yields:
+        Text chunks in order
+    """
+    _metrics["queued"] += 1
+    _metrics["max_queued"] = max(_metrics["max_queued"], _metrics["queued"])
+    
+    async with _get_semaphore():
+        _metrics["queued"] -= 1
+        _metrics["in_flight"] += 1
+        _metrics["max_in_flight"] = max(_metrics["max_in_flight"], _metrics["in_flight"])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+        
+        def produce():
+            try:
+                for chunk in model.generate_content(contents, stream=True, **kwargs):
+                    if stop.is_set():
+                        return
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunks without text parts (e.g. blocked by safety filters)
+                        text = None
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        
+        producer = loop.run_in_executor(_get_executor(), produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            _metrics["completed"] += 1
+        except (GeneratorExit, asyncio.CancelledError):
+            _metrics["cancelled"] += 1
+            raise
+        except BaseException:
+            _metrics["failed"] += 1
+            raise
+        finally:
+            stop.set()
+            await asyncio.shield(producer)
+            _metrics["in_flight"] -= 1
+            _metrics["total_seconds"] += loop.time() - start
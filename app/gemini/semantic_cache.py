@@ -0,0 +1,330 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+import zlib
+import logging
+from functools import partial
+from typing import Dict, Any, List, Optional, Protocol, Tuple
+
+from app import config
+
+# numpy, imported only when the semantic cache is enabled so it stays off the startup path
+np = None
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.semantic_cache")
+
+def _load_numpy() -> bool:
+    """Import numpy on first use
+    
+    Returns:
+        True if numpy is available
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # Optional: pip install numpy
+            return False
+        np = numpy
+    return True
+
+def _require_numpy() -> None:
+    """Import numpy or explain how to install it"""
+    if not _load_numpy():
+        raise RuntimeError("The semantic cache needs the numpy package (pip install numpy)")
+
+# Words that carry no meaning for matching questions
+STOPWORDS = frozenset(
+    "a an the is are was were be been am do does did of in on at to for from by with about as and or "
+    "what what's whats which who whom how why when where can could would should will shall may might "
+    "i me my you your it its this that these those there please tell explain give show some get best way".split()
+)
+
+class Embedder(Protocol):
+    """Turns texts into fixed-size vectors"""
+    
+    name: str
+    
+    async def embed(self, texts: List[str]) -> "np.ndarray":
+        ...
+
+def _stem(word: str) -> str:
+    """Strip common English suffixes so inflected forms share a feature"""
+    if word.endswith("'s"):
+        word = word[:-2]
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+class HashingEmbedder:
+    """Deterministic local embedder over hashed content words and their character trigrams
+    
+    Needs no model or network, so it suits tests and offline runs. It matches
+    rewordings that share content words ("capital of France" and "France's
+    capital") but not synonyms; use GeminiEmbedder for those.
+    """
+    
+    name = "hashing"
+    
+    def __init__(self, dimensions: int = 512, trigram_weight: float = 0.25, number_weight: float = 2.0):
+        self.dimensions = dimensions
+        self.trigram_weight = trigram_weight
+        self.number_weight = number_weight
+    
+    def features(self, text: str) -> List[Tuple[str, float]]:
+        """Get the weighted features of a text"""
+        words = [_stem(word) for word in re.findall(r"[a-z0-9]+(?:'[a-z]+)?", text.casefold()) if word not in STOPWORDS]
+        # Numbers must match exactly: "the 2010 World Cup" is not "the 2014 World Cup"
+        features = [(word, self.number_weight if word.isdigit() else 1.0) for word in words]
+        for word in words:
+            if word.isdigit():
+                continue
+            padded = f"<{word}>"
+            features.extend((padded[i:i + 3], self.trigram_weight) for i in range(len(padded) - 2))
+        return features
+    
+    async def embed(self, texts: List[str]) -> "np.ndarray":
+        _require_numpy()
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text):
+                digest = zlib.crc32(feature.encode())
+                # The top bit picks the sign so colliding features tend to cancel out
+                vectors[row, digest % self.dimensions] += weight if digest & 0x80000000 else -weight
+        return vectors
+
+class GeminiEmbedder:
+    """Embeds texts with the Gemini embedding API"""
+    
+    name = "gemini"
+    
+    def __init__(self, model: str = config.SEMANTIC_CACHE_EMBEDDING_MODEL):
+        self.model = model
+    
+    async def embed(self, texts: List[str]) -> "np.ndarray":
+        import google.generativeai as genai
+        _require_numpy()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            partial(genai.embed_content, model=self.model, content=texts, task_type="semantic_similarity")
+        )
+        return np.asarray(result["embedding"], dtype=np.float32).reshape(len(texts), -1)
+
+EMBEDDERS = {
+    "hashing": HashingEmbedder,
+    "gemini": GeminiEmbedder,
+}
+
+class VectorIndex:
+    """A fixed-capacity matrix of unit vectors searched by cosine similarity
+    
+    Rows are preallocated, so a search is one matrix-vector product over the
+    live rows. When the index is full the least recently used row is reused;
+    expired rows are skipped by searches and reused first.
+    """
+    
+    def __init__(self, dimensions: int, capacity: int):
+        _require_numpy()
+        self.capacity = capacity
+        self._vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._last_used = np.zeros(capacity, dtype=np.float64)
+        self._answers: List[Optional[str]] = [None] * capacity
+        self.size = 0
+    
+    def search(self, vector: "np.ndarray", now: float) -> Tuple[int, float]:
+        """Find the most similar live row
+        
+        Args:
+            vector: A unit vector
+            now: The current time, for expiry
+            
+        Returns:
+            The row and its cosine similarity, or (-1, -1.0) for an empty index
+        """
+        if self.size == 0:
+            return -1, -1.0
+        scores = self._vectors[:self.size] @ vector
+        scores[self._expires[:self.size] <= now] = -1.0
+        row = int(np.argmax(scores))
+        return row, float(scores[row])
+    
+    def answer(self, row: int, now: float) -> str:
+        """Get a row's answer and mark it as used"""
+        self._last_used[row] = now
+        return self._answers[row]
+    
+    def add(self, vector: "np.ndarray", answer: str, expires_at: float, now: float) -> bool:
+        """Store a vector and its answer
+        
+        Returns:
+            True if a live row was evicted to make room
+        """
+        if self.size < self.capacity:
+            row, evicted = self.size, False
+            self.size += 1
+        else:
+            # Reuse an expired row if there is one, else the least recently used
+            ranks = np.where(self._expires <= now, -1.0, self._last_used)
+            row = int(np.argmin(ranks))
+            evicted = bool(self._expires[row] > now)
+        self._vectors[row] = vector
+        self._expires[row] = expires_at
+        self._last_used[row] = now
+        self._answers[row] = answer
+        return evicted
+
+class SemanticCache:
+    """Reuses general chat answers for questions that mean the same as an earlier one
+    
+    Only history-free turns are cached. Questions are embedded, normalized to
+    unit length and compared with earlier questions asked under the same
+    system prompt and model settings; an answer is reused when the cosine
+    similarity reaches ``threshold``. Needs numpy.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = config.SEMANTIC_CACHE,
+        embedder: Optional[Embedder] = None,
+        threshold: float = config.SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = config.SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl: float = config.SEMANTIC_CACHE_TTL
+    ):
+        """Create a semantic cache
+        
+        Args:
+            enabled: Whether answers are cached at all
+            embedder: Embeds questions (default: the SEMANTIC_CACHE_EMBEDDER embedder)
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Questions kept per system prompt and model settings
+            ttl: Seconds an answer stays valid
+        """
+        if enabled and not _load_numpy():
+            logger.warning("SEMANTIC_CACHE needs the numpy package (pip install numpy); the semantic cache is off")
+            enabled = False
+        self.enabled = enabled
+        self._embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._indexes: Dict[str, VectorIndex] = {}
+        self.reset_metrics()
+    
+    @property
+    def embedder(self) -> Embedder:
+        """The embedder, created on first use"""
+        if self._embedder is None:
+            self._embedder = EMBEDDERS.get(config.SEMANTIC_CACHE_EMBEDDER, HashingEmbedder)()
+        return self._embedder
+    
+    def reset_metrics(self) -> None:
+        """Reset the hit and miss counters"""
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "embed_errors": 0,
+            "embed_seconds": 0.0,
+            "search_seconds": 0.0,
+        }
+    
+    def namespace(self, system_prompt: str, settings: Dict[str, Any]) -> str:
+        """Get the index name for a system prompt and model settings"""
+        return hashlib.sha256(json.dumps([system_prompt, settings], sort_keys=True).encode()).hexdigest()
+    
+    async def _embed(self, question: str) -> Optional["np.ndarray"]:
+        """Embed a question as a unit vector, or None if embedding fails"""
+        start = time.perf_counter()
+        try:
+            vector = (await self.embedder.embed([question]))[0]
+        except Exception as e:
+            logger.warning(f"Embedding for the semantic cache failed: {str(e)}")
+            self._metrics["embed_errors"] += 1
+            return None
+        finally:
+            self._metrics["embed_seconds"] += time.perf_counter() - start
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+    
+    async def lookup(self, question: str, namespace: str) -> Tuple[Optional[str], Optional["np.ndarray"]]:
+        """Find the answer to a question similar to this one
+        
+        Args:
+            question: The user's message
+            namespace: The index name from ``namespace()``
+            
+        Returns:
+            The cached answer or None, and the question's vector to pass to ``store``
+        """
+        if not self.enabled:
+            return None, None
+        
+        vector = await self._embed(question)
+        index = self._indexes.get(namespace)
+        if vector is None or index is None:
+            self._metrics["misses"] += 1
+            return None, vector
+        
+        start = time.perf_counter()
+        now = time.time()
+        row, score = index.search(vector, now)
+        self._metrics["search_seconds"] += time.perf_counter() - start
+        
+        if score >= self.threshold:
+            self._metrics["hits"] += 1
+            return index.answer(row, now), vector
+        self._metrics["misses"] += 1
+        return None, vector
+    
+    def store(self, vector: Optional["np.ndarray"], answer: str, namespace: str) -> None:
+        """Remember the answer to a question
+        
+        Args:
+            vector: The question's vector from ``lookup``; None is ignored
+            answer: The reply text
+            namespace: The index name from ``namespace()``
+        """
+        if not self.enabled or vector is None or not answer:
+            return
+        
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = self._indexes[namespace] = VectorIndex(vector.shape[0], self.max_entries)
+        now = time.time()
+        if index.add(vector, answer, now + self.ttl, now):
+            self._metrics["evictions"] += 1
+        self._metrics["stores"] += 1
+    
+    def clear(self) -> None:
+        """Drop every cached answer"""
+        self._indexes.clear()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get cache counters
+        
+        Returns:
+            A dictionary with hit, miss and timing counters
+        """
+        metrics = dict(self._metrics)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["enabled"] = self.enabled
+        metrics["embedder"] = self._embedder.name if self._embedder is not None else config.SEMANTIC_CACHE_EMBEDDER
+        metrics["threshold"] = self.threshold
+        metrics["entries"] = sum(index.size for index in self._indexes.values())
+        metrics["hit_rate"] = metrics["hits"] / lookups if lookups else 0.0
+        return metrics
+
+# Shared semantic cache used by the general chat client
+semantic_cache = SemanticCache()
@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import json
+import logging
+from functools import partial
+from typing import Dict, Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from app import config
+
+# Configure logger
+logger = logging.getLogger("reminder-ai.gemini.singleflight")
+
+T = TypeVar("T")
+
+def request_key(model: Any, contents: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+    """Build the coalescing key of a Gemini request
+    
+    Requests match when they go to the same model object with equal contents
+    and arguments. Values JSON cannot encode fall back to their repr, which for
+    plain objects includes their address, so unknown objects never match.
+    
+    Args:
+        model: The Gemini model
+        contents: The conversation contents
+        kwargs: Extra arguments for generate_content
+        
+    Returns:
+        The key, or None if the request cannot be keyed
+    """
+    try:
+        payload = json.dumps([contents, kwargs], sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return f"{id(model)}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key
+    
+    The first caller starts the call as a task; callers arriving with the same
+    key while it runs wait for that task instead of starting another, and all
+    of them get its result or exception. A caller that is cancelled (e.g. by a
+    timeout) stops waiting without disturbing the others; the shared call is
+    cancelled only once no caller is left waiting for it.
+    """
+    
+    def __init__(self, enabled: bool = config.GEMINI_COALESCE):
+        """Create a single-flight group
+        
+        Args:
+            enabled: Whether calls are shared at all
+        """
+        self.enabled = enabled
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.reset_metrics()
+    
+    def reset_metrics(self) -> None:
+        """Reset the coalescing counters"""
+        self._metrics = {"calls": 0, "upstream": 0, "coalesced": 0, "abandoned": 0, "max_waiters": 0}
+    
+    def _finish(self, key: Hashable, task: "asyncio.Task") -> None:
+        """Forget a finished call so the next caller starts a new one"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Waiters may all have gone; mark the exception as retrieved
+            task.exception()
+    
+    def _leave(self, key: Hashable, task: "asyncio.Task") -> None:
+        """Drop a cancelled caller, cancelling the call when nobody else waits"""
+        if self._calls.get(key) is not task:
+            return
+        self._waiters[key] -= 1
+        if self._waiters[key] == 0 and not task.done():
+            task.cancel()
+            self._metrics["abandoned"] += 1
+    
+    async def run(self, key: Optional[Hashable], call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call, or join the identical one already in flight
+        
+        Args:
+            key: The coalescing key; None always runs the call on its own
+            call: Starts the call
+            
+        Returns:
+            The call's result
+        """
+        self._metrics["calls"] += 1
+        if not self.enabled or key is None:
+            self._metrics["upstream"] += 1
+            return await call()
+        
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(call())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(partial(self._finish, key))
+            self._metrics["upstream"] += 1
+        else:
+            self._metrics["coalesced"] += 1
+        
+        self._waiters[key] += 1
+        self._metrics["max_waiters"] = max(self._metrics["max_waiters"], self._waiters[key])
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            self._leave(key, task)
+            raise
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get coalescing counters
+        
+        Returns:
+            A dictionary with call, upstream and coalesced counts
+        """
+        metrics = dict(self._metrics)
+        metrics["enabled"] = self.enabled
+        metrics["in_flight_keys"] = len(self._calls)
+        metrics["coalesced_fraction"] = metrics["coalesced"] / metrics["calls"] if metrics["calls"] else 0.0
+        return metrics
+
+# Shared single-flight group for Gemini calls
+single_flight = SingleFlight()
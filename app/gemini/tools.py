@@ -39,7 +39,7 @@ def create_gemini_tools() -> List[Dict[str, Any]]:
         },
         {
             "name": "get_reminders",
-            "description": "Get all reminders, optionally filtered by date",
+            "description": "Get all reminders, optionally filtered by date or tag",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -50,6 +50,10 @@ def create_gemini_tools() -> List[Dict[str, Any]]:
                     "completed": {
                         "type": "boolean",
                         "description": "Whether to show completed reminders (default: false)"
+                    },
+                    "tag": {
+                        "type": "string",
+                        "description": "Optional tag filter (e.g., 'work', 'shopping')"
                     }
                 }
             }
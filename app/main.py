@@ -1,4 +1,7 @@
+import asyncio
 import logging
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,8 +9,10 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import RedirectResponse
 import re
 
-from app import __version__
-from app.api import api_router, frontend_router
+from app import __version__, config
+from app.api import api_router, frontend_router, FastJSONResponse
+from app.database import get_storage, run_checkpoints
+from app.gemini import model_registry, get_model, probe_tool_format, shutdown_gemini_runtime, response_cache
 
 # Configure logging
 logging.basicConfig(
@@ -48,8 +53,45 @@ class APICompatibilityMiddleware(BaseHTTPMiddleware):
         # Continue with the regular request
         return await call_next(request)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared resources once at startup and release them at shutdown"""
+    start = time.perf_counter()
+    
+    # Open the storage backend and bring its schema up to date
+    storage = get_storage()
+    await storage.start()
+    
+    # Create the persistent response cache table, if one is configured
+    await response_cache.start()
+    
+    # Build the shared Gemini models once before serving requests
+    model_registry.warm_up()
+    
+    # Find the working tool call format once instead of on every request
+    try:
+        await probe_tool_format(get_model("reminder"))
+    except Exception as e:
+        logger.warning(f"Tool call format probe failed: {type(e).__name__}: {str(e)}")
+    
+    # Keep SQLite WAL checkpoints out of request commits
+    checkpoints = None
+    if storage.name == "sqlite" and config.DB_CHECKPOINT_INTERVAL > 0:
+        checkpoints = asyncio.create_task(run_checkpoints())
+    
+    logger.info(f"Startup finished in {(time.perf_counter() - start) * 1000:.0f}ms")
+    yield
+    
+    if checkpoints:
+        checkpoints.cancel()
+    shutdown_gemini_runtime()
+    await storage.close()
+    logger.info("Shutdown finished")
+
 # Initialize FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="Advanced Reminder AI Assistant",
     description="A sophisticated FastAPI application that uses Google's Gemini AI with tools to manage reminders and tasks",
     version=__version__
@@ -1,9 +1,10 @@
-from app.models.reminder import ReminderRequest, ReminderResponse
+from app.models.reminder import ReminderRequest, ReminderResponse, ReminderRecord
 from app.models.conversation import ChatRequest, ConversationHistory
 
 __all__ = [
     'ReminderRequest',
     'ReminderResponse',
+    'ReminderRecord',
     'ChatRequest',
     'ConversationHistory'
 ] 
\ No newline at end of file
@@ -1,5 +1,8 @@
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+
+from app.utils import format_reminder
 
 class ReminderRequest(BaseModel):
     """Request model for creating a reminder"""
@@ -15,4 +18,34 @@ class ReminderResponse(BaseModel):
     date: str
     priority: str
     tags: List[str]
-    completed: bool = False 
\ No newline at end of file
+    completed: bool = False
+
+@dataclass(frozen=True, slots=True)
+class ReminderRecord:
+    """A formatted reminder as a slotted record
+    
+    Lighter than a dictionary when holding large lists, and encoded as a JSON
+    object by dumps_json (natively by orjson).
+    """
+    id: int
+    message: str
+    date: str
+    priority: str
+    tags: List[str]
+    completed: bool = False
+    
+    @classmethod
+    def from_row(cls, row: Any) -> "ReminderRecord":
+        """Create a record from a reminders table row"""
+        return cls(**format_reminder(row))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the record as the dictionary format_reminder returns"""
+        return {
+            "id": self.id,
+            "message": self.message,
+            "date": self.date,
+            "priority": self.priority,
+            "tags": list(self.tags),
+            "completed": self.completed
+        }
@@ -1,21 +1,31 @@
 from app.services.reminder_service import (
     add_reminder,
     get_reminders,
+    get_reminders_page,
     complete_reminder,
     delete_reminder,
     get_upcoming_reminders
 )
 from app.services.conversation_service import (
     save_conversation,
-    get_conversation_history
+    get_conversation_owner,
+    get_conversation_history,
+    get_conversation_range,
+    get_conversation_summary,
+    save_conversation_summary
 )
 
 __all__ = [
     'add_reminder',
     'get_reminders',
+    'get_reminders_page',
     'complete_reminder',
     'delete_reminder',
     'get_upcoming_reminders',
     'save_conversation',
-    'get_conversation_history'
+    'get_conversation_owner',
+    'get_conversation_history',
+    'get_conversation_range',
+    'get_conversation_summary',
+    'save_conversation_summary'
 ] 
\ No newline at end of file
@@ -1,21 +1,26 @@
-import json
 import logging
 import uuid
-from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from app.database.connection import get_conversations_db_connection
+from app import config
+from app.database import get_storage
 
 # Configure logger
 logger = logging.getLogger("reminder-ai.services")
 
-async def save_conversation(conversation_id: Optional[str], user_message: str, ai_response: str) -> str:
+async def save_conversation(
+    conversation_id: Optional[str],
+    user_message: str,
+    ai_response: str,
+    user_id: str = config.DEFAULT_USER_ID
+) -> str:
     """Save conversation history to the database
     
     Args:
         conversation_id: Optional ID of the conversation
         user_message: The user's message
         ai_response: The AI's response
+        user_id: The owner of the conversation; another user's conversation is not changed
         
     Returns:
         The conversation ID
@@ -24,70 +29,106 @@ async def save_conversation(conversation_id: Optional[str], user_message: str, a
         if not conversation_id:
             conversation_id = str(uuid.uuid4())
         
-        conn = get_conversations_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if conversation exists
-        cursor.execute("SELECT messages FROM conversations WHERE id = ?", (conversation_id,))
-        result = cursor.fetchone()
-        
-        if result:
-            messages = json.loads(result["messages"])
-        else:
-            messages = []
-        
-        # Add new messages
-        timestamp = datetime.now().isoformat()
-        messages.append({
-            "role": "user",
-            "content": user_message,
-            "timestamp": timestamp
-        })
-        messages.append({
-            "role": "assistant",
-            "content": ai_response,
-            "timestamp": timestamp
-        })
-        
-        # Update or insert conversation
-        if result:
-            cursor.execute(
-                "UPDATE conversations SET messages = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                (json.dumps(messages), conversation_id)
-            )
-        else:
-            cursor.execute(
-                "INSERT INTO conversations (id, messages) VALUES (?, ?)",
-                (conversation_id, json.dumps(messages))
-            )
-        
-        conn.commit()
-        conn.close()
+        if not await get_storage().conversations.append_messages(user_id, conversation_id, user_message, ai_response):
+            logger.warning(f"Not saving to conversation {conversation_id} owned by another user")
         
         return conversation_id
     except Exception as e:
         logger.error(f"Error saving conversation: {str(e)}")
         return conversation_id
 
-async def get_conversation_history(conversation_id: str) -> List[Dict[str, Any]]:
+async def get_conversation_owner(conversation_id: str) -> Optional[str]:
+    """Get the user a conversation belongs to
+    
+    Args:
+        conversation_id: The ID of the conversation
+        
+    Returns:
+        The user ID, or None if the conversation does not exist
+    """
+    try:
+        return await get_storage().conversations.select_owner(conversation_id)
+    except Exception as e:
+        logger.error(f"Error retrieving conversation owner: {str(e)}")
+        return None
+
+async def get_conversation_history(
+    conversation_id: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_id: str = config.DEFAULT_USER_ID
+) -> List[Dict[str, Any]]:
     """Get conversation history from the database
     
     Args:
         conversation_id: The ID of the conversation
+        limit: Optional maximum number of messages, counted from the most recent
+        offset: Number of most recent messages to skip
+        user_id: The owner of the conversation
         
     Returns:
-        A list of message dictionaries
+        A list of message dictionaries in chronological order; empty for another user's conversation
     """
     try:
-        conn = get_conversations_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT messages FROM conversations WHERE id = ?", (conversation_id,))
-        result = cursor.fetchone()
-        conn.close()
+        return await get_storage().conversations.select_messages(user_id, conversation_id, limit, offset)
+    except Exception as e:
+        logger.error(f"Error retrieving conversation: {str(e)}")
+        return []
+
+async def get_conversation_range(
+    conversation_id: str,
+    after_seq: int,
+    before_seq: int,
+    user_id: str = config.DEFAULT_USER_ID
+) -> List[Dict[str, Any]]:
+    """Get the messages of a conversation between two seqs
+    
+    Args:
+        conversation_id: The ID of the conversation
+        after_seq: Only messages after this seq
+        before_seq: Only messages before this seq
+        user_id: The owner of the conversation
         
-        if result:
-            return json.loads(result["messages"])
+    Returns:
+        A list of message dictionaries in chronological order
+    """
+    try:
+        return await get_storage().conversations.select_message_range(user_id, conversation_id, after_seq, before_seq)
+    except Exception as e:
+        logger.error(f"Error retrieving conversation messages: {str(e)}")
         return []
+
+async def get_conversation_summary(conversation_id: str, user_id: str = config.DEFAULT_USER_ID) -> Optional[Dict[str, Any]]:
+    """Get the rolling summary of a conversation's older messages
+    
+    Args:
+        conversation_id: The ID of the conversation
+        user_id: The owner of the conversation
+        
+    Returns:
+        A dictionary with the summary and the last summarized seq, or None
+    """
+    try:
+        return await get_storage().conversations.select_summary(user_id, conversation_id)
     except Exception as e:
-        logger.error(f"Error retrieving conversation: {str(e)}")
-        return [] 
\ No newline at end of file
+        logger.error(f"Error retrieving conversation summary: {str(e)}")
+        return None
+
+async def save_conversation_summary(
+    conversation_id: str,
+    summary: str,
+    through_seq: int,
+    user_id: str = config.DEFAULT_USER_ID
+) -> None:
+    """Store the rolling summary of a conversation's older messages
+    
+    Args:
+        conversation_id: The ID of the conversation
+        summary: The summary text
+        through_seq: The seq of the last message covered by the summary
+        user_id: The owner of the conversation
+    """
+    try:
+        await get_storage().conversations.upsert_summary(user_id, conversation_id, summary, through_seq)
+    except Exception as e:
+        logger.error(f"Error saving conversation summary: {str(e)}")
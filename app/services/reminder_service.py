@@ -1,15 +1,21 @@
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
-from app.database import get_db_connection
-from app.utils import parse_date, format_reminder
+from app import config
+from app.database import get_storage
+from app.utils import parse_date, format_reminder, reminder_mapper, encode_cursor, decode_cursor, REMINDER_FIELDS
 
 # Configure logger
 logger = logging.getLogger("reminder-ai.services")
 
-async def add_reminder(message: str, date: str, priority: str = "normal", tags: Optional[List[str]] = None) -> Dict[str, Any]:
+async def add_reminder(
+    message: str,
+    date: str,
+    priority: str = "normal",
+    tags: Optional[List[str]] = None,
+    user_id: str = config.DEFAULT_USER_ID
+) -> Dict[str, Any]:
     """Add a reminder to the database
     
     Args:
@@ -17,6 +23,7 @@ async def add_reminder(message: str, date: str, priority: str = "normal", tags:
         date: The date for the reminder
         priority: The priority level (default: "normal")
         tags: Optional list of tags
+        user_id: The owner of the reminder
         
     Returns:
         A dictionary with the result and formatted reminder
@@ -28,19 +35,7 @@ async def add_reminder(message: str, date: str, priority: str = "normal", tags:
         # Parse the date to a standard format
         parsed_date = parse_date(date)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO reminders (user_message, date, priority, tags) VALUES (?, ?, ?, ?)",
-            (message, parsed_date, priority, json.dumps(tags))
-        )
-        reminder_id = cursor.lastrowid
-        conn.commit()
-        
-        # Fetch the inserted reminder
-        cursor.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,))
-        reminder = cursor.fetchone()
-        conn.close()
+        reminder = await get_storage().reminders.insert(user_id, message, parsed_date, priority, tags)
         
         formatted_reminder = format_reminder(reminder)
         return {
@@ -55,50 +50,61 @@ async def add_reminder(message: str, date: str, priority: str = "normal", tags:
             "message": f"Error adding reminder: {str(e)}"
         }
 
-async def get_reminders(date_filter: Optional[str] = None, completed: bool = False) -> Dict[str, Any]:
-    """Get reminders from the database with optional filtering
+def _filter_description(date_filter: Optional[str], tag: Optional[str]) -> str:
+    """Describe the filters of a reminder list for its message"""
+    description = f" for {date_filter}" if date_filter else ""
+    return description + (f" tagged '{tag}'" if tag else "")
+
+async def get_reminders(
+    date_filter: Optional[str] = None,
+    completed: bool = False,
+    user_id: str = config.DEFAULT_USER_ID,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    include_total: bool = False,
+    tag: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get a user's reminders from the database with optional filtering
+    
+    Without a limit every matching reminder is returned. With a limit one
+    page is returned, along with a next_cursor for the following page
+    (None on the last page). The message only counts the reminders; use
+    render_reminders for a readable list.
     
     Args:
         date_filter: Optional date to filter reminders
         completed: Whether to show completed reminders
+        user_id: The owner of the reminders
+        limit: Optional page size
+        cursor: The next_cursor of the previous page
+        fields: Optional subset of REMINDER_FIELDS to return for each reminder
+        include_total: Whether to add the total number of matching reminders
+        tag: Optional tag to filter reminders (case-insensitive)
         
     Returns:
         A dictionary with the result and formatted reminders
     """
+    if limit is not None:
+        return await get_reminders_page(date_filter, completed, user_id, limit, cursor, fields, include_total, tag)
+    
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM reminders WHERE completed = ?"
-        params = [1 if completed else 0]
-        
-        if date_filter:
-            query += " AND date = ?"
-            params.append(date_filter)
-        
-        query += " ORDER BY date ASC, priority DESC"
-        
-        cursor.execute(query, params)
-        reminders = cursor.fetchall()
-        conn.close()
+        reminders = await get_storage().reminders.select(user_id, date_filter, completed, tag)
         
         if not reminders:
             return {
                 "success": True,
-                "message": "No reminders found" + (f" for {date_filter}" if date_filter else ""),
+                "message": "No reminders found" + _filter_description(date_filter, tag),
                 "reminders": []
             }
         
-        formatted_reminders = [format_reminder(r) for r in reminders]
-        
-        result_message = "📅 Here are your reminders:\n"
-        for r in formatted_reminders:
-            priority_icon = "🔴" if r["priority"] == "high" else "🟡" if r["priority"] == "medium" else "🟢"
-            result_message += f"{priority_icon} {r['date']}: {r['message']}\n"
+        to_dict = reminder_mapper(reminders[0])
+        formatted_reminders = [to_dict(r) for r in reminders]
         
+        # The chat path renders the full list with render_reminders
         return {
             "success": True,
-            "message": result_message,
+            "message": f"📅 {len(formatted_reminders)} reminders" + _filter_description(date_filter, tag),
             "reminders": formatted_reminders
         }
     except Exception as e:
@@ -109,35 +115,91 @@ async def get_reminders(date_filter: Optional[str] = None, completed: bool = Fal
             "reminders": []
         }
 
-async def complete_reminder(reminder_id: int) -> Dict[str, Any]:
+async def get_reminders_page(
+    date_filter: Optional[str],
+    completed: bool,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    include_total: bool = False,
+    tag: Optional[str] = None
+) -> Dict[str, Any]:
+    """Get one page of a user's reminders using keyset pagination
+    
+    Args:
+        date_filter: Optional date to filter reminders
+        completed: Whether to show completed reminders
+        user_id: The owner of the reminders
+        limit: Maximum reminders on the page
+        cursor: The next_cursor of the previous page
+        fields: Optional subset of REMINDER_FIELDS to return for each reminder
+        include_total: Whether to add the total number of matching reminders
+        tag: Optional tag to filter reminders (case-insensitive)
+        
+    Returns:
+        A dictionary with the result, formatted reminders and next_cursor
+    """
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        return {
+            "success": False,
+            "message": str(e),
+            "reminders": []
+        }
+    
+    try:
+        repository = get_storage().reminders
+        columns = [REMINDER_FIELDS[field] for field in fields] if fields is not None else None
+        
+        # One extra row tells whether another page follows
+        rows = await repository.select_page(user_id, date_filter, completed, limit + 1, after, columns, tag)
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        to_dict = reminder_mapper(rows[0], fields) if rows else None
+        formatted_reminders = [to_dict(r) for r in rows[:limit]]
+        
+        if formatted_reminders:
+            message = f"📅 {len(formatted_reminders)} reminders" + _filter_description(date_filter, tag)
+        else:
+            message = "No reminders found" + _filter_description(date_filter, tag)
+        
+        result = {
+            "success": True,
+            "message": message,
+            "reminders": formatted_reminders,
+            "next_cursor": next_cursor
+        }
+        if include_total:
+            result["total"] = await repository.count(user_id, date_filter, completed, tag)
+        return result
+    except Exception as e:
+        logger.error(f"Error retrieving reminders: {str(e)}")
+        return {
+            "success": False,
+            "message": f"Error retrieving reminders: {str(e)}",
+            "reminders": []
+        }
+
+async def complete_reminder(reminder_id: int, user_id: str = config.DEFAULT_USER_ID) -> Dict[str, Any]:
     """Mark a reminder as completed
     
     Args:
         reminder_id: The ID of the reminder to mark as completed
+        user_id: The owner of the reminder
         
     Returns:
         A dictionary with the result
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if reminder exists
-        cursor.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,))
-        reminder = cursor.fetchone()
+        reminder = await get_storage().reminders.complete(user_id, reminder_id)
         
         if not reminder:
-            conn.close()
             return {
                 "success": False,
                 "message": f"Reminder with ID {reminder_id} not found"
             }
         
-        # Mark as completed
-        cursor.execute("UPDATE reminders SET completed = 1 WHERE id = ?", (reminder_id,))
-        conn.commit()
-        conn.close()
-        
         return {
             "success": True,
             "message": f"✅ Reminder '{reminder['user_message']}' marked as completed"
@@ -149,35 +211,25 @@ async def complete_reminder(reminder_id: int) -> Dict[str, Any]:
             "message": f"Error completing reminder: {str(e)}"
         }
 
-async def delete_reminder(reminder_id: int) -> Dict[str, Any]:
+async def delete_reminder(reminder_id: int, user_id: str = config.DEFAULT_USER_ID) -> Dict[str, Any]:
     """Delete a reminder from the database
     
     Args:
         reminder_id: The ID of the reminder to delete
+        user_id: The owner of the reminder
         
     Returns:
         A dictionary with the result
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if reminder exists
-        cursor.execute("SELECT * FROM reminders WHERE id = ?", (reminder_id,))
-        reminder = cursor.fetchone()
+        reminder = await get_storage().reminders.delete(user_id, reminder_id)
         
         if not reminder:
-            conn.close()
             return {
                 "success": False,
                 "message": f"Reminder with ID {reminder_id} not found"
             }
         
-        # Delete the reminder
-        cursor.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
-        conn.commit()
-        conn.close()
-        
         return {
             "success": True,
             "message": f"🗑️ Reminder '{reminder['user_message']}' deleted"
@@ -189,9 +241,15 @@ async def delete_reminder(reminder_id: int) -> Dict[str, Any]:
             "message": f"Error deleting reminder: {str(e)}"
         }
 
-async def get_upcoming_reminders() -> Dict[str, Any]:
-    """Get reminders for today and tomorrow
+async def get_upcoming_reminders(user_id: str = config.DEFAULT_USER_ID) -> Dict[str, Any]:
+    """Get a user's reminders for today and tomorrow
+    
+    The message only counts the reminders; use render_upcoming_reminders for
+    a readable list.
     
+    Args:
+        user_id: The owner of the reminders
+        
     Returns:
         A dictionary with the result and formatted reminders
     """
@@ -199,34 +257,24 @@ async def get_upcoming_reminders() -> Dict[str, Any]:
         today = datetime.now().strftime("%Y-%m-%d")
         tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM reminders WHERE date IN (?, ?) AND completed = 0 ORDER BY date ASC, priority DESC",
-            (today, tomorrow)
-        )
-        reminders = cursor.fetchall()
-        conn.close()
+        reminders = await get_storage().reminders.select_upcoming(user_id, [today, tomorrow])
         
         if not reminders:
             return {
                 "success": True,
                 "message": "No upcoming reminders for today or tomorrow",
-                "reminders": []
+                "reminders": [],
+                "today": today
             }
         
-        formatted_reminders = [format_reminder(r) for r in reminders]
-        
-        result_message = "⏰ Here are your upcoming reminders:\n"
-        for r in formatted_reminders:
-            day = "Today" if r["date"] == today else "Tomorrow"
-            priority_icon = "🔴" if r["priority"] == "high" else "🟡" if r["priority"] == "medium" else "🟢"
-            result_message += f"{priority_icon} {day}: {r['message']}\n"
+        to_dict = reminder_mapper(reminders[0])
+        formatted_reminders = [to_dict(r) for r in reminders]
         
         return {
             "success": True,
-            "message": result_message,
-            "reminders": formatted_reminders
+            "message": f"⏰ {len(formatted_reminders)} upcoming reminders",
+            "reminders": formatted_reminders,
+            "today": today
         }
     except Exception as e:
         logger.error(f"Error retrieving upcoming reminders: {str(e)}")
@@ -234,4 +282,4 @@ async def get_upcoming_reminders() -> Dict[str, Any]:
             "success": False,
             "message": f"Error retrieving upcoming reminders: {str(e)}",
             "reminders": []
-        } 
\ No newline at end of file
+        }
@@ -1,7 +1,22 @@
 from app.utils.date_parser import parse_date
-from app.utils.formatter import format_reminder
+from app.utils.command_parser import parse_command
+from app.utils.formatter import format_reminder, reminder_mapper, render_reminders, render_upcoming_reminders, REMINDER_FIELDS
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import dumps_json, JSON_ENCODER
+from app.utils.tags import normalize_tag, normalize_tags
 
 __all__ = [
     'parse_date',
-    'format_reminder'
-] 
\ No newline at end of file
+    'parse_command',
+    'format_reminder',
+    'reminder_mapper',
+    'render_reminders',
+    'render_upcoming_reminders',
+    'REMINDER_FIELDS',
+    'encode_cursor',
+    'decode_cursor',
+    'dumps_json',
+    'JSON_ENCODER',
+    'normalize_tag',
+    'normalize_tags'
+]
@@ -0,0 +1,104 @@
+import re
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+from app.utils.date_parser import parse_date
+
+# Dates parse_date resolves without guessing
+MONTHS = "january|february|march|april|may|june|july|august|september|october|november|december"
+DATE = (
+    r"today|tomorrow|next week|\d{4}-\d{2}-\d{2}"
+    rf"|(?:{MONTHS}) \d{{1,2}}(?:st|nd|rd|th)?|\d{{1,2}}(?:st|nd|rd|th)? (?:of )?(?:{MONTHS})"
+)
+
+ITEM = r"(?:reminder|task|to-?do|item)"
+ITEMS = r"(?:reminders|tasks|to-?dos|items|to-?do list)"
+NUMBER = r"(?:number |no\.? |#)?(?P<id>\d+)"
+
+# Times of day and trailing "at"/"by" clauses in a reminder's text; the tools have no time argument
+TIME = re.compile(r"\b\d{1,2}(?::\d{2})? ?(?:am|pm|a\.m\.|p\.m\.)|\b\d{1,2}:\d{2}\b|\b(?:noon|midnight|o'clock|morning|afternoon|evening|tonight)\b")
+TRAILING_CLAUSE = re.compile(r"\b(?:at|by)(?: \S+){1,3}$")
+
+# Courtesy words around a command that do not change its meaning
+POLITE_PREFIX = re.compile(r"^(?:(?:please|hey|ok|okay|can you|could you|would you|would you please|can you please|could you please),?\s+)+")
+POLITE_SUFFIX = re.compile(r"(?:\s*,?\s*(?:please|thanks|thank you|thx))+$")
+
+# Each command is a full-message pattern mapped to a reminder tool name
+COMMAND_PATTERNS = [
+    ("complete_reminder", rf"(?:mark|set|tick off|tick|check off|check)(?: {ITEM})? {NUMBER}(?: as)? (?:done|complete|completed|finished)"),
+    ("complete_reminder", rf"(?:complete|finish)(?: {ITEM})? {NUMBER}"),
+    ("complete_reminder", rf"{ITEM} {NUMBER} is (?:done|complete|completed|finished)"),
+    ("delete_reminder", rf"(?:delete|remove|cancel|drop)(?: {ITEM})? {NUMBER}"),
+    ("get_upcoming_reminders", rf"(?:show|list|get|display|view|what are|what're)(?: me)?(?: all)?(?: my)? upcoming {ITEMS}"),
+    ("get_upcoming_reminders", r"what(?:'s| is) (?:coming up|upcoming)(?: for me)?"),
+    ("get_reminders", rf"(?:show|list|get|display|view|what are|what're)(?: me)?(?: all)?(?: of)?(?: my)?(?P<completed> completed| done| finished)? {ITEMS}(?: (?:for|on|due) (?P<date>{DATE}))?"),
+    ("get_reminders", rf"what(?:'s| is) on my {ITEMS}"),
+    ("add_reminder", rf"remind me (?:to |about )?(?P<message>.+?) (?:on )?(?P<date>{DATE})"),
+    ("add_reminder", rf"(?:add|set|create)(?: a)? reminder(?: to| for| about|:)? (?P<message>.+?) (?:on )?(?P<date>{DATE})"),
+]
+
+COMPILED_COMMANDS = [(name, re.compile(pattern)) for name, pattern in COMMAND_PATTERNS]
+
+def normalize_command(message: str) -> str:
+    """Lowercase a message and strip courtesy words and trailing punctuation"""
+    text = " ".join(message.casefold().split())
+    text = text.rstrip(".!?")
+    text = POLITE_PREFIX.sub("", text)
+    return POLITE_SUFFIX.sub("", text).rstrip(".!?,")
+
+def parse_command(message: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Recognize a common reminder command without a model
+    
+    Only messages that match a command pattern in full are recognized, so
+    anything with extra detail (a time, a priority, a weekday) is left to Gemini.
+    So are reminders whose text holds a time or ends in an "at"/"by" clause,
+    and dates that are not real calendar days.
+    
+    Args:
+        message: The user's message
+        
+    Returns:
+        A (tool name, arguments) pair in the reminder tools' format, or None
+    """
+    text = normalize_command(message)
+    for name, pattern in COMPILED_COMMANDS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        
+        groups = match.groupdict()
+        if groups.get("date") and not _valid_date(groups["date"]):
+            continue
+        if name in ("complete_reminder", "delete_reminder"):
+            return name, {"reminder_id": int(groups["id"])}
+        if name == "get_reminders":
+            args = {"completed": bool(groups.get("completed"))}
+            if groups.get("date"):
+                args["date"] = groups["date"]
+            return name, args
+        if name == "add_reminder":
+            # Keep the user's wording of the reminder itself
+            start, end = match.span("message")
+            if TIME.search(groups["message"]) or TRAILING_CLAUSE.search(groups["message"]):
+                continue
+            original = " ".join(message.split())
+            return name, {"message": _original_span(original, text, start, end), "date": groups["date"]}
+        return name, {}
+    return None
+
+def _valid_date(date: str) -> bool:
+    """Check that a DATE match resolves to a real calendar day"""
+    try:
+        datetime.strptime(parse_date(date), "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+def _original_span(original: str, normalized: str, start: int, end: int) -> str:
+    """Get the original-case text for a span of the normalized message"""
+    fragment = normalized[start:end]
+    folded = original.casefold()
+    if len(folded) != len(original):
+        return fragment
+    index = folded.find(fragment)
+    return original[index:index + len(fragment)] if index >= 0 else fragment
@@ -1,25 +1,133 @@
 import json
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
-def format_reminder(reminder: Dict[str, Any]) -> Dict[str, Any]:
+# Fields of a formatted reminder and the column each one is read from
+REMINDER_FIELDS = {
+    "id": "id",
+    "message": "user_message",
+    "date": "date",
+    "priority": "priority",
+    "tags": "tags",
+    "completed": "completed"
+}
+
+PRIORITY_ICONS = {"high": "🔴", "medium": "🟡"}
+
+ALL_FIELDS = tuple(REMINDER_FIELDS)
+
+@lru_cache(maxsize=1024)
+def _decode_tags(tags: Any) -> Tuple[str, ...]:
+    """Decode a JSON tags value once; most reminders share a handful of tag lists"""
+    try:
+        decoded = json.loads(tags)
+    except (TypeError, ValueError):
+        return ()
+    return tuple(decoded) if isinstance(decoded, list) else ()
+
+def _parse_tags(tags: Any) -> List[str]:
+    """Decode the JSON tags column into a new list"""
+    return list(_decode_tags(tags)) if tags != "[]" else []
+
+# Conversions applied to a column value for each formatted field
+FIELD_CONVERTERS: Dict[str, Callable[[Any], Any]] = {"tags": _parse_tags, "completed": bool}
+
+@lru_cache(maxsize=64)
+def _build_mapper(layout: Optional[Tuple[str, ...]], fields: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a row mapper for a column layout (None for dict rows, which are read by name)"""
+    def position(field: str) -> Any:
+        column = REMINDER_FIELDS[field]
+        return layout.index(column) if layout is not None else column
+    
+    if fields == ALL_FIELDS:
+        id_at, message_at, date_at, priority_at, tags_at, completed_at = map(position, ALL_FIELDS)
+        
+        def map_row(row: Any) -> Dict[str, Any]:
+            return {
+                "id": row[id_at],
+                "message": row[message_at],
+                "date": row[date_at],
+                "priority": row[priority_at],
+                "tags": _parse_tags(row[tags_at]),
+                "completed": bool(row[completed_at])
+            }
+        return map_row
+    
+    getters = [(field, position(field), FIELD_CONVERTERS.get(field)) for field in fields]
+    
+    def map_fields(row: Any) -> Dict[str, Any]:
+        formatted = {}
+        for field, at, convert in getters:
+            value = row[at]
+            formatted[field] = convert(value) if convert else value
+        return formatted
+    return map_fields
+
+def reminder_mapper(row: Any, fields: Optional[List[str]] = None) -> Callable[[Any], Dict[str, Any]]:
+    """Get a function formatting rows shaped like ``row``
+    
+    The column positions are resolved once per result set instead of once per
+    row, and the mapper is cached for each column layout and field selection.
+    
+    Args:
+        row: A row of the result set (SQLite Row, asyncpg Record or dict)
+        fields: Optional subset of REMINDER_FIELDS to include (default: all)
+        
+    Returns:
+        A function mapping each row of the result set to a formatted dictionary
+    """
+    layout = None if isinstance(row, dict) else tuple(row.keys())
+    return _build_mapper(layout, tuple(fields) if fields is not None else ALL_FIELDS)
+
+def format_reminder(reminder: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Format a reminder row as a dictionary
     
+    Use reminder_mapper when formatting many rows of one result set.
+    
     Args:
         reminder: A SQLite Row object representing a reminder
+        fields: Optional subset of REMINDER_FIELDS to include (default: all)
         
     Returns:
         A formatted dictionary with reminder data
     """
-    try:
-        tags = json.loads(reminder["tags"])
-    except:
-        tags = []
-    
-    return {
-        "id": reminder["id"],
-        "message": reminder["user_message"],
-        "date": reminder["date"],
-        "priority": reminder["priority"],
-        "tags": tags,
-        "completed": bool(reminder["completed"])
-    } 
\ No newline at end of file
+    return reminder_mapper(reminder, fields)(reminder)
+
+def render_reminders(result: Dict[str, Any]) -> str:
+    """Render a get_reminders result as the text shown in chat
+    
+    Args:
+        result: The result dictionary from get_reminders
+        
+    Returns:
+        One line per reminder, or the result message when there is nothing to list
+    """
+    reminders = result.get("reminders")
+    if not result.get("success") or not reminders:
+        return result.get("message", "")
+    
+    # Appending in place measured faster and leaner than str.join (benchmark.py render)
+    message = "📅 Here are your reminders:\n"
+    for r in reminders:
+        message += f"{PRIORITY_ICONS.get(r['priority'], '🟢')} {r['date']}: {r['message']}\n"
+    return message
+
+def render_upcoming_reminders(result: Dict[str, Any]) -> str:
+    """Render a get_upcoming_reminders result as the text shown in chat
+    
+    Args:
+        result: The result dictionary from get_upcoming_reminders
+        
+    Returns:
+        One line per reminder, or the result message when there is nothing to list
+    """
+    reminders = result.get("reminders")
+    if not result.get("success") or not reminders:
+        return result.get("message", "")
+    
+    today = result.get("today")
+    message = "⏰ Here are your upcoming reminders:\n"
+    for r in reminders:
+        day = "Today" if r["date"] == today else "Tomorrow"
+        message += f"{PRIORITY_ICONS.get(r['priority'], '🟢')} {day}: {r['message']}\n"
+    return message
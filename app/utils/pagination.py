@@ -0,0 +1,38 @@
+import base64
+import json
+from typing import Any, Mapping, Optional, Tuple
+
+def encode_cursor(reminder: Mapping[str, Any]) -> str:
+    """Encode the list position of a reminder row as an opaque cursor
+    
+    Args:
+        reminder: The last reminder row on a page
+        
+    Returns:
+        A URL-safe cursor string
+    """
+    key = json.dumps([reminder["date"], reminder["priority"], reminder["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str, int]]:
+    """Decode a cursor from encode_cursor
+    
+    Args:
+        cursor: The cursor string, or None for the first page
+        
+    Returns:
+        The (date, priority, id) key, or None for the first page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        date, priority, reminder_id = key
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not (isinstance(date, str) and isinstance(priority, str) and isinstance(reminder_id, int)):
+        raise ValueError("Invalid cursor")
+    return date, priority, reminder_id
@@ -0,0 +1,41 @@
+import dataclasses
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+# The encoder dumps_json uses, reported in /api/metrics
+JSON_ENCODER = "orjson" if orjson else "json"
+
+def _encode_default(value: Any) -> Any:
+    """Encode the values the standard library json module does not handle"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize a response body to UTF-8 JSON
+    
+    Uses orjson when it is installed. Otherwise it falls back to the standard
+    library with the same settings as Starlette's JSONResponse. Dataclasses
+    such as ReminderRecord are encoded as objects either way.
+    
+    Args:
+        content: The response content
+        
+    Returns:
+        The encoded body
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_encode_default
+    ).encode("utf-8")
@@ -0,0 +1,22 @@
+from typing import Any, Iterable, List
+
+def normalize_tag(tag: str) -> str:
+    """Get the form of a tag used for filtering (trimmed and case-folded)"""
+    return tag.strip().casefold()
+
+def normalize_tags(tags: Iterable[Any]) -> List[str]:
+    """Get the distinct normalized tags of a reminder, in order
+    
+    Args:
+        tags: The reminder's tags; non-string and blank entries are skipped
+        
+    Returns:
+        The tags stored in reminder_tags
+    """
+    normalized = []
+    for tag in tags:
+        if isinstance(tag, str):
+            tag = normalize_tag(tag)
+            if tag and tag not in normalized:
+                normalized.append(tag)
+    return normalized
@@ -0,0 +1,1429 @@
+"""
+Advanced Reminder AI Assistant - Benchmarks
+
+Runs offline benchmarks against a throwaway database in a temporary directory.
+
+Usage:
+    python benchmark.py pool [--iterations N]
+    python benchmark.py concurrency [--requests N]
+    python benchmark.py gemini [--requests N] [--delay SECONDS]
+    python benchmark.py models [--iterations N]
+    python benchmark.py conversation [--iterations N]
+    python benchmark.py context [--iterations N]
+    python benchmark.py streaming [--iterations N] [--delay SECONDS]
+    python benchmark.py tools
+    python benchmark.py retry
+    python benchmark.py indexes [--rows N] [--iterations N]
+    python benchmark.py plans
+    python benchmark.py migrate [--rows N]
+    python benchmark.py startup [--target-ms MS]
+    python benchmark.py pragmas
+    python benchmark.py layout [--iterations N]
+    python benchmark.py backends [--requests N]   (set DATABASE_URL to include PostgreSQL)
+    python benchmark.py users [--rows N] [--requests N]
+    python benchmark.py pagination [--iterations N]
+    python benchmark.py render [--iterations N]
+    python benchmark.py serialize [--iterations N]
+    python benchmark.py tags [--rows N] [--iterations N]
+    python benchmark.py intents [--iterations N] [--delay SECONDS]
+    python benchmark.py commands [--delay SECONDS]
+    python benchmark.py cache [--requests N] [--delay SECONDS]
+    python benchmark.py semantic [--iterations N]
+    python benchmark.py coalesce [--requests N] [--delay SECONDS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import logging
+from datetime import date, timedelta
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger("benchmark")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_DIR)
+
+def percentile(samples, pct):
+    """Get a percentile from a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def report(name, samples):
+    """Print p50/p99 latency for a list of samples in seconds"""
+    print(f"  {name:<40} p50={percentile(samples, 50) * 1000:8.3f}ms  "
+          f"p99={percentile(samples, 99) * 1000:8.3f}ms  n={len(samples)}")
+
+def setup_workdir():
+    """Switch to a temporary directory holding fresh databases"""
+    workdir = tempfile.mkdtemp(prefix="reminder-bench-")
+    os.chdir(workdir)
+    
+    from app.database import init_db
+    init_db()
+    return workdir
+
+async def timed(coro_factory, iterations):
+    """Await a coroutine repeatedly and collect per-call latencies"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+async def bench_pool(args):
+    """Compare connect-per-call against pooled connections for the service layer"""
+    from app.database import configure_pool
+    from app.database.connection import REMINDERS_DB_FILE, CONVERSATIONS_DB_FILE
+    from app.services import add_reminder, get_reminders, save_conversation, get_conversation_history
+    
+    for i in range(200):
+        await add_reminder(f"Benchmark reminder {i}", "2030-01-01", "normal", ["bench"])
+    
+    for label, options in [("connect per call", {"max_idle": 0}), ("pooled", {})]:
+        async def chat_turn(conversation_id=f"bench-{label}"):
+            await get_conversation_history(conversation_id)
+            await save_conversation(conversation_id, "hello", "hi there")
+        
+        configure_pool(REMINDERS_DB_FILE, **options)
+        configure_pool(CONVERSATIONS_DB_FILE, **options)
+        print(f"{label}:")
+        report("get_reminders (/api/reminders)", await timed(lambda: get_reminders(), args.iterations))
+        report("history + save (/api/chat storage)", await timed(chat_turn, args.iterations))
+
+async def measure_loop_lag(stop, interval=0.001):
+    """Track the worst delay of a periodic timer while other work runs"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+async def bench_concurrency(args):
+    """Fire parallel storage-bound requests with database work inline and on the executor"""
+    from app import config
+    from app.database import configure_db_executor
+    from app.services import add_reminder, get_reminders, save_conversation, get_conversation_history
+    
+    for i in range(100):
+        await add_reminder(f"Benchmark reminder {i}", f"2030-01-{i % 28 + 1:02d}", "normal", [])
+    
+    async def request(n, label):
+        conversation_id = f"{label}-{n}"
+        await get_conversation_history(conversation_id)
+        await get_reminders()
+        await save_conversation(conversation_id, "hello", "hi there")
+    
+    for label, workers in [("inline on event loop", 0), (f"executor ({config.DB_EXECUTOR_WORKERS} threads)", config.DB_EXECUTOR_WORKERS)]:
+        configure_db_executor(workers)
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(stop))
+        
+        start = time.perf_counter()
+        await asyncio.gather(*(request(n, label) for n in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        
+        stop.set()
+        worst_lag = await lag_task
+        print(f"{label}:")
+        print(f"  {args.requests} requests in {elapsed:.3f}s  throughput={args.requests / elapsed:8.1f} req/s  "
+              f"worst loop lag={worst_lag * 1000:.1f}ms")
+    
+    # Chat turns arriving while one slow query (an export, a large scan) runs
+    from app.database import run_db
+    from app.gemini import FakeGenerativeModel, generate_content
+    
+    model = FakeGenerativeModel("Sure.", delay=0.05)
+    turns, spacing = 50, 0.01
+    
+    def slow_query(conn, rows):
+        return conn.execute(
+            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < ?) SELECT sum(x) FROM c",
+            (rows,)
+        ).fetchone()[0]
+    
+    async def chat_turn(n, label, arrival):
+        # Latency counts from when the turn should have arrived, so time spent behind a blocked loop shows up
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        conversation_id = f"slow-{label}-{n}"
+        await get_conversation_history(conversation_id)
+        await generate_content(model, [{"role": "user", "parts": [f"hello {n}"]}])
+        await save_conversation(conversation_id, f"hello {n}", "Sure.")
+        return time.perf_counter() - arrival
+    
+    print(f"{turns} chat turns ({spacing * 1000:.0f}ms apart, fake model {model.delay * 1000:.0f}ms) during one slow query:")
+    for label, workers in [("inline on event loop", 0), (f"executor ({config.DB_EXECUTOR_WORKERS} threads)", config.DB_EXECUTOR_WORKERS)]:
+        configure_db_executor(workers)
+        start = time.perf_counter()
+        slow = asyncio.ensure_future(run_db(slow_query, 1_000_000))
+        samples = await asyncio.gather(*(chat_turn(n, label, start + n * spacing) for n in range(turns)))
+        await slow
+        print(f"{label}: slow query and all turns done in {time.perf_counter() - start:.3f}s")
+        report("chat turn latency", samples)
+
+async def bench_gemini(args):
+    """Compare blocking Gemini calls with the async runtime using a fake slow model"""
+    from app.gemini import FakeGenerativeModel, generate_content, get_gemini_metrics, single_flight
+    
+    model = FakeGenerativeModel("Paris is the capital of France.", delay=args.delay)
+    messages = [{"role": "user", "parts": ["What's the capital of France?"]}]
+    # Identical prompts would share one call; measure the concurrency limit instead
+    single_flight.enabled = False
+    
+    async def blocking_call():
+        return model.generate_content(messages)
+    
+    for label, call in [("blocking generate_content", blocking_call), ("async runtime", lambda: generate_content(model, messages))]:
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        print(f"{label}:")
+        print(f"  {args.requests} chats in {elapsed:.3f}s  throughput={args.requests / elapsed:8.1f} chats/s")
+    
+    metrics = get_gemini_metrics()
+    print(f"  limit={metrics['limit']} max_in_flight={metrics['max_in_flight']} max_queued={metrics['max_queued']}")
+
+async def bench_models(args):
+    """Compare building a model per request with the shared model registry"""
+    from app.gemini import ModelRegistry, FakeGenerativeModel
+    from app.gemini.models import load_gemini_settings
+    
+    try:
+        import google.generativeai as genai
+        factory = lambda name, generation_config: genai.GenerativeModel(name, generation_config=generation_config)
+        print("Using google.generativeai models")
+    except ImportError:
+        factory = lambda name, generation_config: FakeGenerativeModel()
+        print("google.generativeai is not installed, using fake models")
+    
+    def per_request():
+        settings = load_gemini_settings("reminder")
+        return factory(settings["model_name"], settings["generation_config"])
+    
+    registry = ModelRegistry(factory=factory)
+    registry.warm_up()
+    
+    async def build():
+        per_request()
+    
+    async def lookup():
+        registry.get_model("reminder")
+    
+    print("per-request setup:")
+    report("build model per request", await timed(build, args.iterations))
+    report("registry lookup", await timed(lookup, args.iterations))
+    print(f"  registry metrics: {registry.metrics()}")
+
+async def bench_conversation(args):
+    """Measure per-turn save and history cost as a conversation grows"""
+    from app.services import save_conversation, get_conversation_history
+    
+    samples = await timed(lambda: save_conversation("long-conversation", "hello " * 20, "hi there " * 40), args.iterations)
+    window = max(1, min(100, args.iterations // 10))
+    print(f"save_conversation over {args.iterations} turns:")
+    report(f"first {window} turns", samples[:window])
+    report(f"last {window} turns", samples[-window:])
+    
+    print("get_conversation_history:")
+    report("latest 20 messages", await timed(lambda: get_conversation_history("long-conversation", limit=20), 100))
+    report("full history", await timed(lambda: get_conversation_history("long-conversation"), 100))
+
+async def bench_context(args):
+    """Report prompt tokens per turn as a conversation grows, with and without a token budget"""
+    from app.gemini import FakeGenerativeModel, model_registry, context_builder, process_general_chat
+    from app.services import save_conversation, get_conversation_history
+    
+    model_registry.set_factory(lambda name, generation_config: FakeGenerativeModel("Sure, here is a detailed answer. " * 10))
+    
+    for label, budget in [("unbounded history", 10 ** 9), ("budgeted (1500 tokens)", 1500)]:
+        context_builder.token_budget = budget
+        context_builder.reset_metrics()
+        conversation_id = f"context-{budget}"
+        tokens = []
+        for turn in range(args.iterations):
+            history = await get_conversation_history(conversation_id, limit=100)
+            question = f"Question number {turn}: tell me something interesting about topic {turn}."
+            reply = await process_general_chat(question, history, conversation_id)
+            await save_conversation(conversation_id, question, reply)
+            tokens.append(context_builder.metrics()["prompt_tokens_last"])
+        
+        metrics = context_builder.metrics()
+        print(f"{label}:")
+        print(f"  prompt tokens: turn 1={tokens[0]}  turn {len(tokens)}={tokens[-1]}  "
+              f"avg={metrics['prompt_tokens_avg']:.0f}  max={metrics['prompt_tokens_max']}  "
+              f"summarized messages={metrics['messages_summarized']}")
+
+async def bench_streaming(args):
+    """Compare time to first token when streaming with the full-reply latency"""
+    from app.gemini import FakeGenerativeModel, model_registry, process_general_chat, stream_general_chat
+    
+    reply = " ".join(f"word{i}" for i in range(60))
+    model_registry.set_factory(lambda name, generation_config: FakeGenerativeModel(reply, delay=args.delay, chunk_delay=0.02))
+    
+    # Each call sleeps for the model delay plus 20 chunks, so run a fraction of --iterations
+    iterations = max(1, args.iterations // 100)
+    full_reply = await timed(lambda: process_general_chat("Tell me a story"), iterations)
+    
+    first_token, total = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        first = None
+        async for chunk in stream_general_chat("Tell me a story"):
+            if first is None:
+                first = time.perf_counter() - start
+        first_token.append(first)
+        total.append(time.perf_counter() - start)
+    
+    print(f"fake model: {args.delay * 1000:.0f}ms to first chunk, 20ms per 3-word chunk")
+    report("/api/chat total latency", full_reply)
+    report("/api/chat/stream time to first token", first_token)
+    report("/api/chat/stream total", total)
+
+def scripted_tool_model(delay=0.0):
+    """A fake reminder model that answers each command with the matching function call"""
+    import re
+    from app.gemini import FakeGenerativeModel, FakeResponse
+    
+    def reply(contents):
+        last = contents[-1]
+        if last["role"] == "function":
+            return FakeResponse("Sorry, I couldn't find that reminder. Which one did you mean?")
+        
+        text = last["parts"][0].lower()
+        number = re.search(r"\d+", text)
+        if text.startswith("remind me to"):
+            return FakeResponse.function_call("add_reminder", message=text[13:].replace(" tomorrow", ""), date="tomorrow")
+        if "upcoming" in text:
+            return FakeResponse.function_call("get_upcoming_reminders")
+        if "show" in text:
+            return FakeResponse.function_call("get_reminders")
+        if "done" in text and number:
+            return FakeResponse.function_call("complete_reminder", reminder_id=float(number.group()))
+        if "delete" in text and number:
+            return FakeResponse.function_call("delete_reminder", reminder_id=number.group())
+        return FakeResponse("Which reminder do you mean?")
+    
+    return FakeGenerativeModel(reply, delay=delay)
+
+async def bench_tools(args):
+    """Replay reminder commands through the function-calling loop and count model calls per turn"""
+    from app.gemini import command_fast_path, model_registry, process_with_gemini, tool_dispatcher
+    
+    model = scripted_tool_model()
+    model_registry.set_factory(lambda name, generation_config: model)
+    # Measure the function-calling loop itself; see the commands benchmark for the fast path
+    command_fast_path.enabled = False
+    
+    corpus = [
+        "Remind me to call mom tomorrow",
+        "Remind me to buy milk tomorrow",
+        "Show me all my reminders",
+        "Mark reminder #1 as done",
+        "What's upcoming?",
+        "Delete reminder 2",
+        "Delete reminder 999",
+        "Hmm, the other one",
+    ]
+    for message in corpus:
+        reply = await process_with_gemini(message)
+        print(f"  {message!r:<36} -> {reply.splitlines()[0]}")
+    
+    metrics = tool_dispatcher.metrics()
+    print(f"turns={metrics['turns']} model_calls={metrics['model_calls']} tool_calls={metrics['tool_calls']} "
+          f"model_calls_per_turn={metrics['model_calls_per_turn']:.2f}")
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable"""
+
+class InvalidArgument(Exception):
+    """Stand-in for google.api_core.exceptions.InvalidArgument"""
+
+async def bench_retry(args):
+    """Count Gemini calls and latency per turn for transient, permanent and hanging failures"""
+    from app.gemini import FakeGenerativeModel, FakeResponse, command_fast_path, deadline_budget, get_tool_format, model_registry, probe_tool_format, process_with_gemini, reset_tool_format, retry_policy
+    
+    model = FakeGenerativeModel("OK")
+    model_registry.set_factory(lambda name, generation_config: model)
+    await probe_tool_format(model)
+    # The fast path would answer the test message without Gemini
+    command_fast_path.enabled = False
+    
+    def flaky(failures):
+        state = {"left": failures}
+        def reply(contents):
+            if state["left"]:
+                state["left"] -= 1
+                return ServiceUnavailable("503 overloaded")
+            return FakeResponse("Done.")
+        return reply
+    
+    scenarios = [
+        ("healthy", lambda: "Done.", 0.0, None),
+        ("2 transient errors", lambda: flaky(2), 0.0, None),
+        ("invalid argument", lambda: InvalidArgument("400 bad request"), 0.0, None),
+        ("outage", lambda: ServiceUnavailable("503 overloaded"), 0.0, None),
+        ("hung call", lambda: "Done.", 2.0, 0.5),
+    ]
+    print(f"max_attempts={retry_policy.max_attempts} base_delay={retry_policy.base_delay}s deadline={retry_policy.deadline}s")
+    for label, make_reply, delay, budget in scenarios:
+        turns = 3 if delay else 10
+        samples = []
+        calls = 0
+        for _ in range(turns):
+            if get_tool_format() is None:
+                # An invalid argument drops the probed format; probe again outside the measured turn
+                reset_tool_format()
+                await probe_tool_format(FakeGenerativeModel("OK"))
+            model.reply = make_reply()
+            model.delay = delay
+            model.calls = 0
+            start = time.perf_counter()
+            if budget:
+                with deadline_budget(budget):
+                    await process_with_gemini("Show me all my reminders")
+            else:
+                await process_with_gemini("Show me all my reminders")
+            samples.append(time.perf_counter() - start)
+            calls += model.calls
+        print(f"{label:<20} model_calls_per_turn={calls / turns:.1f}")
+        report(f"{label} latency", samples)
+    print(f"retry metrics: {retry_policy.metrics()}")
+
+def service_queries():
+    """The reminder list queries issued by the services, with sample parameters"""
+    from app.database.backends.sqlite import UPCOMING_REMINDERS_QUERY, build_reminders_count_query, build_reminders_page_query, build_reminders_query
+    
+    return [
+        ("get_reminders()", *build_reminders_query("user-42")),
+        ("get_reminders(completed)", *build_reminders_query("user-42", completed=True)),
+        ("get_reminders(date)", *build_reminders_query("user-42", "2025-06-01")),
+        ("get_upcoming_reminders()", UPCOMING_REMINDERS_QUERY, ["user-42", "2025-06-01", "2025-06-02"]),
+        ("get_reminders(limit)", *build_reminders_page_query("user-42", limit=50)),
+        ("get_reminders(limit, cursor)", *build_reminders_page_query("user-42", limit=50, after=("2025-06-01", "normal", 42))),
+        ("get_reminders(total)", *build_reminders_count_query("user-42")),
+    ]
+
+def synthetic_reminders(rng, rows, users=10_000):
+    """Generate reminder rows spread over users, three years of dates and four priorities, most completed"""
+    priorities = ["low", "normal", "medium", "high"]
+    first_day = date(2024, 1, 1)
+    for n in range(rows):
+        yield (
+            f"user-{rng.randrange(users)}",
+            f"Reminder {n}",
+            (first_day + timedelta(days=rng.randrange(1096))).isoformat(),
+            rng.choice(priorities),
+            int(rng.random() < 0.8)
+        )
+
+def tag_queries():
+    """The tag-filtered reminder queries, with sample parameters"""
+    from app.database.backends.sqlite import build_reminders_count_query, build_reminders_page_query, build_reminders_query
+    
+    return [
+        ("get_reminders(tag)", *build_reminders_query("user-42", tag="work")),
+        ("get_reminders(tag, limit)", *build_reminders_page_query("user-42", limit=50, tag="work")),
+        ("get_reminders(tag, total)", *build_reminders_count_query("user-42", tag="work")),
+    ]
+
+def query_plan(conn, query, params):
+    """Get the EXPLAIN QUERY PLAN details for a query as one string"""
+    return "; ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+async def bench_indexes(args):
+    """Time the service queries on a large reminders table before and after the composite index"""
+    conn = sqlite3.connect("indexes.db")
+    conn.execute("""
+        CREATE TABLE reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            user_message TEXT NOT NULL,
+            date TEXT NOT NULL,
+            priority TEXT DEFAULT 'normal',
+            tags TEXT DEFAULT '[]',
+            completed BOOLEAN DEFAULT 0
+        )
+    """)
+    
+    start = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO reminders (user_id, user_message, date, priority, completed) VALUES (?, ?, ?, ?, ?)",
+        synthetic_reminders(random.Random(42), args.rows)
+    )
+    conn.commit()
+    print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+    
+    queries = service_queries()
+    iterations = max(1, args.iterations // 100)
+    
+    def run(label):
+        print(label)
+        for name, query, params in queries:
+            print(f"  {name:<28} plan: {query_plan(conn, query, params)}")
+        for name, query, params in queries:
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                rows = conn.execute(query, params).fetchall()
+                samples.append(time.perf_counter() - started)
+            report(f"{name} ({len(rows)} rows)", samples)
+    
+    run("without secondary indexes")
+    
+    start = time.perf_counter()
+    conn.execute("CREATE INDEX idx_reminders_user_completed_date_priority ON reminders (user_id, completed, date, priority DESC)")
+    conn.execute("ANALYZE")
+    print(f"built index in {time.perf_counter() - start:.1f}s")
+    run("with idx_reminders_user_completed_date_priority")
+    conn.close()
+    
+    # Fail loudly if a query stops using the index or needs a sort
+    check_query_plans()
+
+def check_query_plans(db_file=None):
+    """Check that every service query is served by the reminders index without a temp sort"""
+    from app.database import db_connection
+    from app.database.connection import REMINDERS_DB_FILE
+    
+    failures = 0
+    with db_connection(db_file or REMINDERS_DB_FILE) as conn:
+        for name, query, params in service_queries():
+            plan = query_plan(conn, query, params)
+            ok = "INDEX idx_reminders_user_completed_date_priority" in plan and "TEMP B-TREE" not in plan
+            failures += not ok
+            print(f"  {'ok' if ok else 'FAIL':<4} {name:<28} {plan}")
+        # Tag filters seek the user's tag in reminder_tags and sort only the matches
+        for name, query, params in tag_queries():
+            plan = query_plan(conn, query, params)
+            ok = "SEARCH reminder_tags USING PRIMARY KEY (user_id=? AND tag=?)" in plan and "SCAN" not in plan
+            failures += not ok
+            print(f"  {'ok' if ok else 'FAIL':<4} {name:<28} {plan}")
+    if failures:
+        sys.exit(f"{failures} reminder queries no longer use the index")
+
+async def bench_plans(args):
+    """Check the query plans of the reminder service queries against the schema from init_db"""
+    check_query_plans()
+
+async def bench_migrate(args):
+    """Rewrite a legacy reminders table online and offline while a client keeps writing"""
+    from app.database import migrate, run_db
+    
+    rows = args.rows // 5
+    
+    def seed(db_file):
+        conn = sqlite3.connect(db_file)
+        conn.execute("""
+            CREATE TABLE reminders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message TEXT NOT NULL,
+                date TEXT NOT NULL,
+                priority TEXT DEFAULT 'normal',
+                tags TEXT DEFAULT '[]',
+                completed BOOLEAN DEFAULT 0
+            )
+        """)
+        conn.executemany("INSERT INTO reminders (message, date) VALUES (?, ?)", ((f"Reminder {n}", "2025-06-01") for n in range(rows)))
+        conn.commit()
+        conn.close()
+    
+    def insert(conn, n):
+        # The column is renamed when the rewritten table is swapped in
+        try:
+            conn.execute("INSERT INTO reminders (message, date) VALUES (?, ?)", (f"Live write {n}", "2025-06-02"))
+        except sqlite3.OperationalError:
+            conn.execute("INSERT INTO reminders (user_message, date) VALUES (?, ?)", (f"Live write {n}", "2025-06-02"))
+        conn.commit()
+    
+    for label, online in (("offline", False), ("online", True)):
+        db_file = f"migrate-{label}.db"
+        seed(db_file)
+        
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        migration = loop.run_in_executor(None, lambda: migrate("reminders", db_file, online=online))
+        
+        # A client writing one reminder every 5ms while the migration runs
+        samples = []
+        n = 0
+        while not migration.done():
+            started = time.perf_counter()
+            await run_db(insert, n, db_file=db_file)
+            samples.append(time.perf_counter() - started)
+            n += 1
+            await asyncio.sleep(0.005)
+        results = await migration
+        elapsed = time.perf_counter() - start
+        
+        conn = sqlite3.connect(db_file)
+        count = conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+        conn.close()
+        timings = ", ".join(f"{r['name']}={r['duration_ms']:.0f}ms" for r in results)
+        print(f"{label}: {rows} rows migrated in {elapsed:.2f}s ({timings}); {count - rows}/{n} live writes kept")
+        report(f"{label} live write latency", samples)
+
+def import_time(module):
+    """Import a module in a fresh interpreter and get its cumulative -X importtime cost
+    
+    Returns:
+        A tuple of (milliseconds, slowest imports, error), where error is set if the import failed
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.getcwd(),
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")])))
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            timings.append((int(cumulative) / 1000, name.strip()))
+    if result.returncode:
+        return 0.0, [], result.stderr.strip().splitlines()[-1]
+    
+    total = next(ms for ms, name in reversed(timings) if name == module)
+    slowest = sorted((t for t in timings if t[1] != module), reverse=True)[:5]
+    return total, slowest, None
+
+async def bench_startup(args):
+    """Report cold import time per package and check that importing touches no files"""
+    os.mkdir("imports")
+    os.chdir("imports")
+    
+    failures = 0
+    for module in ["app.config", "app.database", "app.services", "app.gemini", "app.main"]:
+        before = set(os.listdir("."))
+        total, slowest, error = import_time(module)
+        if error:
+            print(f"  {module:<16} skipped ({error})")
+            continue
+        
+        created = set(os.listdir(".")) - before
+        over = total > args.target_ms
+        failures += over or bool(created)
+        print(f"  {module:<16} {total:8.1f}ms{'  OVER TARGET' if over else ''}")
+        for ms, name in slowest:
+            print(f"      {ms:8.1f}ms  {name}")
+        if created:
+            print(f"      import created files: {sorted(created)}")
+    
+    if failures:
+        sys.exit(f"{failures} imports exceeded {args.target_ms:.0f}ms or touched the disk")
+
+async def bench_pragmas(args):
+    """Run a mixed read/write reminder workload under each pragma profile"""
+    from app import config
+    from app.database import configure_db_executor, configure_pool, get_pool, migrate, run_db
+    from app.database.backends.sqlite import _insert_reminder, _select_reminders, _update_reminder, build_reminders_query
+    
+    readers, writers, duration = 8, 2, 3.0
+    configure_db_executor(readers + writers)
+    
+    for profile, pragmas in config.DB_PRAGMA_PROFILES.items():
+        db_file = f"pragmas-{profile}.db"
+        configure_pool(db_file, max_size=readers + writers, pragmas=pragmas)
+        migrate("reminders", db_file)
+        with get_pool(db_file).connection() as conn:
+            conn.executemany(
+                "INSERT INTO reminders (user_id, user_message, date, priority) VALUES (?, ?, ?, ?)",
+                (("bench", f"Reminder {n}", (date(2025, 1, 1) + timedelta(days=n % 365)).isoformat(), "normal") for n in range(20000))
+            )
+            conn.commit()
+        
+        samples = {"read": [], "write": []}
+        stop = time.perf_counter() + duration
+        
+        async def reader(n):
+            while time.perf_counter() < stop:
+                query, params = build_reminders_query("bench", (date(2025, 1, 1) + timedelta(days=n % 365)).isoformat())
+                started = time.perf_counter()
+                await run_db(_select_reminders, query, params, db_file=db_file)
+                samples["read"].append(time.perf_counter() - started)
+                n += 1
+        
+        async def writer(n):
+            while time.perf_counter() < stop:
+                started = time.perf_counter()
+                reminder = await run_db(_insert_reminder, "bench", f"Live write {n}", "2025-06-15", "high", [], db_file=db_file)
+                await run_db(
+                    _update_reminder, "bench", reminder["id"],
+                    "UPDATE reminders SET completed = 1 WHERE id = ? AND user_id = ?",
+                    db_file=db_file
+                )
+                samples["write"].append(time.perf_counter() - started)
+                n += 1
+        
+        await asyncio.gather(*[reader(n) for n in range(readers)], *[writer(n) for n in range(writers)])
+        checkpoint = get_pool(db_file).checkpoint()
+        
+        print(f"{profile}: {', '.join(f'{k}={v}' for k, v in pragmas.items())}")
+        for kind, kind_samples in samples.items():
+            print(f"  {kind}s: {len(kind_samples) / duration:8.0f}/s")
+            report(f"{kind} latency", kind_samples)
+        if checkpoint:
+            print(f"  checkpoint after run: {checkpoint}")
+
+async def bench_layout(args):
+    """Time a reminder-creating chat turn with split database files and with one file"""
+    from app import config
+    from app.database import configure_pool, migrate, run_db
+    from app.database.backends.sqlite import _append_messages, _insert_reminder
+    
+    for profile in ("default", "wal"):
+        for layout, files in (("split", ("split-reminders.db", "split-database.db")), ("single", ("one.db", "one.db"))):
+            reminders_file, conversations_file = (f"{profile}-{name}" for name in files)
+            for db_file in {reminders_file, conversations_file}:
+                configure_pool(db_file, pragmas=config.DB_PRAGMA_PROFILES[profile])
+            migrate("reminders", reminders_file)
+            migrate("conversations", conversations_file)
+            
+            async def chat_turn(n=[0]):
+                n[0] += 1
+                await run_db(_insert_reminder, "bench", f"Call mom {n[0]}", "2025-06-01", "normal", [], db_file=reminders_file)
+                await run_db(_append_messages, "bench", "bench", "Remind me to call mom", "✅ Reminder added", db_file=conversations_file)
+            
+            report(f"{profile} profile, {layout} layout", await timed(chat_turn, args.iterations))
+
+async def bench_backends(args):
+    """Run the same concurrent chat-turn workload against each storage backend"""
+    from app import config
+    from app.database import BACKENDS
+    
+    concurrency = 20
+    for name, backend_class in BACKENDS.items():
+        if name == "postgres" and not config.DATABASE_URL:
+            print(f"{name}: skipped (set DATABASE_URL to a scratch database)")
+            continue
+        
+        storage = backend_class()
+        try:
+            await storage.start()
+        except RuntimeError as e:
+            print(f"{name}: skipped ({e})")
+            continue
+        
+        samples = {"insert": [], "select": [], "append_messages": [], "select_messages": []}
+        
+        async def chat_turn(n):
+            steps = [
+                ("insert", lambda: storage.reminders.insert(f"user-{n % 50}", f"Call mom {n}", f"2025-06-{1 + n % 28:02d}", "normal", [])),
+                ("select", lambda: storage.reminders.select(f"user-{n % 50}", f"2025-06-{1 + n % 28:02d}")),
+                ("append_messages", lambda: storage.conversations.append_messages(f"user-{n % 50}", f"bench-{n % 50}", "Remind me to call mom", "✅ Reminder added")),
+                ("select_messages", lambda: storage.conversations.select_messages(f"user-{n % 50}", f"bench-{n % 50}", 20, 0)),
+            ]
+            for step, call in steps:
+                started = time.perf_counter()
+                await call()
+                samples[step].append(time.perf_counter() - started)
+        
+        start = time.perf_counter()
+        for wave in range(0, args.requests, concurrency):
+            await asyncio.gather(*[chat_turn(n) for n in range(wave, min(wave + concurrency, args.requests))])
+        elapsed = time.perf_counter() - start
+        await storage.close()
+        
+        print(f"{name}: {args.requests / elapsed:.0f} chat turns/s with {concurrency} concurrent")
+        for step, step_samples in samples.items():
+            report(f"{name} {step}", step_samples)
+
+async def bench_users(args):
+    """Simulate 10k users listing, adding and completing their own reminders as the shared table grows"""
+    from app.database import configure_db_executor, get_pool, migrate
+    from app.database.backends.sqlite import SQLiteReminderRepository
+    
+    users, concurrency = 10_000, 50
+    db_file = "users.db"
+    migrate("reminders", db_file)
+    configure_db_executor(concurrency)
+    repository = SQLiteReminderRepository(db_file)
+    rng = random.Random(42)
+    
+    seeded = 0
+    for size in sorted({min(100_000, args.rows), args.rows}):
+        start = time.perf_counter()
+        with get_pool(db_file).connection() as conn:
+            conn.executemany(
+                "INSERT INTO reminders (user_id, user_message, date, priority, completed) VALUES (?, ?, ?, ?, ?)",
+                synthetic_reminders(rng, size - seeded, users)
+            )
+            conn.commit()
+            conn.execute("ANALYZE")
+        seeded = size
+        print(f"{size} rows across {users} users (seeded in {time.perf_counter() - start:.1f}s)")
+        
+        samples = {"list": [], "add": [], "complete": []}
+        
+        async def session(user_id):
+            started = time.perf_counter()
+            await repository.select(user_id)
+            samples["list"].append(time.perf_counter() - started)
+            
+            started = time.perf_counter()
+            reminder = await repository.insert(user_id, "Load test", "2025-06-01", "normal", [])
+            samples["add"].append(time.perf_counter() - started)
+            
+            started = time.perf_counter()
+            await repository.complete(user_id, reminder["id"])
+            samples["complete"].append(time.perf_counter() - started)
+            
+            # Another user must not be able to touch the reminder
+            if await repository.delete(f"{user_id}-other", reminder["id"]):
+                sys.exit(f"{user_id}'s reminder was deleted by another user")
+        
+        start = time.perf_counter()
+        for wave in range(0, args.requests, concurrency):
+            await asyncio.gather(*[
+                session(f"user-{rng.randrange(users)}")
+                for _ in range(min(concurrency, args.requests - wave))
+            ])
+        elapsed = time.perf_counter() - start
+        
+        print(f"  {args.requests / elapsed:.0f} user sessions/s with {concurrency} concurrent")
+        for operation, operation_samples in samples.items():
+            report(f"{operation} at {size} rows", operation_samples)
+    
+    check_query_plans(db_file)
+
+async def bench_pagination(args):
+    """Compare listing 10k reminders at once against keyset pages with a field projection"""
+    from app.database import get_storage, run_db
+    from app.services import get_reminders
+    
+    reminders = 10_000
+    rng = random.Random(42)
+    storage = get_storage()
+    await storage.start()
+    
+    def seed(conn):
+        conn.executemany(
+            "INSERT INTO reminders (user_id, user_message, date, priority, tags) VALUES (?, ?, ?, ?, ?)",
+            (("heavy", f"Reminder {n} with a realistic amount of text", (date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat(),
+              rng.choice(["low", "normal", "medium", "high"]), '["work", "home"]') for n in range(reminders))
+        )
+        conn.commit()
+    await run_db(seed)
+    
+    async def last_page():
+        result = await get_reminders(user_id="heavy", limit=50)
+        pages = 1
+        while result["next_cursor"]:
+            result = await get_reminders(user_id="heavy", limit=50, cursor=result["next_cursor"], fields=["id", "message", "date"])
+            pages += 1
+        return pages
+    
+    cases = [
+        ("all reminders", lambda: get_reminders(user_id="heavy")),
+        ("first page (50)", lambda: get_reminders(user_id="heavy", limit=50)),
+        ("first page, 3 fields", lambda: get_reminders(user_id="heavy", limit=50, fields=["id", "message", "date"])),
+        ("first page + total", lambda: get_reminders(user_id="heavy", limit=50, include_total=True)),
+    ]
+    
+    # Pages deep in the list cost the same as the first one
+    first = await get_reminders(user_id="heavy", limit=5000, fields=["id"])
+    cases.append(("page after 5000", lambda: get_reminders(user_id="heavy", limit=50, cursor=first["next_cursor"])))
+    
+    iterations = max(1, args.iterations // 10)
+    for name, call in cases:
+        samples = await timed(call, iterations)
+        tracemalloc.start()
+        result = await call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report(f"{name} ({len(result['reminders'])} rows, peak {peak / 1024:.0f}KB)", samples)
+    
+    start = time.perf_counter()
+    pages = await last_page()
+    print(f"  walked all {reminders} reminders in {pages} pages in {time.perf_counter() - start:.2f}s")
+    await storage.close()
+
+def render_by_concatenation(reminders):
+    """The summary builder get_reminders used to run for every call, kept for comparison"""
+    result_message = "📅 Here are your reminders:\n"
+    for r in reminders:
+        priority_icon = "🔴" if r["priority"] == "high" else "🟡" if r["priority"] == "medium" else "🟢"
+        result_message += f"{priority_icon} {r['date']}: {r['message']}\n"
+    return result_message
+
+def render_by_join(reminders):
+    """The summary built from a list of lines with str.join, kept for comparison"""
+    lines = ["📅 Here are your reminders:"]
+    lines.extend(f"{'🔴' if r['priority'] == 'high' else '🟡' if r['priority'] == 'medium' else '🟢'} {r['date']}: {r['message']}" for r in reminders)
+    lines.append("")
+    return "\n".join(lines)
+
+def measure(call, iterations):
+    """Get per-call CPU time samples and the peak traced memory of one more call
+    
+    Returns:
+        A tuple of (CPU seconds per call, peak bytes)
+    """
+    samples = []
+    for _ in range(iterations):
+        started = time.process_time()
+        call()
+        samples.append(time.process_time() - started)
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return samples, peak
+
+async def bench_render(args):
+    """Compare ways of building the reminder summary text, and list calls with and without it"""
+    from app.database import get_storage, run_db
+    from app.services import get_reminders
+    from app.utils import render_reminders
+    
+    reminders = 10_000
+    rng = random.Random(42)
+    storage = get_storage()
+    await storage.start()
+    
+    def seed(conn):
+        conn.executemany(
+            "INSERT INTO reminders (user_id, user_message, date, priority) VALUES (?, ?, ?, ?)",
+            (("heavy", f"Reminder {n} with a realistic amount of text", (date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat(),
+              rng.choice(["low", "normal", "medium", "high"])) for n in range(reminders))
+        )
+        conn.commit()
+    await run_db(seed)
+    
+    result = await get_reminders(user_id="heavy")
+    if render_reminders(result) != render_by_concatenation(result["reminders"]):
+        sys.exit("render_reminders output differs from the old summary")
+    
+    iterations = max(1, args.iterations // 10)
+    print(f"summary text for {reminders} reminders:")
+    for name, call in (
+        ("+= (render_reminders)", lambda: render_reminders(result)),
+        ("str.join", lambda: render_by_join(result["reminders"])),
+    ):
+        samples, peak = measure(call, iterations)
+        report(f"{name} cpu, peak {peak / 1024:.0f}KB", samples)
+    
+    # The list call with the text (the default) and with summary=false
+    print(f"get_reminders over {reminders} reminders:")
+    for name, summary in (("summary=true", True), ("summary=false", False)):
+        samples = []
+        tracemalloc.start()
+        for _ in range(iterations):
+            started = time.process_time()
+            listed = await get_reminders(user_id="heavy")
+            if summary:
+                render_reminders(listed)
+            samples.append(time.process_time() - started)
+            del listed
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report(f"{name} cpu, peak {peak / 1024:.0f}KB", samples)
+    await storage.close()
+
+def format_reminder_per_row(reminder):
+    """The row formatting the services used before reminder_mapper, kept for comparison"""
+    try:
+        tags = json.loads(reminder["tags"])
+    except:
+        tags = []
+    
+    return {
+        "id": reminder["id"],
+        "message": reminder["user_message"],
+        "date": reminder["date"],
+        "priority": reminder["priority"],
+        "tags": tags,
+        "completed": bool(reminder["completed"])
+    }
+
+def dumps_stdlib(content):
+    """Encode a body the way Starlette's JSONResponse does"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+async def bench_serialize(args):
+    """Time row mapping and JSON encoding for 1k and 10k reminder responses"""
+    from app.utils import JSON_ENCODER, dumps_json, reminder_mapper
+    try:
+        from app.models import ReminderRecord
+    except ImportError as e:
+        ReminderRecord = None
+        print(f"ReminderRecord cases skipped ({e})")
+    
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE reminders (id INTEGER PRIMARY KEY, user_message TEXT, date TEXT, priority TEXT, tags TEXT, completed BOOLEAN)")
+    rng = random.Random(42)
+    tag_lists = ["[]", "[]", '["work"]', '["home", "family"]', '["errand"]']
+    
+    print(f"JSON encoder: {JSON_ENCODER}")
+    iterations = max(1, args.iterations // 20)
+    for size in (1_000, 10_000):
+        conn.execute("DELETE FROM reminders")
+        conn.executemany(
+            "INSERT INTO reminders (user_message, date, priority, tags, completed) VALUES (?, ?, ?, ?, ?)",
+            ((f"Reminder {n} with a realistic amount of text", f"2025-06-{1 + n % 28:02d}", rng.choice(["low", "normal", "high"]),
+              rng.choice(tag_lists), 0) for n in range(size))
+        )
+        rows = conn.execute("SELECT * FROM reminders").fetchall()
+        
+        def mapped():
+            to_dict = reminder_mapper(rows[0])
+            return [to_dict(row) for row in rows]
+        
+        dicts = mapped()
+        if dicts != [format_reminder_per_row(row) for row in rows]:
+            sys.exit("reminder_mapper output differs from per-row formatting")
+        body = {"success": True, "message": f"📅 {size} reminders", "reminders": dicts}
+        if dumps_json(body) != dumps_stdlib(body):
+            print("  note: orjson output differs from the standard library byte-for-byte (same JSON value)")
+        
+        cases = [
+            ("map: per-row format (old)", lambda: [format_reminder_per_row(row) for row in rows]),
+            ("map: reminder_mapper", mapped),
+            ("encode: stdlib json (old)", lambda: dumps_stdlib(body)),
+            (f"encode: dumps_json ({JSON_ENCODER})", lambda: dumps_json(body)),
+            ("map + encode (old)", lambda: dumps_stdlib({"reminders": [format_reminder_per_row(row) for row in rows]})),
+            ("map + encode (new)", lambda: dumps_json({"reminders": mapped()})),
+        ]
+        if ReminderRecord:
+            records = [ReminderRecord.from_row(row) for row in rows]
+            cases.append(("encode: ReminderRecord list", lambda: dumps_json({"reminders": records})))
+        
+        print(f"{size} reminders:")
+        for name, call in cases:
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - started)
+            report(f"{name} ({size / statistics.median(samples) / 1000:.0f}k rows/s)", samples)
+
+async def bench_tags(args):
+    """Filter reminders by tag over a large table: JSON decoding per row against the reminder_tags index"""
+    from app.database import configure_db_executor, get_pool, migrate
+    from app.database.backends.sqlite import SQLiteReminderRepository, _select_reminders, build_reminders_query
+    from app.database.migrations import _backfill_reminder_tags
+    from app.utils import normalize_tag
+    
+    users, heavy_rows = 10_000, 100_000
+    vocabulary = ["work", "home", "family", "errand", "health", "finance", "travel", "school"] + [f"project-{n}" for n in range(40)]
+    db_file = "tags.db"
+    migrate("reminders", db_file)
+    configure_db_executor(4)
+    repository = SQLiteReminderRepository(db_file)
+    rng = random.Random(42)
+    
+    def tags():
+        return json.dumps(rng.sample(vocabulary, rng.choice([0, 0, 1, 1, 2, 3])))
+    
+    # Reminders spread over many users, plus one user with a long history
+    start = time.perf_counter()
+    with get_pool(db_file).connection() as conn:
+        conn.executemany(
+            "INSERT INTO reminders (user_id, user_message, date, priority, tags) VALUES (?, ?, ?, ?, ?)",
+            ((("heavy" if n < heavy_rows else f"user-{rng.randrange(users)}"), f"Reminder {n}",
+              (date(2024, 1, 1) + timedelta(days=rng.randrange(1096))).isoformat(), rng.choice(["low", "normal", "high"]), tags())
+             for n in range(args.rows))
+        )
+        conn.commit()
+    print(f"seeded {args.rows} reminders in {time.perf_counter() - start:.1f}s")
+    
+    start = time.perf_counter()
+    _backfill_reminder_tags(db_file, None)
+    with get_pool(db_file).connection() as conn:
+        tag_rows = conn.execute("SELECT COUNT(*) FROM reminder_tags").fetchone()[0]
+        conn.execute("ANALYZE")
+    print(f"backfilled {tag_rows} tag rows in {time.perf_counter() - start:.1f}s")
+    
+    def decode_and_filter(conn, user_id, tag):
+        # The only option before reminder_tags: read the user's reminders and decode every tag list
+        query, params = build_reminders_query(user_id)
+        wanted = normalize_tag(tag)
+        return [row for row in _select_reminders(conn, query, params) if wanted in map(normalize_tag, json.loads(row["tags"]))]
+    
+    iterations = max(1, args.iterations // 10)
+    for label, user_ids in (("random users", [f"user-{rng.randrange(users)}" for _ in range(iterations)]), ("heavy user", ["heavy"] * iterations)):
+        scan_samples, index_samples, page_samples = [], [], []
+        for user_id in user_ids:
+            tag = rng.choice(vocabulary)
+            with get_pool(db_file).connection() as conn:
+                started = time.perf_counter()
+                expected = decode_and_filter(conn, user_id, tag)
+                scan_samples.append(time.perf_counter() - started)
+            
+            started = time.perf_counter()
+            rows = await repository.select(user_id, tag=tag)
+            index_samples.append(time.perf_counter() - started)
+            if [row["id"] for row in rows] != [row["id"] for row in expected]:
+                sys.exit(f"tag filter results differ for {user_id} / {tag}")
+            
+            started = time.perf_counter()
+            await repository.select_page(user_id, None, False, 50, tag=tag)
+            page_samples.append(time.perf_counter() - started)
+        
+        print(f"{label} (last match count {len(rows)}):")
+        report("decode JSON per row (old)", scan_samples)
+        report("reminder_tags index", index_samples)
+        report("reminder_tags index, first page of 50", page_samples)
+    
+    check_query_plans(db_file)
+
+# The keyword list /api/chat routed on before the intent router
+LEGACY_REMINDER_KEYWORDS = [
+    "remind", "reminder", "schedule", "task", "todo", "to-do",
+    "show reminders", "list reminders", "upcoming", "delete reminder",
+    "complete reminder", "mark as done", "mark as completed"
+]
+
+def load_fixtures(name):
+    """Read a JSON-lines fixture file from the fixtures directory"""
+    with open(os.path.join(REPO_DIR, "fixtures", name)) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+async def bench_intents(args):
+    """Route the labeled chat fixtures: accuracy per stage and per-message classification latency"""
+    from app.gemini import FakeGenerativeModel, IntentRouter, KeywordStage, HashedBayesStage, model_registry, REMINDER, GENERAL
+    
+    fixtures = load_fixtures("intents.jsonl")
+    labels = {fixture["message"]: fixture["intent"] for fixture in fixtures}
+    router = IntentRouter(llm_fallback=False)
+    keywords, model = router.stages
+    model.train()
+    
+    def legacy(message):
+        return REMINDER if any(keyword in message.lower() for keyword in LEGACY_REMINDER_KEYWORDS) else GENERAL
+    
+    def accuracy(label, classify):
+        decided = correct = 0
+        misroutes = {REMINDER: 0, GENERAL: 0}
+        for fixture in fixtures:
+            intent = classify(fixture["message"])
+            if intent is None:
+                continue
+            decided += 1
+            if intent == fixture["intent"]:
+                correct += 1
+            else:
+                misroutes[fixture["intent"]] += 1
+        print(f"  {label:<34} decided={decided:>4}/{len(fixtures)}  accuracy={correct / decided if decided else 0:6.1%}  "
+              f"reminders sent to chat={misroutes[REMINDER]:>3}  chat sent to tools={misroutes[GENERAL]:>3}")
+    
+    print(f"accuracy on {len(fixtures)} labeled messages ({sum(f['intent'] == REMINDER for f in fixtures)} reminder):")
+    accuracy("keyword list (old)", legacy)
+    accuracy("keyword stage", keywords.classify)
+    accuracy("model stage", model.classify)
+    accuracy("local stages", lambda message: router.classify_local(message)[0])
+    accuracy("local stages + best guess", lambda message: router.classify_local(message)[0] or router.best_guess(message))
+    
+    print("per-message classification latency:")
+    messages = [fixture["message"] for fixture in fixtures]
+    for label, classify in (("keyword list (old)", legacy), ("keyword stage", keywords.classify),
+                            ("model stage", model.classify), ("local stages", router.classify_local)):
+        samples = []
+        for _ in range(max(1, args.iterations // 100)):
+            for message in messages:
+                start = time.perf_counter()
+                classify(message)
+                samples.append(time.perf_counter() - start)
+        report(label, samples)
+    
+    # The LLM stage, answered by a fake model that knows the labels
+    model_registry.set_factory(lambda name, config: FakeGenerativeModel(
+        lambda contents: labels[contents.rsplit("Message: ", 1)[1]], delay=args.delay))
+    router = IntentRouter(llm_fallback=True)
+    samples = []
+    for message in messages:
+        start = time.perf_counter()
+        await router.route(message)
+        samples.append(time.perf_counter() - start)
+    metrics = router.metrics()
+    print(f"with the LLM stage (fake model, {args.delay}s per call): {metrics['llm']}/{metrics['messages']} messages "
+          f"({metrics['llm'] / metrics['messages']:.1%}) reached Gemini")
+    report("route()", samples)
+    print(f"  mean routing cost {statistics.mean(samples) * 1000:.1f}ms per message")
+    model_registry.set_factory(None)
+
+async def bench_commands(args):
+    """Replay reminder chat messages with and without the local command fast path"""
+    from app.database import get_pool
+    from app.database.connection import REMINDERS_DB_FILE
+    from app.gemini import command_fast_path, model_registry, process_with_gemini, tool_dispatcher
+    from app.services import add_reminder
+    from app.utils import parse_command
+    
+    corpus = load_fixtures("commands.jsonl")
+    
+    # Grammar check against the expected command of every message
+    recognized = wrong = false_positives = 0
+    for entry in corpus:
+        command = parse_command(entry["message"])
+        expected = tuple(entry["command"]) if entry["command"] else None
+        if command is None:
+            continue
+        if expected is None:
+            false_positives += 1
+            print(f"  unexpected command for {entry['message']!r}: {command}")
+        elif command == expected:
+            recognized += 1
+        else:
+            wrong += 1
+            print(f"  wrong command for {entry['message']!r}: {command} != {expected}")
+    commands = sum(entry["command"] is not None for entry in corpus)
+    print(f"grammar: {recognized}/{commands} commands recognized, {wrong} wrong, "
+          f"{false_positives} false positives in {len(corpus) - commands} other messages")
+    
+    model = scripted_tool_model(args.delay)
+    model_registry.set_factory(lambda name, generation_config: model)
+    
+    for enabled in (False, True):
+        # Start every replay from the same 20 reminders
+        with get_pool(REMINDERS_DB_FILE).connection() as conn:
+            conn.execute("DELETE FROM reminders")
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'reminders'")
+            conn.commit()
+        for n in range(20):
+            await add_reminder(f"Seeded reminder {n}", "tomorrow")
+        
+        command_fast_path.enabled = enabled
+        model.calls = 0
+        samples = []
+        start = time.perf_counter()
+        for entry in corpus:
+            started = time.perf_counter()
+            await process_with_gemini(entry["message"])
+            samples.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - start
+        
+        print(f"{'fast path' if enabled else 'Gemini only'} ({args.delay}s per model call): "
+              f"{len(corpus)} messages in {elapsed:.2f}s, {model.calls} model calls")
+        report("per message", samples)
+    
+    metrics = command_fast_path.metrics()
+    print(f"served locally: {metrics['served']}/{metrics['messages']} ({metrics['served_fraction']:.1%}), "
+          f"fell through after a failed tool call: {metrics['fell_through']}, "
+          f"local time {metrics['seconds'] / metrics['messages'] * 1000:.3f}ms per message")
+    print(f"  by command: {metrics['by_command']}")
+    print(f"function-calling loop: {tool_dispatcher.metrics()['turns']} turns over both replays")
+
+def faq_workload(rng, requests, questions=200):
+    """Zipf-distributed FAQ questions with varying case, spacing and punctuation"""
+    weights = [1 / rank for rank in range(1, questions + 1)]
+    variants = [lambda q: q, str.lower, str.upper, lambda q: q + "?", lambda q: "  " + q + "!  "]
+    picks = rng.choices(range(questions), weights, k=requests)
+    return [rng.choice(variants)(f"What is fact number {n} about the solar system") for n in picks]
+
+async def bench_cache(args):
+    """Replay a repetitive FAQ workload through general chat with and without the response cache"""
+    from app.gemini import FakeGenerativeModel, model_registry, process_general_chat, response_cache
+    
+    model = FakeGenerativeModel(lambda contents: f"Answer to: {contents[-1]['parts'][0].strip()}", delay=args.delay)
+    model_registry.set_factory(lambda name, generation_config: model)
+    workload = faq_workload(random.Random(42), args.requests)
+    
+    async def replay(label):
+        model.calls = 0
+        response_cache.reset_metrics()
+        samples = []
+        for message in workload:
+            start = time.perf_counter()
+            await process_general_chat(message)
+            samples.append(time.perf_counter() - start)
+        metrics = response_cache.metrics()
+        print(f"{label}: {model.calls} model calls for {len(workload)} messages, "
+              f"hit rate {metrics['hit_rate']:.1%} ({metrics['hits']} memory, {metrics['db_hits']} SQLite), "
+              f"{metrics['entries']} entries / {metrics['bytes']} bytes in memory")
+        report("per message", samples)
+    
+    response_cache.enabled = False
+    await replay("no cache")
+    
+    response_cache.enabled = True
+    await replay("memory cache")
+    
+    response_cache.clear()
+    response_cache.max_entries = 50
+    await replay("memory cache, 50 entries")
+    
+    response_cache.clear()
+    response_cache.max_entries = 1000
+    response_cache.db_file = "response-cache.db"
+    await replay("memory + SQLite, cold")
+    
+    # A restart empties memory; the SQLite tier still has every reply
+    response_cache.clear()
+    await replay("memory + SQLite, after restart")
+    model_registry.set_factory(None)
+
+async def bench_semantic(args):
+    """Semantic cache on a paraphrase corpus: hit rate and false hits per threshold, and lookup latency"""
+    from app.gemini import HashingEmbedder, SemanticCache
+    
+    corpus = load_fixtures("paraphrases.jsonl")
+    embedder = HashingEmbedder()
+    
+    # Ask every question once in a random order; answers are the question's group
+    print(f"{len(corpus)} questions in {len({entry['group'] for entry in corpus})} groups (hashing embedder):")
+    for threshold in (0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9):
+        cache = SemanticCache(enabled=True, embedder=embedder, threshold=threshold)
+        order = corpus[:]
+        random.Random(42).shuffle(order)
+        seen, repeats, hits, false_hits = set(), 0, 0, 0
+        for entry in order:
+            answer, vector = await cache.lookup(entry["question"], "bench")
+            repeats += entry["group"] in seen
+            if answer is None:
+                cache.store(vector, entry["group"], "bench")
+                seen.add(entry["group"])
+            elif answer == entry["group"]:
+                hits += 1
+            else:
+                false_hits += 1
+        print(f"  threshold {threshold:.2f}: {hits}/{repeats} reworded repeats answered from cache ({hits / repeats:.1%}), "
+              f"{false_hits} wrong answers")
+    
+    # Lookup cost as the index grows, against a pure Python cosine loop
+    rng = random.Random(42)
+    words = [entry["question"] for entry in corpus]
+    for size in (1_000, 10_000):
+        cache = SemanticCache(enabled=True, embedder=embedder, max_entries=size)
+        vectors = []
+        for n in range(size):
+            question = f"{rng.choice(words)} {n}"
+            _, vector = await cache.lookup(question, "bench")
+            cache.store(vector, question, "bench")
+            vectors.append(vector.tolist())
+        
+        queries = [rng.choice(words) for _ in range(max(1, args.iterations // 5))]
+        samples = await timed(lambda: cache.lookup(rng.choice(queries), "bench"), len(queries))
+        print(f"index of {size} questions:")
+        report("embed + NumPy search", samples)
+        
+        python_samples = []
+        for question in queries[:50]:
+            _, query = await cache.lookup(question, "bench")
+            query = query.tolist()
+            start = time.perf_counter()
+            max(sum(a * b for a, b in zip(row, query)) for row in vectors)
+            python_samples.append(time.perf_counter() - start)
+        report("pure Python cosine loop (search only)", python_samples)
+        metrics = cache.metrics()
+        print(f"  embed {metrics['embed_seconds'] / (metrics['hits'] + metrics['misses']) * 1000:.3f}ms, "
+              f"search {metrics['search_seconds'] / (metrics['hits'] + metrics['misses']) * 1000:.3f}ms per lookup")
+
+async def bench_coalesce(args):
+    """Concurrent identical general chat questions with and without request coalescing"""
+    from app.gemini import FakeGenerativeModel, generate_content, get_gemini_metrics, model_registry, process_general_chat, response_cache, single_flight
+    
+    model = FakeGenerativeModel(lambda contents: f"Answer to: {contents[-1]['parts'][0].strip()}", delay=args.delay)
+    model_registry.set_factory(lambda name, generation_config: model)
+    rng = random.Random(42)
+    # A burst of users asking the same question, and a mix of a few popular questions
+    workloads = [
+        ("burst", ["What's the capital of France?"] * args.requests),
+        ("mixed", [f"Tell me a fun fact about topic {rng.randrange(10)}" for _ in range(args.requests)]),
+    ]
+    
+    # Concurrent misses all reach Gemini even with the response cache on; coalescing is what merges them
+    response_cache.enabled = True
+    for label, messages in workloads:
+        for coalesce in (False, True):
+            response_cache.clear()
+            single_flight.enabled = coalesce
+            single_flight.reset_metrics()
+            model.calls = 0
+            start = time.perf_counter()
+            replies = await asyncio.gather(*(process_general_chat(message) for message in messages))
+            elapsed = time.perf_counter() - start
+            metrics = single_flight.metrics()
+            print(f"{label}, coalescing {'on' if coalesce else 'off'}: {len(messages)} chats "
+                  f"({len(set(messages))} distinct) in {elapsed:.3f}s, {model.calls} model calls, "
+                  f"{metrics['coalesced']} coalesced, max {metrics['max_waiters']} callers on one call")
+            if any(reply != f"Answer to: {message}" for reply, message in zip(replies, messages)):
+                sys.exit(f"{label}: a caller got another question's reply")
+    response_cache.enabled = False
+    single_flight.enabled = True
+    
+    # Every waiter gets the shared call's exception, and cancelling one caller leaves the call running
+    messages = [{"role": "user", "parts": ["Will this fail?"]}]
+    failing = FakeGenerativeModel(RuntimeError("upstream failed"), delay=args.delay)
+    results = await asyncio.gather(*(generate_content(failing, messages) for _ in range(10)), return_exceptions=True)
+    if failing.calls != 1 or not all(isinstance(result, RuntimeError) for result in results):
+        sys.exit(f"an upstream failure reached {sum(isinstance(result, RuntimeError) for result in results)}/10 callers "
+                 f"after {failing.calls} calls")
+    
+    model.calls = 0
+    callers = [asyncio.ensure_future(generate_content(model, messages)) for _ in range(10)]
+    await asyncio.sleep(args.delay / 2)
+    callers[0].cancel()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    if model.calls != 1 or not all(result.text == "Answer to: Will this fail?" for result in results[1:]):
+        sys.exit("cancelling the first caller broke the shared call")
+    
+    # A call nobody waits for any more is cancelled, freeing its GEMINI_MAX_IN_FLIGHT slot
+    caller = asyncio.ensure_future(generate_content(model, messages))
+    await asyncio.sleep(args.delay / 2)
+    caller.cancel()
+    await asyncio.gather(caller, return_exceptions=True)
+    await asyncio.sleep(0)
+    if single_flight.metrics()["abandoned"] != 1 or get_gemini_metrics()["in_flight"] != 0:
+        sys.exit("a call left without callers kept running")
+    print("errors reach all 10 waiters with 1 upstream call; cancelling the first caller leaves 9 answered; "
+          "a call with no callers left is cancelled")
+    print(f"  in-flight keys left: {single_flight.metrics()['in_flight_keys']}")
+    model_registry.set_factory(None)
+
+BENCHMARKS = {
+    "pool": bench_pool,
+    "concurrency": bench_concurrency,
+    "gemini": bench_gemini,
+    "models": bench_models,
+    "conversation": bench_conversation,
+    "context": bench_context,
+    "streaming": bench_streaming,
+    "tools": bench_tools,
+    "retry": bench_retry,
+    "indexes": bench_indexes,
+    "plans": bench_plans,
+    "migrate": bench_migrate,
+    "startup": bench_startup,
+    "pragmas": bench_pragmas,
+    "layout": bench_layout,
+    "backends": bench_backends,
+    "users": bench_users,
+    "pagination": bench_pagination,
+    "render": bench_render,
+    "serialize": bench_serialize,
+    "tags": bench_tags,
+    "intents": bench_intents,
+    "commands": bench_commands,
+    "cache": bench_cache,
+    "semantic": bench_semantic,
+    "coalesce": bench_coalesce,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic reminders table")
+    parser.add_argument("--target-ms", type=float, default=300, help="Cold import budget per package")
+    parser.add_argument("--delay", type=float, default=0.2, help="Fake model latency in seconds")
+    args = parser.parse_args()
+    
+    setup_workdir()
+    asyncio.run(BENCHMARKS[args.benchmark](args))
+
+if __name__ == "__main__":
+    main()
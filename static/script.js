@@ -74,11 +74,11 @@ async function sendMessage() {
     inputField.value = "";
     
     // Show loading indicator
-    const loadingId = addMessage("Assistant", "Thinking...");
+    const replyDiv = addMessage("Assistant", "Thinking...");
     
     try {
-        // Send message to backend
-        const response = await fetch("/api/chat", {
+        // Send message to backend and render the reply as it streams in
+        const response = await fetch("/api/chat/stream", {
             method: "POST",
             headers: {
                 "Content-Type": "application/json"
@@ -89,30 +89,21 @@ async function sendMessage() {
             })
         });
         
-        if (!response.ok) {
+        if (!response.ok || !response.body) {
             throw new Error("Network response was not ok");
         }
         
-        const data = await response.json();
-        
-        // Update conversation ID if provided
-        if (data.conversation_id) {
-            currentConversationId = data.conversation_id;
-            
-            // Update UI to show we're in a conversation
-            updateConversationUI();
-        }
+        const reply = await readChatStream(response, replyDiv);
         
-        // Remove "Thinking..." message and show AI response
-        removeLastMessage();
-        addMessage("Assistant", data.reply);
+        // Update UI to show we're in a conversation
+        updateConversationUI();
         
         // Check if the message was about reminders and reload reminders
         if (userMessage.toLowerCase().includes("remind") || 
             userMessage.toLowerCase().includes("reminder") ||
-            data.reply.includes("Reminder added") ||
-            data.reply.includes("reminder") ||
-            data.reply.includes("✅")) {
+            reply.includes("Reminder added") ||
+            reply.includes("reminder") ||
+            reply.includes("✅")) {
             
             // Reload reminders and upcoming reminders
             if (typeof loadReminders === 'function') {
@@ -130,6 +121,56 @@ async function sendMessage() {
     }
 }
 
+// Read Server-Sent Events from /api/chat/stream, updating the reply as text arrives
+async function readChatStream(response, replyDiv) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const chatbox = document.getElementById("chatbox");
+    let buffer = "";
+    let reply = "";
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let eventName = "message";
+            let data = "";
+            rawEvent.split("\n").forEach(line => {
+                if (line.startsWith("event:")) {
+                    eventName = line.slice(6).trim();
+                } else if (line.startsWith("data:")) {
+                    data += line.slice(5).trim();
+                }
+            });
+            
+            const payload = data ? JSON.parse(data) : {};
+            
+            if (eventName === "meta") {
+                currentConversationId = payload.conversation_id;
+            } else if (eventName === "error") {
+                throw new Error(payload.detail);
+            } else if (eventName === "done") {
+                reply = payload.reply;
+            } else if (payload.delta) {
+                reply += payload.delta;
+            }
+            
+            replyDiv.innerHTML = `<strong>Assistant:</strong> ${reply || "Thinking..."}`;
+            chatbox.scrollTop = chatbox.scrollHeight;
+        }
+    }
+    
+    return reply;
+}
+
 // Update UI to show we're in a conversation
 function updateConversationUI() {
     // Add active conversation indicator if needed
@@ -175,8 +216,36 @@ function showReminders() {
 
 // Add the missing functions
 
-// Function to load all reminders
+// Reminder list paging state
+const REMINDERS_PAGE_SIZE = 50;
+let remindersCursor = null;
+let remindersLoading = false;
+let remindersGeneration = 0;
+let remindersObserver = null;
+
+// Function to load the first page of reminders; later pages load as the list is scrolled
 async function loadReminders() {
+    const remindersList = document.getElementById("reminders-list");
+    
+    // Start over and ignore pages still in flight for the old filters
+    remindersGeneration++;
+    remindersCursor = null;
+    remindersLoading = false;
+    reminders = [];
+    if (remindersList) {
+        remindersList.innerHTML = "";
+    }
+    
+    await loadMoreReminders(true);
+}
+
+// Function to load the next page of reminders
+async function loadMoreReminders(firstPage = false) {
+    if (remindersLoading || (!firstPage && !remindersCursor)) return;
+    
+    const generation = remindersGeneration;
+    remindersLoading = true;
+    
     try {
         // Get filter values if elements exist
         let dateFilter = "";
@@ -196,6 +265,11 @@ async function loadReminders() {
             queryParams.append("date", dateFilter);
         }
         queryParams.append("completed", showCompleted);
+        queryParams.append("limit", REMINDERS_PAGE_SIZE);
+        queryParams.append("fields", "id,message,date,priority,completed");
+        if (remindersCursor) {
+            queryParams.append("cursor", remindersCursor);
+        }
         
         // Fetch reminders from the API
         const response = await fetch(`/api/reminders?${queryParams.toString()}`);
@@ -205,21 +279,22 @@ async function loadReminders() {
         }
         
         const data = await response.json();
-        reminders = data.reminders || [];
+        if (generation !== remindersGeneration) return;
+        
+        const page = data.reminders || [];
+        reminders = reminders.concat(page);
+        remindersCursor = data.next_cursor || null;
         
         // Update the UI if the reminders list element exists
         const remindersList = document.getElementById("reminders-list");
         if (remindersList) {
-            // Clear current list
-            remindersList.innerHTML = "";
-            
             if (reminders.length === 0) {
                 remindersList.innerHTML = "<p class='no-reminders'>No reminders found</p>";
                 return;
             }
             
-            // Add each reminder to the list
-            reminders.forEach(reminder => {
+            // Add each reminder on the page to the list
+            page.forEach(reminder => {
                 const reminderElement = document.createElement("div");
                 reminderElement.className = "reminder-item";
                 
@@ -251,10 +326,52 @@ async function loadReminders() {
                 
                 remindersList.appendChild(reminderElement);
             });
+            
+            // Load the next page when the end of the list scrolls into view
+            observeRemindersEnd(remindersList);
         }
     } catch (error) {
         console.error("Error loading reminders:", error);
+    } finally {
+        if (generation === remindersGeneration) {
+            remindersLoading = false;
+        }
+    }
+}
+
+// Keep a sentinel after the last reminder and load more when it becomes visible
+function observeRemindersEnd(remindersList) {
+    let sentinel = document.getElementById("reminders-end");
+    if (!sentinel) {
+        sentinel = document.createElement("div");
+        sentinel.id = "reminders-end";
+    }
+    remindersList.appendChild(sentinel);
+    
+    if (!remindersCursor) {
+        if (remindersObserver) remindersObserver.disconnect();
+        return;
+    }
+    
+    if (!("IntersectionObserver" in window)) {
+        // Older browsers get the next page when the list is scrolled near the bottom
+        remindersList.onscroll = () => {
+            if (remindersList.scrollTop + remindersList.clientHeight >= remindersList.scrollHeight - 100) {
+                loadMoreReminders();
+            }
+        };
+        return;
+    }
+    
+    if (!remindersObserver) {
+        remindersObserver = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadMoreReminders();
+            }
+        }, { root: remindersList, rootMargin: "200px" });
     }
+    remindersObserver.disconnect();
+    remindersObserver.observe(sentinel);
 }
 
 // Function to load upcoming reminders
@@ -263,7 +380,7 @@ async function loadUpcomingReminders() {
         const upcomingList = document.getElementById("upcoming-list");
         if (!upcomingList) return;
         
-        const response = await fetch("/api/reminders/upcoming");
+        const response = await fetch("/api/reminders/upcoming?summary=false");
         
         if (!response.ok) {
             throw new Error("Failed to load upcoming reminders");
@@ -2,6 +2,7 @@ import asyncio
 import json
 from app.gemini.client import process_with_gemini
 from app.gemini.tools import create_gemini_tools
+from app.database import init_db
 import logging
 
 # Configure logging
@@ -24,4 +25,5 @@ async def test_reminder():
     logger.info(f"Response: {response}")
 
 if __name__ == "__main__":
+    init_db()
     asyncio.run(test_reminder()) 
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pytest
+
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request, tmp_path, monkeypatch):
+    """A fresh storage backend; SQLite files live in a temporary directory"""
+    from app.database import close_all_pools, configure_storage, init_db
+    
+    monkeypatch.chdir(tmp_path)
+    backend = configure_storage(request.param)
+    if request.param == "sqlite":
+        init_db()
+    yield backend
+    close_all_pools()
+    configure_storage("sqlite")
+
+@pytest.fixture
+def fake_model():
+    """Serve every model profile from one fake model"""
+    from app.gemini import FakeGenerativeModel, model_registry
+    
+    model = FakeGenerativeModel()
+    model_registry.set_factory(lambda name, generation_config: model)
+    yield model
+    model_registry.set_factory(None)
@@ -0,0 +1,50 @@
+import pytest
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+
+from app import config
+from app.api.auth import current_user, header_user, load_user_dependency
+from app.api.routes import router
+
+TOKENS = {"secret-alice": "alice", "secret-bob": "bob"}
+
+def bearer_user(authorization: str = Header(None)) -> str:
+    """A replacement dependency that authenticates a bearer token"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme != "Bearer" or token not in TOKENS:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return TOKENS[token]
+
+@pytest.fixture
+def app(storage):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return app
+
+def test_the_header_names_the_user(app):
+    with TestClient(app) as client:
+        client.post("/api/reminder", json={"message": "Call Sam", "date": "2030-01-01"}, headers={"X-User-ID": "alice"})
+        
+        assert client.get("/api/reminders", headers={"X-User-ID": "alice"}).json()["reminders"][0]["message"] == "Call Sam"
+        assert client.get("/api/reminders").json()["reminders"] == []
+        assert client.get("/api/reminders", headers={"X-User-ID": "alice bob"}).status_code == 400
+
+def test_the_user_dependency_can_be_replaced(app):
+    app.dependency_overrides[current_user] = bearer_user
+    with TestClient(app) as client:
+        alice = {"Authorization": "Bearer secret-alice"}
+        client.post("/api/reminder", json={"message": "Call Sam", "date": "2030-01-01"}, headers=alice)
+        
+        # The unauthenticated header no longer picks the user
+        assert client.get("/api/reminders", headers={"X-User-ID": "alice"}).status_code == 401
+        assert client.get("/api/reminders", headers=alice).json()["reminders"][0]["message"] == "Call Sam"
+        assert client.get("/api/reminders", headers={"Authorization": "Bearer secret-bob"}).json()["reminders"] == []
+
+def test_auth_dependency_paths_are_resolved():
+    assert load_user_dependency(None) is header_user
+    assert load_user_dependency("app.api.auth:header_user") is header_user
+    with pytest.raises(ValueError):
+        load_user_dependency("app.api.auth.header_user")
+
+def test_requests_without_a_header_act_for_the_default_user():
+    assert header_user(None) == config.DEFAULT_USER_ID
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.gemini import cache as cache_module
+from app.gemini.cache import ResponseCache, normalize_prompt
+
+SETTINGS = {"model": "gemini-pro", "temperature": 0.7}
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable replacement for time.time in the cache module"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+def test_prompts_differing_in_case_and_punctuation_share_a_key():
+    cache = ResponseCache(enabled=True, db_file=None)
+    assert normalize_prompt("  What's   the TIME?! ") == "what's the time"
+    assert cache.key("Hello there!", "System", SETTINGS) == cache.key("hello  there", "System", SETTINGS)
+    assert cache.key("Hello", "System", SETTINGS) != cache.key("Hello", "Other system", SETTINGS)
+    assert cache.key("Hello", "System", SETTINGS) != cache.key("Hello", "System", dict(SETTINGS, temperature=0.2))
+
+def test_long_histories_and_disabled_caches_are_not_keyed():
+    history = [{"role": "user", "content": "Hi"}] * 3
+    assert ResponseCache(enabled=True, max_history=2, db_file=None).key("Hello", "System", SETTINGS, history) is None
+    assert ResponseCache(enabled=False, db_file=None).key("Hello", "System", SETTINGS) is None
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(enabled=True, ttl=60, db_file=None)
+    
+    async def scenario():
+        await cache.set("key", "reply")
+        clock[0] += 59
+        hit = await cache.get("key")
+        clock[0] += 2
+        return hit, await cache.get("key")
+    
+    assert asyncio.run(scenario()) == ("reply", None)
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["expirations"], metrics["entries"]) == (1, 1, 0)
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(enabled=True, max_entries=2, db_file=None)
+    
+    async def scenario():
+        await cache.set("a", "reply a")
+        await cache.set("b", "reply b")
+        await cache.get("a")
+        await cache.set("c", "reply c")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+    
+    assert asyncio.run(scenario()) == ["reply a", None, "reply c"]
+    assert cache.metrics()["evictions"] == 1
+
+def test_byte_limit_evicts_and_skips_oversized_replies(clock):
+    cache = ResponseCache(enabled=True, max_entries=10, max_bytes=10, db_file=None)
+    
+    async def scenario():
+        await cache.set("a", "123456")
+        await cache.set("b", "123456")
+        await cache.set("huge", "x" * 11)
+        return [await cache.get(key) for key in ("a", "b", "huge")]
+    
+    assert asyncio.run(scenario()) == [None, "123456", None]
+    assert cache.metrics()["bytes"] == 6
+
+def test_persistent_tier_survives_a_new_cache(clock, tmp_path):
+    db_file = str(tmp_path / "cache.db")
+    
+    async def scenario():
+        await ResponseCache(enabled=True, ttl=60, db_file=db_file).set("key", "reply")
+        restarted = ResponseCache(enabled=True, ttl=60, db_file=db_file)
+        hit = await restarted.get("key")
+        clock[0] += 61
+        restarted.clear()
+        return hit, await restarted.get("key"), restarted.metrics()["db_hits"]
+    
+    assert asyncio.run(scenario()) == ("reply", None, 1)
@@ -0,0 +1,41 @@
+import pytest
+
+from app.utils import parse_command
+from app.utils.command_parser import normalize_command
+
+@pytest.mark.parametrize("message, command", [
+    ("Remind me to call mom tomorrow", ("add_reminder", {"message": "call mom", "date": "tomorrow"})),
+    ("Please remind me to Call Mom on May 31st, thanks!", ("add_reminder", {"message": "Call Mom", "date": "may 31st"})),
+    ("add a reminder: renew passport 2025-07-01", ("add_reminder", {"message": "renew passport", "date": "2025-07-01"})),
+    ("Remind me to call 5 people tomorrow", ("add_reminder", {"message": "call 5 people", "date": "tomorrow"})),
+    ("Mark reminder #3 as done", ("complete_reminder", {"reminder_id": 3})),
+    ("Delete task no. 12", ("delete_reminder", {"reminder_id": 12})),
+    ("show me my completed reminders for june 30", ("get_reminders", {"completed": True, "date": "june 30"})),
+    ("What's coming up?", ("get_upcoming_reminders", {})),
+])
+def test_commands_are_recognized(message, command):
+    assert parse_command(message) == command
+
+@pytest.mark.parametrize("message", [
+    # Times and trailing at/by clauses are details the fast path would drop
+    "Remind me to call mom at 5pm tomorrow",
+    "Remind me to take pills at 8:30 tomorrow",
+    "Remind me to water the plants in the morning tomorrow",
+    "Remind me to send the report by friday tomorrow",
+    "Remind me to meet Sam at the park tomorrow",
+    "Remind me to call mom tomorrow at 5pm",
+    # Dates that are not calendar days
+    "Remind me to pay rent may 99",
+    "Remind me to pay rent on february 30",
+    "Remind me to pay rent 31st of april",
+    "show my reminders for 2025-13-01",
+    # Not commands at all
+    "Remind me why the sky is blue",
+    "delete my account",
+    "",
+])
+def test_other_messages_are_left_to_gemini(message):
+    assert parse_command(message) is None
+
+def test_normalize_command_strips_courtesy_words():
+    assert normalize_command("  Could you please   SHOW my reminders?? Thanks!") == "show my reminders"
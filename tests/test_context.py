@@ -0,0 +1,45 @@
+import asyncio
+
+from app.gemini import ContextBuilder
+from app.services import get_conversation_history, get_conversation_summary, save_conversation
+
+def build(builder, history, conversation_id):
+    return asyncio.run(builder.build("System prompt.", "Understood.", "Next question?", history, conversation_id))
+
+def test_messages_that_leave_the_history_window_are_summarized(storage):
+    async def save_turns(first, last):
+        for n in range(first, last + 1):
+            await save_conversation("long", f"Question {n}. Details.", f"Answer {n}. Details.")
+    
+    builder = ContextBuilder(token_budget=100_000)
+    asyncio.run(save_turns(1, 60))
+    # The budget holds every loaded message, but only the latest 100 of 120 are loaded
+    history = asyncio.run(get_conversation_history("long", limit=100))
+    assert history[0]["seq"] == 21
+    
+    messages = build(builder, history, "long")
+    prompt = messages[0]["parts"][0]
+    assert "- User: Question 1." in prompt
+    assert "- Assistant: Answer 10." in prompt
+    # Messages still in the history are sent verbatim, not summarized
+    assert "- User: Question 11." not in prompt
+    assert messages[2]["parts"][0] == "Question 11. Details."
+    assert asyncio.run(get_conversation_summary("long"))["through_seq"] == 20
+    assert builder.metrics()["messages_outside_history"] == 20
+    
+    # Only the turn that left the window since the last summary is read back
+    asyncio.run(save_turns(61, 61))
+    history = asyncio.run(get_conversation_history("long", limit=100))
+    prompt = build(builder, history, "long")[0]["parts"][0]
+    assert "- User: Question 11." in prompt
+    assert asyncio.run(get_conversation_summary("long"))["through_seq"] == 22
+    assert builder.metrics()["messages_outside_history"] == 22
+
+def test_short_conversations_need_no_summary(storage):
+    asyncio.run(save_conversation("short", "Hello.", "Hi there."))
+    history = asyncio.run(get_conversation_history("short", limit=100))
+    
+    messages = build(ContextBuilder(token_budget=100_000), history, "short")
+    assert "Summary" not in messages[0]["parts"][0]
+    assert [msg["parts"][0] for msg in messages[2:]] == ["Hello.", "Hi there.", "Next question?"]
+    assert asyncio.run(get_conversation_summary("short")) is None
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import config
+from app.api.routes import router
+from app.database import get_storage
+from app.services import get_conversation_history, get_conversation_owner, get_conversation_summary, save_conversation, save_conversation_summary
+
+@pytest.fixture
+def client(storage, fake_model):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    with TestClient(app) as client:
+        yield client
+
+def test_conversations_are_scoped_to_their_owner(storage):
+    async def scenario():
+        await save_conversation("alice-chat", "Hello", "Hi Alice", user_id="alice")
+        await save_conversation_summary("alice-chat", "- User: Hello", 2, user_id="alice")
+        # Bob can neither read nor extend Alice's conversation, nor overwrite her summary
+        await save_conversation("alice-chat", "I am Alice now", "Sure", user_id="bob")
+        await save_conversation_summary("alice-chat", "- User: stolen", 4, user_id="bob")
+        repository = get_storage().conversations
+        return (
+            await get_conversation_owner("alice-chat"),
+            await get_conversation_history("alice-chat", user_id="alice"),
+            await get_conversation_history("alice-chat", user_id="bob"),
+            await repository.select_message_range("bob", "alice-chat", 0, 10),
+            await get_conversation_summary("alice-chat", user_id="alice"),
+            await get_conversation_summary("alice-chat", user_id="bob"),
+        )
+    
+    owner, alice_history, bob_history, bob_range, alice_summary, bob_summary = asyncio.run(scenario())
+    assert owner == "alice"
+    assert [msg["content"] for msg in alice_history] == ["Hello", "Hi Alice"]
+    assert bob_history == [] and bob_range == []
+    assert alice_summary == {"summary": "- User: Hello", "through_seq": 2}
+    assert bob_summary is None
+
+def test_conversations_without_a_user_belong_to_the_default_user(storage):
+    asyncio.run(save_conversation("anonymous", "Hello", "Hi"))
+    assert asyncio.run(get_conversation_owner("anonymous")) == config.DEFAULT_USER_ID
+    assert asyncio.run(get_conversation_owner("missing")) is None
+
+def test_another_users_conversation_is_not_found(client, fake_model):
+    fake_model.reply = "Hi Alice"
+    alice = {"X-User-ID": "alice"}
+    bob = {"X-User-ID": "bob"}
+    
+    response = client.post("/api/chat", json={"message": "Tell me a joke", "conversation_id": "alice-chat"}, headers=alice)
+    assert response.status_code == 200
+    assert client.get("/api/conversations/alice-chat", headers=alice).json()["messages"][0]["content"] == "Tell me a joke"
+    
+    assert client.get("/api/conversations/alice-chat", headers=bob).status_code == 404
+    assert client.post("/api/chat", json={"message": "Tell me a joke", "conversation_id": "alice-chat"}, headers=bob).status_code == 404
+    assert client.post("/api/chat/stream", json={"message": "Tell me a joke", "conversation_id": "alice-chat"}, headers=bob).status_code == 404
+    assert len(client.get("/api/conversations/alice-chat", headers=alice).json()["messages"]) == 2
+    
+    # Unknown IDs start a new conversation for the caller
+    assert client.get("/api/conversations/new-chat", headers=bob).json()["messages"] == []
+    response = client.post("/api/chat/stream", json={"message": "Tell me a joke", "conversation_id": "new-chat"}, headers=bob)
+    assert "event: done" in response.text
+    assert asyncio.run(get_conversation_owner("new-chat")) == "bob"
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.gemini.dispatcher import ToolArgumentError, ToolDispatcher, ToolRegistry, to_python
+
+@pytest.fixture
+def registry():
+    """A registry whose handlers return the arguments they were called with"""
+    registry = ToolRegistry()
+    
+    async def echo(**kwargs):
+        return {"success": True, "args": kwargs}
+    
+    for schema in registry.schemas:
+        registry.register(schema["name"], echo)
+    return registry
+
+@pytest.mark.parametrize("value, expected", [(3, 3), (3.0, 3), ("3", 3), (" #12 ", 12)])
+def test_integer_arguments_are_coerced(registry, value, expected):
+    assert registry.validate("complete_reminder", {"reminder_id": value}) == {"reminder_id": expected}
+
+@pytest.mark.parametrize("value", [3.5, True, "three", None, ""])
+def test_invalid_integers_are_rejected(registry, value):
+    with pytest.raises(ToolArgumentError):
+        registry.validate("delete_reminder", {"reminder_id": value})
+
+def test_strings_become_lists_and_booleans_are_parsed(registry):
+    args = registry.validate("add_reminder", {"message": "Call Sam", "date": "tomorrow", "tags": "work"})
+    assert args == {"message": "Call Sam", "date": "tomorrow", "tags": ["work"]}
+    assert registry.validate("get_reminders", {"completed": "True"}) == {"completed": True}
+
+def test_unknown_and_null_arguments_are_dropped(registry):
+    args = registry.validate("get_reminders", {"date": "today", "tag": None, "user_id": "mallory"})
+    assert args == {"date": "today"}
+
+@pytest.mark.parametrize("args", [
+    {"message": "Call Sam"},
+    {"message": "Call Sam", "date": "tomorrow", "priority": "urgent"},
+    {"message": "Call Sam", "date": "tomorrow", "tags": ["work", 3]},
+    {"message": 42, "date": "tomorrow"},
+])
+def test_schema_violations_are_rejected(registry, args):
+    with pytest.raises(ToolArgumentError):
+        registry.validate("add_reminder", args)
+
+def test_call_reports_invalid_arguments_and_passes_context(registry):
+    failed = asyncio.run(registry.call("complete_reminder", {"reminder_id": "abc"}, user_id="alice"))
+    assert failed["success"] is False
+    assert "must be an integer" in failed["message"]
+    
+    # The model cannot override trusted context
+    result = asyncio.run(registry.call("complete_reminder", {"reminder_id": 4.0, "user_id": "mallory"}, user_id="alice"))
+    assert result["args"] == {"reminder_id": 4, "user_id": "alice"}
+    
+    unknown = asyncio.run(registry.call("drop_tables", {}))
+    assert unknown["success"] is False
+
+def test_sdk_containers_become_plain_values():
+    class Repeated:
+        def __init__(self, items):
+            self.items = items
+        
+        def __iter__(self):
+            return iter(self.items)
+    
+    assert to_python({"tags": Repeated(["a", "b"]), "nested": {"n": 1}}) == {"tags": ["a", "b"], "nested": {"n": 1}}
+
+def test_step_limit_returns_the_last_results(registry):
+    async def call_model(model, messages, schemas):
+        return [("complete_reminder", {"reminder_id": "abc"})], None
+    
+    dispatcher = ToolDispatcher(registry, call_model, max_steps=2)
+    reply = asyncio.run(dispatcher.run(None, []))
+    assert "must be an integer" in reply
+    assert dispatcher.metrics()["model_calls"] == 2
+    assert dispatcher.metrics()["step_limit_hits"] == 1
+
+def test_max_steps_must_allow_a_model_call(registry):
+    async def call_model(model, messages, schemas):
+        return [], "unused"
+    
+    with pytest.raises(ValueError):
+        ToolDispatcher(registry, call_model, max_steps=0)
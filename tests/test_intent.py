@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.gemini import GENERAL, REMINDER, IntentRouter
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "intents.jsonl")
+
+with open(FIXTURES) as f:
+    LABELS = {fixture["message"]: fixture["intent"] for fixture in map(json.loads, f) if fixture}
+
+def route_all(router, messages):
+    async def run():
+        return [await router.route(message) for message in messages]
+    return asyncio.run(run())
+
+@pytest.fixture
+def labelled_model(fake_model):
+    """A fake model that classifies every fixture phrase correctly, recording what it was asked"""
+    asked = []
+    
+    def classify(contents):
+        message = contents.rsplit("Message: ", 1)[1]
+        asked.append(message)
+        return LABELS[message]
+    
+    fake_model.reply = classify
+    fake_model.asked = asked
+    return fake_model
+
+def test_fixture_phrases_are_routed(labelled_model):
+    router = IntentRouter(llm_fallback=True)
+    routed = dict(zip(LABELS, route_all(router, LABELS)))
+    
+    wrong = {message: intent for message, intent in routed.items() if intent != LABELS[message]}
+    # The local model is confidently wrong about a couple of general questions, never about a reminder
+    assert len(wrong) <= 2
+    assert all(LABELS[message] == GENERAL for message in wrong)
+
+def test_only_ambiguous_phrases_reach_the_llm(labelled_model):
+    router = IntentRouter(llm_fallback=True)
+    route_all(router, LABELS)
+    
+    ambiguous = [message for message in LABELS if router.classify_local(message) == (None, None)]
+    assert labelled_model.asked == ambiguous
+    assert 0 < len(ambiguous) < len(LABELS) * 0.2
+    
+    keywords, model = router.stages
+    for message in ambiguous:
+        assert keywords.classify(message) is None
+        assert 1 - model.threshold < model.probability(message) < model.threshold
+    
+    metrics = router.metrics()
+    assert metrics["llm"] == len(ambiguous)
+    assert metrics["by_stage"]["keywords"] + metrics["by_stage"]["model"] + metrics["llm"] == len(LABELS)
+
+@pytest.mark.parametrize("message, intent", [
+    ("Remind me to call the dentist on Monday", REMINDER),
+    ("delete reminder 3", REMINDER),
+    ("hello there!", GENERAL),
+])
+def test_keyword_phrases_never_reach_the_llm(labelled_model, message, intent):
+    router = IntentRouter(llm_fallback=True)
+    assert route_all(router, [message]) == [intent]
+    assert router.classify_local(message) == (intent, "keywords")
+    assert labelled_model.calls == 0
+
+def test_ambiguous_phrases_use_the_local_guess_without_the_llm(fake_model):
+    router = IntentRouter(llm_fallback=False)
+    ambiguous = [message for message in LABELS if router.classify_local(message) == (None, None)]
+    
+    assert route_all(router, ambiguous) == [router.best_guess(message) for message in ambiguous]
+    assert fake_model.calls == 0
+    assert router.metrics()["guessed"] == len(ambiguous)
+
+def test_a_failed_llm_call_falls_back_to_the_local_guess(fake_model):
+    fake_model.reply = RuntimeError("upstream failed")
+    router = IntentRouter(llm_fallback=True)
+    message = next(message for message in LABELS if router.classify_local(message) == (None, None))
+    
+    assert route_all(router, [message]) == [router.best_guess(message)]
+    assert router.metrics()["llm_failures"] == 1
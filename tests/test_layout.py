@@ -0,0 +1,89 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import close_all_pools, configure_storage, db_connection, get_storage, init_db, migrate
+from app.database.backends import SQLiteBackend
+from app.database.merge import merge_databases
+from app.services import add_reminder, get_conversation_history, get_reminders, save_conversation
+
+SINGLE_FILE = "app.db"
+
+@pytest.fixture
+def single_file(tmp_path, monkeypatch):
+    """A SQLite backend keeping reminders and conversations in one file"""
+    monkeypatch.chdir(tmp_path)
+    for database in ("reminders", "conversations"):
+        migrate(database, SINGLE_FILE)
+    yield configure_storage(SQLiteBackend(SINGLE_FILE, SINGLE_FILE))
+    close_all_pools()
+    configure_storage("sqlite")
+
+def test_both_schemas_share_one_file(single_file):
+    async def turn():
+        await add_reminder("Call Sam", "2030-01-01", user_id="alice")
+        await save_conversation("chat", "Remind me to call Sam", "Done.", user_id="alice")
+        return await get_reminders(user_id="alice"), await get_conversation_history("chat", user_id="alice")
+    
+    reminders, history = asyncio.run(turn())
+    assert [reminder["message"] for reminder in reminders["reminders"]] == ["Call Sam"]
+    assert [msg["role"] for msg in history] == ["user", "assistant"]
+    
+    with db_connection(SINGLE_FILE) as conn:
+        versions = dict(conn.execute("SELECT component, MAX(version) FROM schema_version GROUP BY component").fetchall())
+    assert set(versions) == {"reminders", "conversations"}
+
+def test_a_message_pair_is_appended_all_or_nothing(single_file):
+    with db_connection(SINGLE_FILE) as conn:
+        conn.execute(
+            "CREATE TRIGGER fail_reply BEFORE INSERT ON conversation_messages WHEN NEW.role = 'assistant' "
+            "BEGIN SELECT RAISE(ABORT, 'reply rejected'); END"
+        )
+        conn.commit()
+    
+    repository = single_file.conversations
+    with pytest.raises(sqlite3.IntegrityError):
+        asyncio.run(repository.append_messages("alice", "chat", "Hello", "Hi Alice"))
+    
+    # Neither the user message nor the new conversation row was kept
+    with db_connection(SINGLE_FILE) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM conversation_messages").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0] == 0
+        conn.execute("DROP TRIGGER fail_reply")
+        conn.commit()
+    
+    assert asyncio.run(repository.append_messages("alice", "chat", "Hello", "Hi Alice")) is True
+    history = asyncio.run(repository.select_messages("alice", "chat", None, 0))
+    assert [(msg["seq"], msg["role"]) for msg in history] == [(1, "user"), (2, "assistant")]
+
+def test_merged_files_serve_the_single_layout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    configure_storage("sqlite")
+    init_db()
+    
+    async def seed():
+        await add_reminder("Buy milk", "2030-01-01", user_id="alice")
+        await add_reminder("Old task", "2030-01-02", user_id="alice")
+        await get_storage().reminders.delete("alice", 2)
+        await save_conversation("chat", "Hello", "Hi Alice", user_id="alice")
+    
+    try:
+        asyncio.run(seed())
+        counts = merge_databases("reminders.db", "database.db", SINGLE_FILE)
+        assert counts["reminders"] == 1
+        assert counts["conversation_messages"] == 2
+        
+        configure_storage(SQLiteBackend(SINGLE_FILE, SINGLE_FILE))
+        
+        async def read():
+            # IDs handed out by the old file are not reused
+            created = await add_reminder("New task", "2030-01-03", user_id="alice")
+            return created, await get_conversation_history("chat", user_id="alice")
+        
+        created, history = asyncio.run(read())
+        assert created["reminder"]["id"] == 3
+        assert [msg["content"] for msg in history] == ["Hello", "Hi Alice"]
+    finally:
+        close_all_pools()
+        configure_storage("sqlite")
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+
+import pytest
+
+from app import config
+from app.database import close_all_pools, db_connection, init_db, migrate
+from app.database.connection import CONVERSATIONS_DB_FILE, REMINDERS_DB_FILE
+from app.database.migrations import MIGRATIONS, get_schema_version, table_columns
+
+@pytest.fixture
+def baseline(tmp_path, monkeypatch):
+    """Databases as the first release's init_db created them, with some data"""
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect(REMINDERS_DB_FILE)
+    conn.execute('''
+        CREATE TABLE reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message TEXT NOT NULL,
+            date TEXT NOT NULL,
+            priority TEXT DEFAULT 'normal',
+            tags TEXT DEFAULT '[]',
+            completed BOOLEAN DEFAULT 0
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO reminders (message, date, priority, tags, completed) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("Buy milk", "2025-06-01", "high", '["Shopping", "home"]', 0),
+            ("File taxes", "2025-04-15", "normal", "[]", 1),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    
+    conn = sqlite3.connect(CONVERSATIONS_DB_FILE)
+    conn.execute('''
+        CREATE TABLE conversations (
+            id TEXT PRIMARY KEY,
+            messages TEXT DEFAULT '[]',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    messages = [
+        {"role": "user", "content": "Hello", "timestamp": "2025-01-01T10:00:00"},
+        {"role": "assistant", "content": "Hi there", "timestamp": "2025-01-01T10:00:01"},
+    ]
+    conn.execute("INSERT INTO conversations (id, messages) VALUES (?, ?)", ("legacy", json.dumps(messages)))
+    conn.commit()
+    conn.close()
+    yield tmp_path
+    close_all_pools()
+
+def test_baseline_reminders_are_migrated(baseline):
+    init_db()
+    
+    with db_connection(REMINDERS_DB_FILE) as conn:
+        assert get_schema_version(conn, "reminders") == MIGRATIONS["reminders"][-1].version
+        columns = table_columns(conn, "reminders")
+        assert "message" not in columns
+        assert {"user_message", "user_id"} <= set(columns)
+        
+        rows = conn.execute("SELECT id, user_id, user_message, date, priority, completed FROM reminders ORDER BY id").fetchall()
+        assert [tuple(row) for row in rows] == [
+            (1, config.DEFAULT_USER_ID, "Buy milk", "2025-06-01", "high", 0),
+            (2, config.DEFAULT_USER_ID, "File taxes", "2025-04-15", "normal", 1),
+        ]
+        tags = conn.execute("SELECT user_id, tag, reminder_id FROM reminder_tags ORDER BY tag").fetchall()
+        assert [tuple(row) for row in tags] == [(config.DEFAULT_USER_ID, "home", 1), (config.DEFAULT_USER_ID, "shopping", 1)]
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(reminders)")}
+        assert "idx_reminders_user_completed_date_priority" in indexes
+
+def test_baseline_conversations_are_migrated(baseline):
+    init_db()
+    
+    with db_connection(CONVERSATIONS_DB_FILE) as conn:
+        assert get_schema_version(conn, "conversations") == MIGRATIONS["conversations"][-1].version
+        rows = conn.execute(
+            "SELECT seq, role, content FROM conversation_messages WHERE conversation_id = 'legacy' ORDER BY seq"
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [(1, "user", "Hello"), (2, "assistant", "Hi there")]
+        assert conn.execute("SELECT user_id FROM conversations WHERE id = 'legacy'").fetchone()[0] == config.DEFAULT_USER_ID
+        assert conn.execute("SELECT messages FROM conversations WHERE id = 'legacy'").fetchone()[0] in ("", "[]")
+
+@pytest.mark.parametrize("online", [True, False])
+def test_rebuild_keeps_every_row(baseline, online):
+    with db_connection(REMINDERS_DB_FILE) as conn:
+        conn.executemany("INSERT INTO reminders (message, date) VALUES (?, ?)", [(f"Reminder {n}", "2025-06-02") for n in range(25)])
+        conn.commit()
+    
+    migrate("reminders", online=online, batch_size=4)
+    
+    with db_connection(REMINDERS_DB_FILE) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0] == 27
+        assert conn.execute("SELECT user_message FROM reminders WHERE id = 27").fetchone()[0] == "Reminder 24"
+        # The shadow table and its triggers are gone
+        leftovers = conn.execute("SELECT name FROM sqlite_master WHERE name LIKE '%rebuild%'").fetchall()
+        assert leftovers == []
+
+def test_migrations_run_once(baseline):
+    first = migrate("reminders")
+    assert [result["version"] for result in first] == [migration.version for migration in MIGRATIONS["reminders"]]
+    assert migrate("reminders") == []
+    assert migrate("reminders", dry_run=True) == []
@@ -0,0 +1,55 @@
+import pytest
+
+from app import config
+from app.gemini import ModelRegistry
+
+class Built:
+    """A stand-in model recording what it was built with"""
+    
+    def __init__(self, name, generation_config):
+        self.name = name
+        self.generation_config = generation_config
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Point the settings at a fresh .env file"""
+    path = tmp_path / ".env"
+    path.write_text("GEMINI_MODEL=gemini-1.5-flash\n")
+    monkeypatch.setattr(config, "ENV_FILE", str(path))
+    for name in ("GEMINI_MODEL", "GEMINI_REMINDER_MODEL", "GEMINI_TEMPERATURE", "GEMINI_REMINDER_TEMPERATURE"):
+        monkeypatch.delenv(name, raising=False)
+    return path
+
+def test_get_model_rebuilds_after_env_file_changes(env_file, monkeypatch):
+    registry = ModelRegistry(factory=Built, reload_interval=30)
+    first = registry.get_model("reminder")
+    assert first.name == "gemini-1.5-flash"
+    assert registry.get_model("reminder") is first
+    
+    env_file.write_text("GEMINI_MODEL=gemini-1.5-pro\nGEMINI_TEMPERATURE=0.2\n")
+    # Not checked again until the reload interval has passed
+    assert registry.get_model("reminder") is first
+    
+    monkeypatch.setattr(registry, "_last_check", registry._last_check - 31)
+    second = registry.get_model("reminder")
+    assert second is not first
+    assert second.name == "gemini-1.5-pro"
+    assert second.generation_config["temperature"] == 0.2
+    assert registry.settings("reminder")["model_name"] == "gemini-1.5-pro"
+    assert registry.metrics()["reloads"] == 1
+
+def test_reload_keeps_models_when_settings_are_unchanged(env_file):
+    registry = ModelRegistry(factory=Built)
+    first = registry.get_model("reminder")
+    
+    assert registry.reload() is False
+    assert registry.get_model("reminder") is first
+    assert registry.metrics()["builds"] == 1
+
+def test_real_environment_wins_over_env_file(env_file, monkeypatch):
+    monkeypatch.setenv("GEMINI_MODEL", "gemini-from-environment")
+    registry = ModelRegistry(factory=Built)
+    
+    assert registry.get_model("reminder").name == "gemini-from-environment"
+    env_file.write_text("GEMINI_MODEL=gemini-1.5-pro\n")
+    assert registry.reload() is False
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import config
+from app.database import ConnectionPool, PoolTimeoutError, close_all_pools, configure_db_executor, get_db_executor, run_db
+from app.database.executor import _executor_workers
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_size=3, timeout=0.2)
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def db_executor():
+    """A two-thread database executor, restored to the configured size afterwards"""
+    configure_db_executor(2)
+    yield get_db_executor()
+    configure_db_executor(_executor_workers)
+    close_all_pools()
+
+def test_concurrent_checkouts_never_exceed_the_pool_size(pool):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def work(n):
+        nonlocal active, peak
+        with pool.connection() as conn:
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            conn.execute("SELECT ?", (n,)).fetchone()
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+    
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        list(threads.map(work, range(40)))
+    
+    stats = pool.stats()
+    assert peak == 3
+    assert stats["checkouts"] == 40
+    # Connections are reused rather than opened per checkout
+    assert stats["created"] == 3
+    assert stats["idle"] == 3
+
+def test_checkout_times_out_when_every_connection_is_in_use(pool):
+    held = [pool.acquire() for _ in range(3)]
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    
+    pool.release(held.pop())
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone()[0] == 1
+    for conn in held:
+        pool.release(conn)
+
+def test_released_connections_are_rolled_back_and_reused(pool):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE items (n INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO items VALUES (1)")
+        first = conn
+    
+    with pool.connection() as conn:
+        assert conn is first
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+def test_closed_pool_refuses_checkouts(pool):
+    with pool.connection():
+        pass
+    pool.close()
+    assert pool.stats()["open"] == 0
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+def test_run_db_runs_on_the_bounded_executor(tmp_path, db_executor):
+    db_file = str(tmp_path / "executor.db")
+    threads = set()
+    
+    def work(conn, n):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        return conn.execute("SELECT ?", (n,)).fetchone()[0]
+    
+    async def scenario():
+        loop_thread = threading.current_thread().name
+        results = await asyncio.gather(*(run_db(work, n, db_file=db_file) for n in range(20)))
+        return loop_thread, results
+    
+    loop_thread, results = asyncio.run(scenario())
+    assert results == list(range(20))
+    assert loop_thread not in threads
+    assert all(name.startswith("reminder-ai-db") for name in threads)
+    assert len(threads) <= 2
+
+def test_run_db_runs_inline_without_an_executor(tmp_path):
+    configure_db_executor(0)
+    try:
+        assert get_db_executor() is None
+        
+        async def scenario():
+            return threading.current_thread().name, await run_db(lambda conn: threading.current_thread().name, db_file=str(tmp_path / "inline.db"))
+        
+        loop_thread, db_thread = asyncio.run(scenario())
+        assert db_thread == loop_thread
+    finally:
+        configure_db_executor(_executor_workers)
+        close_all_pools()
+
+def test_default_profile_takes_a_wal_file_back_to_the_rollback_journal(tmp_path):
+    db_file = str(tmp_path / "profile.db")
+    wal = ConnectionPool(db_file, pragmas=config.DB_PRAGMA_PROFILES["wal"])
+    with wal.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    wal.close()
+    
+    default = ConnectionPool(db_file, pragmas=config.DB_PRAGMA_PROFILES["default"])
+    with default.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    default.close()
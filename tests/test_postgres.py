@@ -0,0 +1,104 @@
+import asyncio
+import json
+import sys
+import types
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app import config
+from app.database.backends import PostgresBackend
+from app.database.backends.postgres import POSTGRES_SCHEMA
+
+class StubConnection:
+    """Records the statements sent by the backend and serves the reminders table"""
+    
+    def __init__(self, reminders, version=0):
+        self.reminders = reminders
+        self.version = version
+        self.statements = []
+        self.tag_rows = []
+    
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+    
+    async def execute(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+        if query.startswith("INSERT INTO schema_version"):
+            self.version = args[1]
+    
+    async def executemany(self, query, rows):
+        self.statements.append(" ".join(query.split()))
+        if query.startswith("INSERT INTO reminder_tags"):
+            self.tag_rows.extend(rows)
+    
+    async def fetchval(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+        return self.version
+    
+    async def fetch(self, query, *args):
+        self.statements.append(" ".join(query.split()))
+        last_id, limit = args
+        return [row for row in self.reminders if row["id"] > last_id][:limit]
+
+class StubPool:
+    def __init__(self, conn):
+        self.conn = conn
+    
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+    
+    async def close(self):
+        pass
+
+@pytest.fixture
+def asyncpg(monkeypatch):
+    """Replace asyncpg with a stub whose pools hand out one recording connection"""
+    module = types.ModuleType("asyncpg")
+    module.connection = StubConnection([
+        {"id": 1, "user_id": "alice", "tags": json.dumps(["Straße", " Work ", "work"])},
+        {"id": 2, "user_id": "bob", "tags": "not json"},
+        {"id": 3, "user_id": "bob", "tags": json.dumps(["HOME"])},
+    ])
+    
+    async def create_pool(dsn, min_size, max_size):
+        return StubPool(module.connection)
+    
+    module.create_pool = create_pool
+    monkeypatch.setitem(sys.modules, "asyncpg", module)
+    return module
+
+def start(backend):
+    async def run():
+        await backend.start()
+        await backend.close()
+    asyncio.run(run())
+
+def test_schema_defaults_use_the_configured_default_user():
+    defaults = [statement for statement in POSTGRES_SCHEMA if "user_id TEXT NOT NULL DEFAULT" in statement]
+    assert len(defaults) == 4
+    assert all(f"DEFAULT '{config.DEFAULT_USER_ID}'" in statement for statement in defaults)
+
+def test_start_creates_the_schema_under_the_lock_and_backfills_once(asyncpg):
+    conn = asyncpg.connection
+    start(PostgresBackend("postgresql://stub/reminders"))
+    
+    assert conn.statements[0] == "SELECT pg_advisory_xact_lock($1)"
+    assert any(statement.startswith("CREATE TABLE IF NOT EXISTS schema_version") for statement in conn.statements)
+    # Tags are normalized like normalize_tag (casefold), not lower()
+    assert conn.tag_rows == [("alice", "strasse", 1), ("alice", "work", 1), ("bob", "home", 3)]
+    assert conn.version == 1
+    
+    # The next start finds the version row and leaves reminder_tags alone
+    conn.statements.clear()
+    conn.tag_rows.clear()
+    start(PostgresBackend("postgresql://stub/reminders"))
+    assert conn.tag_rows == []
+    assert not any("reminder_tags (user_id, tag, reminder_id)" in statement for statement in conn.statements)
+    assert not any(statement.startswith("SELECT id, user_id, tags FROM reminders") for statement in conn.statements)
+
+def test_start_needs_a_database_url(asyncpg):
+    with pytest.raises(RuntimeError, match="DATABASE_URL"):
+        asyncio.run(PostgresBackend(None).start())
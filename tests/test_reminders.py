@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import router
+from app.database import db_connection
+from app.database.backends.sqlite import UPCOMING_REMINDERS_QUERY, build_reminders_count_query, build_reminders_page_query, build_reminders_query
+from app.services import add_reminder, get_reminders
+from app.utils import decode_cursor, encode_cursor
+
+@pytest.fixture
+def reminders_db(tmp_path, monkeypatch):
+    """A reminders database migrated by init_db in a temporary directory"""
+    from app.database import close_all_pools, init_db
+    
+    monkeypatch.chdir(tmp_path)
+    init_db()
+    with db_connection() as conn:
+        yield conn
+    close_all_pools()
+
+def query_plan(conn, query, params):
+    return "; ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+@pytest.mark.parametrize("query, params", [
+    build_reminders_query("user-42"),
+    build_reminders_query("user-42", completed=True),
+    build_reminders_query("user-42", "2025-06-01"),
+    (UPCOMING_REMINDERS_QUERY, ["user-42", "2025-06-01", "2025-06-02"]),
+    build_reminders_page_query("user-42", limit=50),
+    build_reminders_page_query("user-42", limit=50, after=("2025-06-01", "normal", 42)),
+    build_reminders_count_query("user-42"),
+])
+def test_list_queries_use_the_reminders_index(reminders_db, query, params):
+    plan = query_plan(reminders_db, query, params)
+    assert "INDEX idx_reminders_user_completed_date_priority" in plan
+    assert "TEMP B-TREE" not in plan
+
+@pytest.mark.parametrize("query, params", [
+    build_reminders_query("user-42", tag="work"),
+    build_reminders_page_query("user-42", limit=50, tag="work"),
+    build_reminders_count_query("user-42", tag="work"),
+])
+def test_tag_queries_seek_reminder_tags(reminders_db, query, params):
+    plan = query_plan(reminders_db, query, params)
+    assert "SEARCH reminder_tags USING PRIMARY KEY (user_id=? AND tag=?)" in plan
+    assert "SCAN" not in plan
+
+def test_cursor_round_trip():
+    row = {"id": 7, "date": "2025-06-01", "priority": "high", "user_message": "Call Sam"}
+    cursor = encode_cursor(row)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2025-06-01", "high", 7)
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor({"id": "7", "date": "2025-06-01", "priority": "high"}), "WzEsMl0"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_paging_visits_every_reminder_once(storage):
+    async def scenario():
+        priorities = ["low", "normal", "medium", "high"]
+        for n in range(23):
+            await add_reminder(f"Reminder {n}", f"2025-06-{n % 5 + 1:02d}", priorities[n % 4], user_id="alice")
+        await add_reminder("Someone else's", "2025-06-01", user_id="bob")
+        
+        everything = await get_reminders(user_id="alice")
+        pages = []
+        cursor = None
+        while True:
+            page = await get_reminders(user_id="alice", limit=5, cursor=cursor, include_total=True)
+            assert page["success"] and page["total"] == 23
+            pages.append(page["reminders"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        return everything["reminders"], pages
+    
+    everything, pages = asyncio.run(scenario())
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    paged = [reminder for page in pages for reminder in page]
+    # Same rows in the same order as the unpaged list
+    assert [r["id"] for r in paged] == [r["id"] for r in everything]
+    assert len({r["id"] for r in paged}) == 23
+
+def test_bad_cursor_fails_the_page(storage):
+    result = asyncio.run(get_reminders(user_id="alice", limit=5, cursor="not a cursor"))
+    assert result == {"success": False, "message": "Invalid cursor", "reminders": []}
+
+def test_an_empty_page_says_nothing_was_found(storage):
+    asyncio.run(add_reminder("Call Sam", "2025-06-01", tags=["work"], user_id="alice"))
+    
+    page = asyncio.run(get_reminders(date_filter="2025-06-02", user_id="alice", limit=5, tag="work"))
+    unpaged = asyncio.run(get_reminders(date_filter="2025-06-02", user_id="alice", tag="work"))
+    assert page["message"] == unpaged["message"] == "No reminders found for 2025-06-02 tagged 'work'"
+    assert page["reminders"] == [] and page["next_cursor"] is None
+
+def test_list_messages_keep_the_text_listing_unless_summary_is_off(storage):
+    asyncio.run(add_reminder("Call Sam", "2025-06-01", "high", user_id="alice"))
+    asyncio.run(add_reminder("Buy milk", "2025-06-02", user_id="alice"))
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    headers = {"X-User-ID": "alice"}
+    
+    with TestClient(app) as client:
+        listed = client.get("/api/reminders", headers=headers).json()
+        counted = client.get("/api/reminders?summary=false", headers=headers).json()
+        selected = client.get("/api/reminders?fields=id,message", headers=headers).json()
+        empty = client.get("/api/reminders/upcoming?summary=false", headers=headers).json()
+        asyncio.run(add_reminder("Water plants", "today", user_id="alice"))
+        upcoming = client.get("/api/reminders/upcoming", headers=headers).json()
+    
+    assert listed["message"] == "📅 Here are your reminders:\n🔴 2025-06-01: Call Sam\n🟢 2025-06-02: Buy milk\n"
+    assert counted["message"] == selected["message"] == "📅 2 reminders"
+    assert counted["reminders"] == listed["reminders"]
+    assert empty["message"] == "No upcoming reminders for today or tomorrow"
+    assert upcoming["message"] == "⏰ Here are your upcoming reminders:\n🟢 Today: Water plants\n"
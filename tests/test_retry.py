@@ -0,0 +1,98 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.gemini import RetryDeadlineExceeded, RetryPolicy, deadline_budget
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable"""
+
+class InvalidArgument(Exception):
+    """Stand-in for google.api_core.exceptions.InvalidArgument"""
+
+def failing(errors, result="ok"):
+    """A call that raises each error in turn, then returns the result"""
+    state = {"calls": 0}
+    
+    async def call():
+        state["calls"] += 1
+        if state["calls"] <= len(errors):
+            raise errors[state["calls"] - 1]
+        return result
+    
+    return call, state
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    
+    assert [policy.backoff(retry) for retry in range(6)] == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+def test_backoff_is_fully_jittered():
+    random.seed(7)
+    policy = RetryPolicy(base_delay=0.5, max_delay=0.5)
+    delays = [policy.backoff(3) for _ in range(200)]
+    
+    assert all(0 <= delay <= 0.5 for delay in delays)
+    assert min(delays) < 0.1 and max(delays) > 0.4
+
+def test_transient_errors_are_retried_until_success():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    call, state = failing([ServiceUnavailable("503"), TimeoutError("slow")])
+    
+    assert asyncio.run(policy.run(call)) == "ok"
+    assert state["calls"] == 3
+    assert policy.metrics()["retries"] == 2
+
+def test_non_retryable_errors_fail_after_one_attempt():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    call, state = failing([InvalidArgument("400")])
+    
+    with pytest.raises(InvalidArgument):
+        asyncio.run(policy.run(call))
+    assert state["calls"] == 1
+    assert policy.metrics()["non_retryable"] == 1
+
+def test_retries_stop_after_max_attempts():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    call, state = failing([ServiceUnavailable("503")] * 5)
+    
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(policy.run(call))
+    assert state["calls"] == 3
+    assert policy.metrics()["exhausted"] == 1
+
+def test_a_hung_call_is_cut_off_at_the_deadline():
+    policy = RetryPolicy(max_attempts=3, deadline=0.1)
+    
+    async def hang():
+        await asyncio.sleep(5)
+    
+    start = time.perf_counter()
+    with pytest.raises(RetryDeadlineExceeded):
+        asyncio.run(policy.run(hang))
+    assert time.perf_counter() - start < 1
+    assert policy.metrics()["deadline_exceeded"] == 1
+
+def test_no_retry_is_started_past_the_deadline():
+    policy = RetryPolicy(max_attempts=5, base_delay=10.0, max_delay=10.0, deadline=30.0)
+    policy.backoff = lambda retry: 10.0
+    call, state = failing([ServiceUnavailable("503")] * 5)
+    
+    async def run():
+        with deadline_budget(1.0):
+            return await policy.run(call)
+    
+    start = time.perf_counter()
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(run())
+    assert time.perf_counter() - start < 1
+    assert state["calls"] == 1
+    assert policy.metrics()["deadline_exceeded"] == 1
+
+def test_nested_budgets_never_extend_the_outer_deadline():
+    with deadline_budget(1.0) as outer:
+        with deadline_budget(60.0) as inner:
+            assert inner == outer
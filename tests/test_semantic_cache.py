@@ -0,0 +1,109 @@
+import asyncio
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.gemini import HashingEmbedder, SemanticCache
+
+class AngleEmbedder:
+    """Embeds each known question as a 2D unit vector at a fixed angle from the x axis"""
+    
+    name = "angles"
+    
+    def __init__(self, similarities):
+        self.angles = {question: math.acos(similarity) for question, similarity in similarities.items()}
+    
+    async def embed(self, texts):
+        if any(text not in self.angles for text in texts):
+            raise RuntimeError("embedding service unavailable")
+        return np.array([[math.cos(self.angles[text]), math.sin(self.angles[text])] for text in texts], dtype=np.float32)
+
+def ask(cache, question, namespace="prompt", answer=None):
+    """Look a question up and, on a miss, store the given answer"""
+    async def run():
+        cached, vector = await cache.lookup(question, namespace)
+        if cached is None and answer is not None:
+            cache.store(vector, answer, namespace)
+        return cached
+    return asyncio.run(run())
+
+@pytest.fixture
+def cache():
+    # Cosine similarity of each question with "original"
+    embedder = AngleEmbedder({"original": 1.0, "close": 0.85, "borderline": 0.81, "far": 0.75, "unrelated": 0.0})
+    return SemanticCache(enabled=True, embedder=embedder, threshold=0.8, max_entries=10, ttl=60)
+
+def test_similarity_at_or_above_the_threshold_hits(cache):
+    assert ask(cache, "original", answer="Paris") is None
+    assert ask(cache, "original") == "Paris"
+    assert ask(cache, "close") == "Paris"
+    assert ask(cache, "borderline") == "Paris"
+    
+    metrics = cache.metrics()
+    assert metrics["hits"] == 3 and metrics["misses"] == 1
+    assert metrics["hit_rate"] == 0.75
+
+def test_similarity_below_the_threshold_misses(cache):
+    ask(cache, "original", answer="Paris")
+    
+    assert ask(cache, "far") is None
+    assert ask(cache, "unrelated") is None
+    assert cache.metrics()["misses"] == 3
+
+def test_raising_the_threshold_turns_hits_into_misses(cache):
+    ask(cache, "original", answer="Paris")
+    cache.threshold = 0.9
+    
+    assert ask(cache, "close") is None
+    assert ask(cache, "original") == "Paris"
+
+def test_answers_are_kept_per_namespace(cache):
+    ask(cache, "original", namespace="prompt-a", answer="Paris")
+    
+    assert ask(cache, "original", namespace="prompt-b") is None
+    assert ask(cache, "original", namespace="prompt-a") == "Paris"
+
+def test_expired_answers_miss(cache):
+    cache.ttl = -1.0
+    ask(cache, "original", answer="Paris")
+    
+    assert ask(cache, "original") is None
+
+def test_embedding_failures_miss_without_storing(cache):
+    assert ask(cache, "not embeddable", answer="Paris") is None
+    
+    metrics = cache.metrics()
+    assert metrics["embed_errors"] == 1
+    assert metrics["stores"] == 0
+
+def test_a_full_index_evicts_the_least_recently_used_answer():
+    embedder = AngleEmbedder({"first": 1.0, "second": 0.0})
+    cache = SemanticCache(enabled=True, embedder=embedder, threshold=0.99, max_entries=1, ttl=60)
+    
+    ask(cache, "first", answer="one")
+    ask(cache, "second", answer="two")
+    
+    assert ask(cache, "first") is None
+    assert ask(cache, "second") == "two"
+    assert cache.metrics()["evictions"] == 1
+
+def test_disabled_cache_never_hits():
+    cache = SemanticCache(enabled=False, embedder=AngleEmbedder({"original": 1.0}))
+    ask(cache, "original", answer="Paris")
+    
+    assert ask(cache, "original") is None
+    assert cache.metrics()["hits"] == cache.metrics()["misses"] == 0
+
+@pytest.mark.parametrize("stored, asked, hit", [
+    ("What is the capital of France?", "what's the capital of france", True),
+    ("What is the capital of France?", "France's capital city?", True),
+    ("Who won the world cup in 2010?", "Who won the world cup in 2014?", False),
+    ("What is the capital of France?", "How do I bake bread?", False),
+])
+def test_hashing_embedder_matches_rewordings_but_not_other_questions(stored, asked, hit):
+    cache = SemanticCache(enabled=True, embedder=HashingEmbedder(), threshold=0.8)
+    ask(cache, stored, answer="answer")
+    
+    assert (ask(cache, asked) == "answer") is hit
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app.gemini.singleflight import SingleFlight, request_key
+
+class SlowCall:
+    """Counts calls and finishes each one when released"""
+    
+    def __init__(self, result="reply", error=None):
+        self.result = result
+        self.error = error
+        self.started = 0
+        self.cancelled = 0
+        self.release = None
+    
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+def test_identical_calls_share_one_upstream_call():
+    group = SingleFlight(enabled=True)
+    call = SlowCall()
+    
+    async def scenario():
+        call.release = asyncio.Event()
+        waiters = [asyncio.create_task(group.run("key", call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        call.release.set()
+        return await asyncio.gather(*waiters)
+    
+    assert asyncio.run(scenario()) == ["reply"] * 5
+    assert call.started == 1
+    metrics = group.metrics()
+    assert (metrics["upstream"], metrics["coalesced"], metrics["in_flight_keys"]) == (1, 4, 0)
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight(enabled=True)
+    call = SlowCall(error=RuntimeError("quota"))
+    
+    async def scenario():
+        call.release = asyncio.Event()
+        waiters = [asyncio.create_task(group.run("key", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        call.release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+    
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert call.started == 1
+
+def test_cancelled_waiter_leaves_the_others_waiting():
+    group = SingleFlight(enabled=True)
+    call = SlowCall()
+    
+    async def scenario():
+        call.release = asyncio.Event()
+        first = asyncio.create_task(group.run("key", call))
+        second = asyncio.create_task(group.run("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        call.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+    
+    assert asyncio.run(scenario()) == "reply"
+    assert call.cancelled == 0
+    assert group.metrics()["abandoned"] == 0
+
+def test_call_is_cancelled_once_nobody_waits():
+    group = SingleFlight(enabled=True)
+    call = SlowCall()
+    
+    async def scenario():
+        call.release = asyncio.Event()
+        waiters = [asyncio.create_task(group.run("key", call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        # The next caller starts a fresh call
+        call.release.set()
+        return await group.run("key", call)
+    
+    assert asyncio.run(scenario()) == "reply"
+    assert call.cancelled == 1
+    assert call.started == 2
+    assert group.metrics()["abandoned"] == 1
+
+def test_disabled_or_unkeyed_calls_run_alone():
+    call = SlowCall()
+    
+    async def scenario(group, key):
+        call.release = asyncio.Event()
+        call.release.set()
+        return await asyncio.gather(*(group.run(key, call) for _ in range(3)))
+    
+    asyncio.run(scenario(SingleFlight(enabled=False), "key"))
+    asyncio.run(scenario(SingleFlight(enabled=True), None))
+    assert call.started == 6
+
+def test_request_key_matches_equal_requests_only():
+    model, other_model = object(), object()
+    contents = [{"role": "user", "parts": ["Hi"]}]
+    assert request_key(model, contents, {"stream": False}) == request_key(model, [{"role": "user", "parts": ["Hi"]}], {"stream": False})
+    assert request_key(model, contents, {}) != request_key(other_model, contents, {})
+    assert request_key(model, contents, {}) != request_key(model, [{"role": "user", "parts": ["Hello"]}], {})
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import router
+from app.gemini import FakeGenerativeModel, get_gemini_metrics, stream_content, stream_general_chat
+from app.services import get_conversation_history
+
+def test_closing_a_stream_stops_reading_it():
+    # 100 chunks, 20ms apart: about two seconds to read in full
+    model = FakeGenerativeModel("word " * 300, chunk_delay=0.02)
+    messages = [{"role": "user", "parts": ["Talk for a while"]}]
+    
+    async def read_two_chunks():
+        stream = stream_content(model, messages)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        start = time.perf_counter()
+        await stream.aclose()
+        return chunks, time.perf_counter() - start
+    
+    cancelled = get_gemini_metrics()["cancelled"]
+    chunks, close_seconds = asyncio.run(read_two_chunks())
+    
+    assert chunks == ["word word word "] * 2
+    assert close_seconds < 0.5
+    metrics = get_gemini_metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["cancelled"] == cancelled + 1
+
+def test_stream_failures_raise_instead_of_yielding_error_text(fake_model):
+    fake_model.reply = RuntimeError("503 overloaded")
+    
+    async def read():
+        return [chunk async for chunk in stream_general_chat("Tell me a story")]
+    
+    with pytest.raises(RuntimeError, match="503 overloaded"):
+        asyncio.run(read())
+
+def test_failed_stream_sends_an_error_event_and_saves_nothing(storage, fake_model):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    fake_model.reply = RuntimeError("503 overloaded")
+    
+    with TestClient(app) as client:
+        response = client.post("/api/chat/stream", json={"message": "Tell me a story about a dragon", "conversation_id": "failed"})
+    
+    assert response.status_code == 200
+    assert "event: error" in response.text
+    assert "503 overloaded" in response.text
+    assert "event: done" not in response.text
+    assert '"delta"' not in response.text
+    assert asyncio.run(get_conversation_history("failed")) == []
+    
+    fake_model.reply = "Once upon a time."
+    with TestClient(app) as client:
+        response = client.post("/api/chat/stream", json={"message": "Tell me a story about a dragon", "conversation_id": "ok"})
+    assert "event: done" in response.text
+    assert [msg["content"] for msg in asyncio.run(get_conversation_history("ok"))] == ["Tell me a story about a dragon", "Once upon a time."]
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.gemini import FakeGenerativeModel, ToolFormatUnavailable, get_tool_format, probe_tool_format, reset_tool_format, retry_policy
+from app.gemini.client import try_gemini_with_tools
+
+class ServiceUnavailable(Exception):
+    """Stand-in for google.api_core.exceptions.ServiceUnavailable"""
+
+class InvalidArgument(Exception):
+    """Stand-in for google.api_core.exceptions.InvalidArgument"""
+
+class ConfigOnlyModel(FakeGenerativeModel):
+    """A fake model that only accepts tools passed with a tool_config"""
+    
+    def generate_content(self, contents, stream: bool = False, **kwargs):
+        if "tools" in kwargs and "tool_config" not in kwargs:
+            self.calls += 1
+            raise TypeError("tool_config is required")
+        return super().generate_content(contents, stream=stream, **kwargs)
+
+@pytest.fixture(autouse=True)
+def unprobed():
+    """Start and end every test without a cached tool format"""
+    reset_tool_format()
+    yield
+    reset_tool_format()
+
+def test_probe_caches_the_first_working_format():
+    model = FakeGenerativeModel("OK")
+    
+    assert asyncio.run(probe_tool_format(model)) == "function_declarations"
+    assert asyncio.run(probe_tool_format(model)) == "function_declarations"
+    assert model.calls == 1
+    assert get_tool_format() == "function_declarations"
+
+def test_probe_skips_rejected_formats():
+    model = ConfigOnlyModel("OK")
+    
+    assert asyncio.run(probe_tool_format(model)) == "tools_with_config"
+    assert model.calls == 3
+
+def test_no_working_format_is_cached_and_never_calls_without_tools():
+    model = FakeGenerativeModel(TypeError("tools are not supported"))
+    
+    with pytest.raises(ToolFormatUnavailable):
+        asyncio.run(probe_tool_format(model))
+    assert model.calls == 3
+    
+    # Later requests neither probe again nor call the model without tools
+    function_calls, text = asyncio.run(try_gemini_with_tools(model, [{"role": "user", "parts": ["Hi"]}], []))
+    assert function_calls == []
+    assert "trouble" in text
+    assert model.calls == 3
+    
+    reset_tool_format()
+    model.reply = "OK"
+    assert asyncio.run(probe_tool_format(model)) == "function_declarations"
+
+def test_transient_probe_errors_are_not_cached():
+    model = FakeGenerativeModel(ServiceUnavailable("503 overloaded"))
+    
+    with pytest.raises(ServiceUnavailable):
+        asyncio.run(probe_tool_format(model))
+    assert model.calls == 1
+    assert get_tool_format() is None
+    
+    model.reply = "OK"
+    assert asyncio.run(probe_tool_format(model)) == "function_declarations"
+
+@pytest.mark.parametrize("error", [InvalidArgument("400 bad request"), TypeError("unexpected tools")])
+def test_rejected_requests_reset_the_format(error):
+    model = FakeGenerativeModel("OK")
+    asyncio.run(probe_tool_format(model))
+    
+    model.reply = error
+    function_calls, text = asyncio.run(try_gemini_with_tools(model, [{"role": "user", "parts": ["Hi"]}], []))
+    assert function_calls == []
+    assert "trouble" in text
+    assert get_tool_format() is None
+
+def test_transient_errors_keep_the_format(monkeypatch):
+    monkeypatch.setattr(retry_policy, "base_delay", 0.0)
+    model = FakeGenerativeModel("OK")
+    asyncio.run(probe_tool_format(model))
+    
+    model.reply = ServiceUnavailable("503 overloaded")
+    asyncio.run(try_gemini_with_tools(model, [{"role": "user", "parts": ["Hi"]}], []))
+    assert get_tool_format() == "function_declarations"